@@ -15,6 +15,7 @@ class InventoryPage(BasePage):
         self.driver.click(self.ADD_TO_CART_BACKPACK)
 
     def get_cart_count(self):
+        self.wait_for_visible(self.CART_BADGE)
         return self.driver.get_text(self.CART_BADGE)
         
     def go_to_cart(self):
@@ -6,12 +6,35 @@ import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
 
 from qa_framework.core.drivers.factory import DriverFactory
+from qa_framework.core.drivers.session import SessionStore
+from examples.poc_saucedemo.pages.login_page import LoginPage
+
+
+def _login_standard_user(driver):
+    login_page = LoginPage(driver)
+    login_page.navigate()
+    login_page.login("standard_user", "secret_sauce")
+
+
+# Logged in once through the UI, later tests restore the saved session
+SessionStore.register("standard_user", _login_standard_user)
 
 @pytest.fixture(scope="function")
 def driver():
     """
-    Fixture to initialize driver for each test.
+    Fixture to provide a driver for each test.
+    Set DRIVER_POOL_ENABLED=true to reuse warm browsers between tests.
+    """
+    driver_instance = DriverFactory.acquire_driver()
+    yield driver_instance
+    DriverFactory.release_driver(driver_instance)
+
+
+@pytest.fixture(scope="function")
+def standard_user_driver():
+    """
+    Driver that starts on the inventory page, already logged in as standard_user.
     """
-    driver_instance = DriverFactory.get_driver()
+    driver_instance = DriverFactory.acquire_driver(role="standard_user")
     yield driver_instance
-    driver_instance.quit()
+    DriverFactory.release_driver(driver_instance)
@@ -1,5 +1,4 @@
 import pytest
-import time
 from qa_framework.core.data.readers import JSONReader
 from examples.poc_saucedemo.pages.login_page import LoginPage
 from examples.poc_saucedemo.pages.inventory_page import InventoryPage
@@ -49,3 +48,12 @@ class TestSauceDemoCheckout:
         
         error = self.login_page.get_error_message()
         assert "Sorry, this user has been locked out" in error
+
+
+def test_add_to_cart_with_saved_session(standard_user_driver):
+    """
+    Starts from a restored standard_user session instead of the login form.
+    """
+    inventory_page = InventoryPage(standard_user_driver)
+    inventory_page.add_backpack_to_cart()
+    assert inventory_page.get_cart_count() == "1"
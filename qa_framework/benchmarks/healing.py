@@ -0,0 +1,218 @@
+"""
+Healing benchmark: synthetic DOM corpora with controlled selector mutations.
+
+    python -m qa_framework.benchmarks.healing --sizes 1000 --sizes 200000 --output bench.json
+    qa-init bench-healing --sizes 1000 --sizes 10000
+
+Reports index build time, heal latency percentiles, peak memory, the number
+of elements scored per heal (and how many score above zero) and accuracy
+(healed selector resolves to the mutated target) per size.
+"""
+import json
+import logging
+import random
+import statistics
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+import structlog
+import typer
+from qa_framework.core.healing.healer import Healer
+from qa_framework.core.healing.index import DOMIndex
+
+DEFAULT_SIZES = [1_000, 10_000, 50_000, 200_000]
+MUTATION_KINDS = ("id", "name", "text")
+
+WORDS = [
+    "account", "order", "submit", "user", "email", "cart", "item", "price", "search", "filter",
+    "save", "cancel", "profile", "address", "payment", "review", "login", "settings", "details", "shipping",
+]
+
+# Nodes per generated card: div.card > h3 + form > (input + button)
+NODES_PER_CARD = 5
+
+
+def _phrase(rng: random.Random, words: int) -> List[str]:
+    return rng.sample(WORDS, words)
+
+
+def _mutate_id(rng: random.Random, value: str) -> str:
+    """Typical refactors: camelCase, suffixes, underscores, small typos."""
+    parts = value.split("-")
+    choice = rng.randrange(4)
+    if choice == 0:
+        return parts[0] + "".join(p.capitalize() for p in parts[1:])
+    if choice == 1:
+        return f"{value}-v2"
+    if choice == 2:
+        return value.replace("-", "_")
+    pos = rng.randrange(1, len(value) - 1)
+    return value[:pos] + value[pos + 1:]
+
+
+def _mutate_text(rng: random.Random, value: str) -> str:
+    choice = rng.randrange(3)
+    if choice == 0:
+        return value.title()
+    if choice == 1:
+        return f"{value} now"
+    return value.replace(" ", "  ")
+
+
+def generate_dom(nodes: int, targets: int = 50, seed: int = 7) -> Tuple[str, List[Dict[str, Any]]]:
+    """
+    Builds a page of roughly `nodes` elements and `targets` mutation cases.
+    Each case holds the selector written against the original attributes and the
+    marker of the (mutated) element a correct heal must resolve to.
+    """
+    rng = random.Random(seed)
+    cards = max(nodes // NODES_PER_CARD, 1)
+    target_cards = dict.fromkeys(rng.sample(range(cards), min(targets, cards)))
+
+    cases = []
+    parts = ["<html><head><title>bench</title></head><body><main>"]
+    for card in range(cards):
+        base = "-".join(_phrase(rng, 2))
+        input_id, input_name = f"{base}-input-{card}", f"{base.replace('-', '_')}_{card}"
+        button_id, button_text = f"{base}-button-{card}", f"{' '.join(_phrase(rng, 2)).capitalize()} {card}"
+        marker = ""
+
+        if card in target_cards:
+            kind = MUTATION_KINDS[len(cases) % len(MUTATION_KINDS)]
+            marker = f' data-bench-target="{len(cases)}"'
+            if kind == "id":
+                selector = f"#{input_id}"
+                input_id = _mutate_id(rng, input_id)
+            elif kind == "name":
+                selector = f"input[name='{input_name}']"
+                input_name = _mutate_id(rng, input_name.replace("_", "-")).replace("-", "_")
+                input_id = ""
+            else:
+                selector = f"//button[text()='{button_text}']"
+                button_text = _mutate_text(rng, button_text)
+            cases.append({"selector": selector, "kind": kind, "target": str(len(cases))})
+
+        input_marker = marker if marker and cases[-1]["kind"] != "text" else ""
+        button_marker = marker if marker and cases[-1]["kind"] == "text" else ""
+        input_id_attr = f' id="{input_id}"' if input_id else ""
+        parts.append(
+            f'<div class="card card-{card % 20}"><h3 class="title">{" ".join(_phrase(rng, 3))}</h3>'
+            f'<form><input{input_id_attr} name="{input_name}" class="field"{input_marker} />'
+            f'<button id="{button_id}" class="btn"{button_marker}>{button_text}</button></form></div>'
+        )
+    parts.append("</main></body></html>")
+    return "".join(parts), cases
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)]
+
+
+@contextmanager
+def _quiet_logging():
+    """Keeps per-heal log lines out of the timings."""
+    previous = structlog.get_config()
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.ERROR))
+    try:
+        yield
+    finally:
+        structlog.configure(**previous)
+
+
+def _is_correct(index: DOMIndex, healed: Optional[str], target: str) -> bool:
+    if not healed:
+        return False
+    match = index.soup.select_one(healed)
+    return match is not None and match.get("data-bench-target") == target
+
+
+def bench_size(nodes: int, heals: int = 50, seed: int = 7) -> Dict[str, Any]:
+    """Benchmarks a single corpus size and returns its metrics."""
+    html, cases = generate_dom(nodes, targets=heals, seed=seed)
+
+    started = time.perf_counter()
+    index = DOMIndex(html)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    healer = Healer(index=index)
+    latencies, matching = [], []
+    by_kind = {kind: [0, 0] for kind in MUTATION_KINDS}  # kind -> [correct, total]
+    for case in cases:
+        meta = Healer._parse_selector(case["selector"])
+        # heal() scores every element; this is how many of them score above zero
+        matching.append(sum(1 for score in index.scorer.scores(meta) if score > 0))
+        started = time.perf_counter()
+        healed = healer.heal(case["selector"])
+        latencies.append((time.perf_counter() - started) * 1000)
+        by_kind[case["kind"]][0] += _is_correct(index, healed, case["target"])
+        by_kind[case["kind"]][1] += 1
+
+    # Memory is measured in a separate pass so tracing does not skew the timings
+    tracemalloc.start()
+    try:
+        Healer(html).heal(cases[0]["selector"])
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "nodes": len(index),
+        "heals": len(cases),
+        "index_build_ms": round(build_ms, 2),
+        "heal_p50_ms": round(_percentile(latencies, 50), 3),
+        "heal_p90_ms": round(_percentile(latencies, 90), 3),
+        "heal_p99_ms": round(_percentile(latencies, 99), 3),
+        "heal_max_ms": round(max(latencies), 3),
+        "peak_memory_mb": round(peak / 1024 / 1024, 2),
+        "elements_scored": index.scorer.size,
+        "nonzero_scores_mean": round(statistics.mean(matching), 1),
+        "nonzero_scores_max": max(matching),
+        "accuracy": round(sum(ok for ok, _ in by_kind.values()) / len(cases), 4),
+        "accuracy_by_kind": {kind: round(ok / total, 4) for kind, (ok, total) in by_kind.items() if total},
+    }
+
+
+def run_benchmark(sizes: Optional[List[int]] = None, heals: int = 50, seed: int = 7,
+                  output: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Runs the benchmark for every size, optionally writing the results as JSON."""
+    with _quiet_logging():
+        results = [bench_size(nodes, heals=heals, seed=seed) for nodes in (sizes or DEFAULT_SIZES)]
+    if output:
+        with open(output, "w") as f:
+            json.dump(results, f, indent=2)
+    return results
+
+
+def print_results(results: List[Dict[str, Any]]) -> None:
+    from rich.console import Console
+    from rich.table import Table
+
+    table = Table(title="Healing benchmark")
+    columns = {
+        "nodes": "nodes", "index_build_ms": "build ms", "heal_p50_ms": "p50 ms", "heal_p90_ms": "p90 ms",
+        "heal_p99_ms": "p99 ms", "peak_memory_mb": "peak MB", "elements_scored": "scored",
+        "nonzero_scores_mean": "nonzero", "accuracy": "accuracy",
+    }
+    for label in columns.values():
+        table.add_column(label, justify="right")
+    for row in results:
+        table.add_row(*(str(row[column]) for column in columns))
+    Console().print(table)
+
+
+def main(
+    sizes: List[int] = typer.Option(DEFAULT_SIZES, help="DOM sizes (elements) to generate"),
+    heals: int = typer.Option(50, help="Mutated selectors healed per size"),
+    seed: int = typer.Option(7, help="Seed for the synthetic corpus"),
+    output: Optional[str] = typer.Option(None, help="Write results as JSON to this path"),
+):
+    """Runs the healing benchmark over synthetic DOMs."""
+    print_results(run_benchmark(sizes, heals=heals, seed=seed, output=output))
+
+
+if __name__ == "__main__":
+    typer.run(main)
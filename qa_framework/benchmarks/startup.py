@@ -0,0 +1,116 @@
+"""
+Startup benchmark: import time and memory of the framework entry points.
+
+    python -m qa_framework.benchmarks.startup --repeat 5 --output startup.json
+    qa-init bench-startup
+
+Every import runs in a fresh interpreter, so module caches from earlier
+measurements do not hide the cost. Reports median wall time, the cumulative
+time from -X importtime, peak RSS and which heavy optional dependencies
+(UI backends, PIL, openpyxl, zapv2, locust) the import pulled in.
+"""
+import json
+import statistics
+import subprocess
+import sys
+from typing import Any, Dict, List, Optional
+import typer
+
+DEFAULT_MODULES = [
+    "qa_framework.core.config",
+    "qa_framework.core.api.client",
+    "qa_framework.core.drivers.factory",
+    "qa_framework.core.drivers.base_page",
+    "qa_framework.core.a11y.manager",
+    "qa_framework.core.visual.manager",
+    "qa_framework.core.data.readers",
+    "qa_framework.core.security.zap_manager",
+    "qa_framework.cli",
+]
+
+HEAVY_MODULES = ("selenium", "playwright", "appium", "PIL", "openpyxl", "zapv2", "locust")
+
+# Runs in the child interpreter; prints one JSON line
+_PROBE = """
+import json, resource, sys, time
+started = time.perf_counter()
+__import__(sys.argv[1])  # importlib.import_module would bypass -X importtime for the module itself
+elapsed = time.perf_counter() - started
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+if sys.platform == "darwin":
+    rss //= 1024  # bytes on macOS, KiB on Linux
+print(json.dumps({
+    "seconds": elapsed,
+    "peak_rss_kb": rss,
+    "heavy": sorted(m for m in sys.argv[2].split(",") if m in sys.modules),
+}))
+"""
+
+
+def _cumulative_us(stderr: str, module: str) -> Optional[int]:
+    """Cumulative microseconds of the module's own line in -X importtime output."""
+    for line in stderr.splitlines():
+        parts = [part.strip() for part in line.split("|")]
+        if len(parts) == 3 and parts[2] == module and parts[1].isdigit():
+            return int(parts[1])
+    return None
+
+
+def measure(module: str, repeat: int = 3) -> Dict[str, Any]:
+    """Imports the module in `repeat` fresh interpreters."""
+    runs = []
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", _PROBE, module, ",".join(HEAVY_MODULES)],
+            capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(f"Importing {module} failed:\n{proc.stderr[-2000:]}")
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        result["importtime_us"] = _cumulative_us(proc.stderr, module)
+        runs.append(result)
+    return {
+        "module": module,
+        "import_ms": round(statistics.median(r["seconds"] for r in runs) * 1000, 1),
+        "importtime_ms": round(statistics.median(r["importtime_us"] or 0 for r in runs) / 1000, 1),
+        "peak_rss_mb": round(max(r["peak_rss_kb"] for r in runs) / 1024, 1),
+        "heavy": runs[-1]["heavy"],
+    }
+
+
+def run_benchmark(modules: Optional[List[str]] = None, repeat: int = 3,
+                  output: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Measures every module, optionally writing the results as JSON."""
+    results = [measure(module, repeat=repeat) for module in (modules or DEFAULT_MODULES)]
+    if output:
+        with open(output, "w") as f:
+            json.dump(results, f, indent=2)
+    return results
+
+
+def print_results(results: List[Dict[str, Any]]) -> None:
+    from rich.console import Console
+    from rich.table import Table
+
+    table = Table(title="Startup benchmark")
+    table.add_column("module", overflow="fold")
+    for label in ("import ms", "importtime ms", "peak RSS MB"):
+        table.add_column(label, justify="right")
+    table.add_column("heavy deps loaded")
+    for row in results:
+        table.add_row(row["module"], str(row["import_ms"]), str(row["importtime_ms"]),
+                      str(row["peak_rss_mb"]), ", ".join(row["heavy"]) or "-")
+    Console().print(table)
+
+
+def main(
+    modules: List[str] = typer.Option(DEFAULT_MODULES, help="Modules to import"),
+    repeat: int = typer.Option(3, help="Fresh interpreters per module (median is reported)"),
+    output: Optional[str] = typer.Option(None, help="Write results as JSON to this path"),
+):
+    """Runs the startup benchmark over the framework entry points."""
+    print_results(run_benchmark(modules, repeat=repeat, output=output))
+
+
+if __name__ == "__main__":
+    typer.run(main)
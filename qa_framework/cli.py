@@ -19,22 +19,48 @@ USE_PLAYWRIGHT=true
 LOG_LEVEL=INFO
 DB_CONNECTION_STRING=sqlite:///test.db
 SCREENSHOT_ON_PASS=false
+DRIVER_POOL_ENABLED=false
+NETWORK_BLOCK_PROFILE=none
+PAGE_TIMING_ENABLED=false
 """
 
 DEFAULT_CONFTEST = '''import pytest
 from qa_framework.core.drivers.factory import DriverFactory
 from qa_framework.core.config import settings
+from qa_framework.core.instrumentation import metrics
 from qa_framework.core.logger import get_logger
 
 logger = get_logger()
 
+def pytest_sessionfinish(session, exitstatus):
+    # INSTRUMENTATION_ENABLED=true: metrics JSON + Prometheus textfile in METRICS_DIR
+    if settings.INSTRUMENTATION_ENABLED:
+        metrics.export()
+    # Screenshots are encoded and written in the background; finish before Allure closes
+    from qa_framework.core.screenshots import ScreenshotService
+    ScreenshotService.shared().flush()
+
 @pytest.fixture(scope="function")
-def driver():
-    logger.info("Initializing Driver from conftest")
-    driver_instance = DriverFactory.get_driver(settings.BROWSER)
+def driver(request):
+    # With DRIVER_POOL_ENABLED=true browsers stay warm and are reset between tests
+    logger.info("Acquiring Driver from conftest", browser=settings.BROWSER)
+    if settings.INSTRUMENTATION_ENABLED:
+        metrics.start_test(request.node.nodeid)
+    driver_instance = DriverFactory.acquire_driver()
+    # NETWORK_ARCHIVE_MODE=auto records each test's traffic once, then replays it
+    driver_instance.use_archive(request.node.nodeid)
     yield driver_instance
-    logger.info("Quitting Driver")
-    driver_instance.quit()
+    if settings.INSTRUMENTATION_ENABLED:
+        from qa_framework.core.listeners.allure_listener import AllureListener
+        AllureListener.attach_json(metrics.test_summary(request.node.nodeid), name="Driver command latency")
+    # Requests skipped by NETWORK_BLOCK_PROFILE during this test
+    network = driver_instance.network_report()
+    if network:
+        from qa_framework.core.listeners.allure_listener import AllureListener
+        logger.info("Network blocking", **network)
+        AllureListener.attach_json(network, name="Network blocking")
+    logger.info("Releasing Driver")
+    DriverFactory.release_driver(driver_instance)
 
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
@@ -159,7 +185,7 @@ def init(
     (base_path / ".env").write_text(DEFAULT_ENV)
     (base_path / "tests/conftest.py").write_text(DEFAULT_CONFTEST)
     (base_path / "README.md").write_text(f"# {project_name}\n\nGenerated by QA Framework.")
-    (base_path / ".gitignore").write_text("__pycache__/\n*.pyc\nreports/\n.env\n.pytest_cache/\n")
+    (base_path / ".gitignore").write_text("__pycache__/\n*.pyc\nreports/\n.env\n.pytest_cache/\n.qa_cache/\n")
 
     # Specific Files
     if choice == "2":
@@ -181,5 +207,212 @@ def init(
     console.print("2. pip install -r requirements.txt (if applicable)")
     console.print("3. pytest")
 
+@app.command("bench-healing")
+def bench_healing(
+    sizes: list[int] = typer.Option([1_000, 10_000, 50_000, 200_000], help="DOM sizes (elements) to generate"),
+    heals: int = typer.Option(50, help="Mutated selectors healed per size"),
+    seed: int = typer.Option(7, help="Seed for the synthetic corpus"),
+    output: str = typer.Option(None, help="Write results as JSON to this path")
+):
+    """
+    Benchmark self-healing latency, memory and accuracy on synthetic DOMs.
+    """
+    from qa_framework.benchmarks.healing import print_results, run_benchmark
+    print_results(run_benchmark(sizes, heals=heals, seed=seed, output=output))
+
+@app.command("bench-startup")
+def bench_startup(
+    modules: list[str] = typer.Option(None, help="Modules to import (default: framework entry points)"),
+    repeat: int = typer.Option(3, help="Fresh interpreters per module (median is reported)"),
+    output: str = typer.Option(None, help="Write results as JSON to this path")
+):
+    """
+    Benchmark import time and memory of the framework modules.
+    """
+    from qa_framework.benchmarks.startup import print_results, run_benchmark
+    print_results(run_benchmark(modules or None, repeat=repeat, output=output))
+
+@app.command("page-timing")
+def page_timing(
+    run: str = typer.Option(None, help="Run id to check (default: the most recent run)"),
+    baseline: str = typer.Option(None, help="Baseline file (default: PAGE_TIMING_DIR/baseline.json)"),
+    threshold: float = typer.Option(None, help="Relative p75 growth reported as a regression (default: PAGE_TIMING_THRESHOLD)"),
+    update_baseline: bool = typer.Option(False, "--update-baseline", help="Store this run's p75s as the new baseline")
+):
+    """
+    Compare the page-load p75s captured with PAGE_TIMING_ENABLED against the baseline.
+    """
+    from rich.table import Table
+    from qa_framework.core.performance import page_timing as timing
+
+    entries = timing.load_run(run)
+    if not entries:
+        console.print("[red]No page timing captured. Run the UI suite with PAGE_TIMING_ENABLED=true.[/red]")
+        raise typer.Exit(code=1)
+    summary = timing.summarize(entries)
+    regressions = timing.compare(summary, timing.load_baseline(baseline), threshold)
+
+    table = Table(title=f"Page timing p75 (run {entries[0]['run']})")
+    for column in ("page", "samples", "ttfb", "fcp", "lcp", "load", "cls"):
+        table.add_column(column, justify="left" if column == "page" else "right")
+    for url, metrics in sorted(summary.items()):
+        table.add_row(url, *(str(metrics.get(column, "-")) for column in ("samples", "ttfb", "fcp", "lcp", "load", "cls")))
+    console.print(table)
+    for r in regressions:
+        console.print(f"[red]✘ {r['url']} {r['metric']}: {r['baseline_p75']} -> {r['current_p75']} (+{r['change']:.0%})[/red]")
+
+    if update_baseline:
+        console.print(f"[green]✔ Baseline updated: {timing.write_baseline(summary, baseline)}[/green]")
+    elif regressions:
+        raise typer.Exit(code=1)
+
+@app.command(context_settings={"allow_extra_args": True, "ignore_unknown_options": True})
+def run(
+    ctx: typer.Context,
+    workers: int = typer.Option(None, "--workers", "-n", help="Parallel pytest processes (default: RUNNER_WORKERS or CPU count)"),
+    alluredir: str = typer.Option("reports/allure-results", help="Directory the shards' Allure results are merged into"),
+    durations: str = typer.Option(None, help="Durations file (default: RUNNER_DURATIONS_FILE)"),
+    changed_since: str = typer.Option(None, help="Only run tests affected by changes since this git ref (e.g. origin/main)")
+):
+    """
+    Run tests in parallel processes balanced by previous test durations.
+    Extra arguments go to pytest, e.g. `qa run -n 4 tests/ui -m smoke`.
+    """
+    from rich.table import Table
+    from qa_framework.core.runner import parallel
+
+    only = None
+    if changed_since:
+        from qa_framework.core.runner.selection import select
+        selection = select(changed_since)
+        only = selection["tests"]
+        if only is not None:
+            console.print(f"{len(only)} of {selection['total']} tests affected by {len(selection['changed'])} changed files")
+            if not only:
+                raise typer.Exit()
+
+    result = parallel.run(ctx.args, workers=workers, alluredir=alluredir, durations_file=durations, only=only)
+    if not result["shards"]:
+        console.print("[yellow]No tests collected.[/yellow]")
+        raise typer.Exit(code=result["exit_code"])
+
+    table = Table(title=f"qa run {result['run']}")
+    for column in ("shard", "tests", "expected (s)", "actual (s)", "exit", "log"):
+        table.add_column(column, justify="left" if column == "log" else "right")
+    for shard in result["shards"]:
+        status = "[green]0[/green]" if shard.exit_code == 0 else f"[red]{shard.exit_code}[/red]"
+        table.add_row(str(shard.index), str(shard.tests), f"{shard.expected:.1f}", f"{shard.elapsed:.1f}", status, str(shard.log))
+    console.print(table)
+    console.print(f"Allure results: {alluredir}")
+    raise typer.Exit(code=result["exit_code"])
+
+@app.command(context_settings={"allow_extra_args": True, "ignore_unknown_options": True})
+def coordinator(
+    ctx: typer.Context,
+    host: str = typer.Option(None, help="Listen address (default: DIST_HOST)"),
+    port: int = typer.Option(None, help="Listen port (default: DIST_PORT)"),
+    batch_size: int = typer.Option(None, help="Largest batch handed to a worker (default: DIST_BATCH_SIZE)"),
+    alluredir: str = typer.Option("reports/allure-results", help="Directory the workers' Allure results are written to"),
+    durations: str = typer.Option(None, help="Durations file (default: RUNNER_DURATIONS_FILE)"),
+    timeout: float = typer.Option(None, help="Give up after this many seconds")
+):
+    """
+    Serve the collected tests to `qa worker` agents on other hosts and gather their results.
+    Extra arguments go to pytest (on the coordinator for collection, on the workers for the run).
+    """
+    from qa_framework.core.runner.distributed import Coordinator
+    from qa_framework.core.runner.parallel import collect
+
+    tests = collect(ctx.args)
+    if not tests:
+        console.print("[yellow]No tests collected.[/yellow]")
+        raise typer.Exit(code=5)
+    server = Coordinator(tests, ctx.args, host=host, port=port, batch_size=batch_size,
+                         alluredir=alluredir, durations_file=durations).start()
+    console.print(f"Serving {len(tests)} tests on {server.address[0]}:{server.address[1]}; waiting for workers...")
+    try:
+        finished = server.wait(timeout)
+    finally:
+        server.close()
+    result = server.summary()
+    for name, stats in result["workers"].items():
+        console.print(f"  {name}: {stats['tests']} tests in {stats['batches']} batches")
+    outcomes = [r["outcome"] for r in result["results"].values()]
+    console.print(", ".join(f"{outcomes.count(o)} {o}" for o in sorted(set(outcomes))) +
+                  f"; {result['requeued']} rescheduled")
+    if not finished:
+        console.print(f"[red]Timed out with {len(tests) - len(outcomes)} tests unfinished.[/red]")
+    console.print(f"Allure results: {alluredir}")
+    raise typer.Exit(code=result["exit_code"])
+
+@app.command()
+def worker(
+    address: str = typer.Argument(..., help="Coordinator host:port"),
+    processes: int = typer.Option(1, help="Batches run at once on this node (each its own pytest process and driver)"),
+    name: str = typer.Option(None, help="Worker name in the coordinator's report (default: hostname)")
+):
+    """
+    Pull test batches from a `qa coordinator` and run them on this node.
+    """
+    from qa_framework.core.runner.distributed import serve_workers
+
+    host, _, port = address.rpartition(":")
+    ran = serve_workers((host or "localhost", int(port)), processes=processes, name=name)
+    console.print(f"[green]✔ Ran {ran} tests[/green]")
+
+@app.command("select")
+def select_tests(
+    base: str = typer.Option("HEAD", help="Git ref to diff against (merge base is used for branches)"),
+    root: str = typer.Option(".", help="Project root scanned for tests and their dependencies"),
+    explain: bool = typer.Option(False, "--explain", help="Show the changed files each selected test depends on")
+):
+    """
+    List the tests affected by the changes since BASE (page objects, fixtures, data files, framework modules).
+    """
+    from qa_framework.core.runner.selection import DependencyMap, changed_files
+
+    changed = changed_files(base, root)
+    dependency_map = DependencyMap(root).refresh()
+    tests = dependency_map.affected(changed)
+    if tests is None:
+        console.print("[yellow]Project configuration changed: every test is affected.[/yellow]")
+        return
+    mapping = dependency_map.tests() if explain else {}
+    for test in tests:
+        console.print(test if not explain else f"{test}  <- {', '.join(sorted(mapping[test] & set(changed)))}")
+    console.print(f"[green]{len(tests)} of {len(dependency_map.tests())} tests affected by {len(changed)} changed files[/green]")
+
+@app.command("validate-selectors")
+def validate_selectors(
+    pages: list[str] = typer.Option(["pages"], help="Page object modules or directories to scan"),
+    snapshots: str = typer.Option("snapshots", help="Directory of saved HTML snapshots"),
+    report: str = typer.Option("reports/selector-report.json", help="Where to write the validation report"),
+    healed_map: str = typer.Option("healed_selectors.json", help="Where to write the healed-selector map"),
+    workers: int = typer.Option(None, help="Worker processes (default: CPU count)")
+):
+    """
+    Check every page object selector against saved DOM snapshots and pre-heal broken ones.
+    Point HEALED_SELECTORS_FILE at the healed map to use the fixes at runtime.
+    """
+    from rich.table import Table
+    from qa_framework.core.healing import validator
+
+    result = validator.validate(pages, snapshots, workers=workers)
+    validator.write_json(result, report)
+    validator.write_json(validator.healed_map(result), healed_map)
+
+    table = Table(title="Selector validation")
+    for column in ("status", "selector", "healed", "confidence", "source"):
+        table.add_column(column)
+    for entry in result["selectors"]:
+        if entry["status"] != "ok":
+            table.add_row(entry["status"], entry["selector"], entry["healed"] or "-",
+                          f"{entry['confidence']:.2f}", entry["source"])
+    console.print(table)
+    console.print(f"Summary: {result['summary']}")
+    console.print(f"[green]✔ Report: {report}  Healed map: {healed_map}[/green]")
+    if result["summary"]["broken"]:
+        raise typer.Exit(code=1)
+
 if __name__ == "__main__":
     app()
@@ -1,11 +1,16 @@
+import sys
 from typing import Any, Dict, List
 from qa_framework.core.drivers.abstract_driver import AbstractDriver
-from qa_framework.core.drivers.selenium_driver import SeleniumDriver
-from qa_framework.core.drivers.playwright_driver import PlaywrightDriver
 from qa_framework.core.logger import get_logger
 
 logger = get_logger("a11y_manager")
 
+
+def _is_driver(driver: AbstractDriver, module: str, name: str) -> bool:
+    """isinstance check that never imports a backend: an unloaded module cannot own the driver."""
+    loaded = sys.modules.get(module)
+    return loaded is not None and isinstance(driver, getattr(loaded, name))
+
 class AccessibilityManager:
     """
     Manager to run Accessibility checks using Axe-core.
@@ -23,13 +28,13 @@ class AccessibilityManager:
         logger.info("Starting Accessibility Scan...")
         report = {}
 
-        if isinstance(self.driver, SeleniumDriver):
+        if _is_driver(self.driver, "qa_framework.core.drivers.selenium_driver", "SeleniumDriver"):
             from axe_selenium_python import Axe
             axe = Axe(self.driver.driver)
             axe.inject()
             report = axe.run()
         
-        elif isinstance(self.driver, PlaywrightDriver):
+        elif _is_driver(self.driver, "qa_framework.core.drivers.playwright_driver", "PlaywrightDriver"):
             from axe_playwright_python.sync_playwright import Axe
             # Axe for Playwright works on the Page object
             axe = Axe()
@@ -1,7 +1,6 @@
 import json
 import yaml
 import csv
-import openpyxl
 from typing import Any, Dict, List
 from qa_framework.core.exceptions import DataLoadingError
 
@@ -51,6 +50,8 @@ class DataLoader:
         Loads data from an Excel file. 
         Returns a list of dictionaries where keys are header row values.
         """
+        import openpyxl  # optional and slow to import; only needed for Excel data
+
         try:
             workbook = openpyxl.load_workbook(path, data_only=True)
             if sheet_name:
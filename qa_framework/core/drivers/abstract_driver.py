@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Dict, List, Optional, Sequence
 
 class AbstractDriver(ABC):
     """
@@ -37,6 +37,19 @@ class AbstractDriver(ABC):
         """Takes a screenshot and saves it to the path."""
         pass
 
+    def screenshot_bytes(self) -> bytes:
+        """Takes a screenshot and returns the PNG bytes (default: via a temporary file)."""
+        import os
+        import tempfile
+        fd, path = tempfile.mkstemp(suffix=".png")
+        os.close(fd)
+        try:
+            self.screenshot(path)
+            with open(path, "rb") as f:
+                return f.read()
+        finally:
+            os.unlink(path)
+
     @abstractmethod
     def find_element(self, selector: str) -> Any:
         """Finds an element."""
@@ -56,3 +69,64 @@ class AbstractDriver(ABC):
     def get_text(self, selector: str) -> str:
         """Returns the text content of an element."""
         pass
+
+    def batch(self, ops: Sequence[tuple]) -> List[Any]:
+        """
+        Runs several element operations and returns one BatchResult per item:
+        ("get_text", sel), ("get_attribute", sel, name), ("click", sel), ("type", sel, text).
+        Failures are reported per item instead of raising. Browser drivers send
+        the whole list in a single script call; this default runs them one by one.
+        """
+        from qa_framework.core.drivers.batch import run_individually
+        return [run_individually(self, op) for op in ops]
+
+    def get_texts(self, selectors: Sequence[str]) -> List[str]:
+        """Returns the text of every selector; raises BatchOperationError listing the ones that failed."""
+        from qa_framework.core.drivers.batch import raise_for_errors
+        return [r.value for r in raise_for_errors(self.batch([("get_text", s) for s in selectors]))]
+
+    def wait_for(self, condition: Any, timeout: Optional[float] = None) -> Any:
+        """
+        Blocks until the condition (see qa_framework.core.waits.conditions) holds
+        and returns the matched element, if any. Raises WaitTimeoutError after
+        timeout seconds (default EXPLICIT_WAIT). This default polls find_element.
+        """
+        from qa_framework.core.waits.conditions import poll_until
+        return poll_until(self, condition, timeout)
+
+    def network_report(self) -> Dict[str, Any]:
+        """
+        Requests blocked by NETWORK_BLOCK_PROFILE since the last call, with the
+        estimated bytes saved. Empty if blocking is off or unsupported.
+        """
+        return {}
+
+    def use_archive(self, name: str) -> None:
+        """
+        Selects the network archive (NETWORK_ARCHIVE_MODE) for the next test,
+        e.g. its pytest node id. Call before navigating. No-op by default.
+        """
+        pass
+
+    def reset(self) -> None:
+        """
+        Returns the session to a clean state for the next test.
+        Backends override this with something cheaper than a restart.
+        """
+        self.quit()
+        self.start()
+
+    def is_healthy(self) -> bool:
+        """Returns False if the session can no longer be used."""
+        return True
+
+    def save_session(self) -> Dict[str, Any]:
+        """
+        Captures the authenticated state (cookies and local storage) in the
+        Playwright storage_state layout plus the current 'url'.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support session snapshots")
+
+    def load_session(self, state: Dict[str, Any]) -> None:
+        """Restores a snapshot from save_session() and opens its URL."""
+        raise NotImplementedError(f"{type(self).__name__} does not support session snapshots")
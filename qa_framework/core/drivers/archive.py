@@ -0,0 +1,232 @@
+import base64
+import hashlib
+import http.client
+import json
+import re
+import select
+import socket
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+from qa_framework.core.config import settings
+from qa_framework.core.logger import get_logger
+
+logger = get_logger("network_archive")
+
+MODES = ("off", "record", "replay", "auto")
+HOP_BY_HOP = {"connection", "keep-alive", "proxy-connection", "proxy-authorization", "te", "trailers",
+              "transfer-encoding", "upgrade", "content-length"}
+
+
+def archive_path(name: str, directory: Optional[str] = None) -> Path:
+    """HAR file for an archive name such as a pytest node id."""
+    safe_name = re.sub(r"[^\w.-]+", "_", name).strip("_") or "session"
+    return Path(directory or settings.NETWORK_ARCHIVE_DIR) / f"{safe_name}.har"
+
+
+def effective_mode(path: Path, mode: Optional[str] = None) -> str:
+    """Resolves 'auto' to 'record' for a missing archive and to 'replay' for an existing one."""
+    mode = mode or settings.NETWORK_ARCHIVE_MODE
+    if mode not in MODES:
+        raise ValueError(f"Unknown NETWORK_ARCHIVE_MODE '{mode}'. Choose from: {', '.join(MODES)}")
+    if mode == "auto":
+        return "replay" if path.exists() else "record"
+    return mode
+
+
+def _request_key(method: str, url: str, body: bytes) -> Tuple[str, str, str]:
+    return method.upper(), url, hashlib.sha1(body or b"").hexdigest()
+
+
+class HarArchive:
+    """
+    Minimal HAR 1.2 reader/writer for the Selenium archive proxy.
+    Repeated identical requests are replayed in recorded order, the last
+    response being reused once they run out.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.entries: List[Dict[str, Any]] = []
+        self._served: Dict[Tuple[str, str, str], int] = {}
+        self._index: Dict[Tuple[str, str, str], List[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        if self.path.exists():
+            with open(self.path) as f:
+                self.entries = json.load(f)["log"]["entries"]
+            for entry in self.entries:
+                self._index.setdefault(self._entry_key(entry), []).append(entry)
+
+    @staticmethod
+    def _entry_key(entry: Dict[str, Any]) -> Tuple[str, str, str]:
+        request = entry["request"]
+        body = base64.b64decode(request.get("postData", {}).get("_base64", ""))
+        return _request_key(request["method"], request["url"], body)
+
+    def add(self, method: str, url: str, body: bytes, status: int, reason: str,
+            headers: List[Tuple[str, str]], content: bytes) -> None:
+        entry = {
+            "startedDateTime": datetime.now(timezone.utc).isoformat(),
+            "request": {
+                "method": method, "url": url, "headers": [],
+                "postData": {"_base64": base64.b64encode(body).decode()} if body else {},
+            },
+            "response": {
+                "status": status, "statusText": reason,
+                "headers": [{"name": k, "value": v} for k, v in headers],
+                "content": {"size": len(content), "text": base64.b64encode(content).decode(), "encoding": "base64"},
+            },
+        }
+        with self._lock:
+            self.entries.append(entry)
+            self._index.setdefault(self._entry_key(entry), []).append(entry)
+
+    def lookup(self, method: str, url: str, body: bytes) -> Optional[Dict[str, Any]]:
+        key = _request_key(method, url, body)
+        with self._lock:
+            candidates = self._index.get(key)
+            if not candidates:
+                return None
+            served = self._served.get(key, 0)
+            self._served[key] = served + 1
+            return candidates[min(served, len(candidates) - 1)]
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            data = {"log": {"version": "1.2", "creator": {"name": "qa_framework", "version": "1"},
+                            "entries": self.entries}}
+        with open(self.path, "w") as f:
+            json.dump(data, f)
+
+
+class _ProxyHandler(BaseHTTPRequestHandler):
+    server: "ArchiveProxy"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass  # requests are summarised by the proxy instead
+
+    def _forward(self, body: bytes):
+        parts = urlsplit(self.path)
+        conn_cls = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        conn = conn_cls(parts.hostname, parts.port, timeout=30)
+        headers = {k: v for k, v in self.headers.items() if k.lower() not in HOP_BY_HOP}
+        try:
+            conn.request(self.command, parts.path + (f"?{parts.query}" if parts.query else "") or "/", body, headers)
+            response = conn.getresponse()
+            return response.status, response.reason, response.getheaders(), response.read()
+        finally:
+            conn.close()
+
+    def _respond(self, status: int, reason: str, headers: List[Tuple[str, str]], content: bytes) -> None:
+        self.send_response(status, reason)
+        for name, value in headers:
+            if name.lower() not in HOP_BY_HOP:
+                self.send_header(name, value)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(content)
+
+    def _handle(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        proxy = self.server
+        if proxy.mode == "replay":
+            entry = proxy.archive.lookup(self.command, self.path, body)
+            if entry is not None:
+                response = entry["response"]
+                content = base64.b64decode(response["content"].get("text", ""))
+                headers = [(h["name"], h["value"]) for h in response["headers"]]
+                proxy.stats["replayed"] += 1
+                return self._respond(response["status"], response["statusText"], headers, content)
+            proxy.stats["missing"] += 1
+            if not proxy.fallthrough:
+                logger.warning(f"No archived response for {self.command} {self.path}")
+                return self._respond(404, "Not Archived", [("Content-Type", "text/plain")], b"not archived")
+
+        try:
+            status, reason, headers, content = self._forward(body)
+        except OSError as e:
+            return self._respond(502, "Bad Gateway", [("Content-Type", "text/plain")], str(e).encode())
+        if proxy.mode == "record":
+            proxy.archive.add(self.command, self.path, body, status, reason, headers, content)
+            proxy.stats["recorded"] += 1
+        self._respond(status, reason, headers, content)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = do_OPTIONS = _handle
+
+    def do_CONNECT(self):
+        """HTTPS is tunnelled untouched (not archived); refused in strict replay."""
+        proxy = self.server
+        if proxy.mode == "replay" and not proxy.fallthrough:
+            return self._respond(403, "HTTPS Not Archived", [], b"")
+        host, _, port = self.path.partition(":")
+        try:
+            upstream = socket.create_connection((host, int(port or 443)), timeout=30)
+        except OSError as e:
+            return self._respond(502, "Bad Gateway", [], str(e).encode())
+        self.send_response(200, "Connection Established")
+        self.end_headers()
+        proxy.stats["tunnelled"] += 1
+        sockets = [self.connection, upstream]
+        try:
+            while True:
+                readable, _, errored = select.select(sockets, [], sockets, 30)
+                if errored or not readable:
+                    break
+                for sock in readable:
+                    data = sock.recv(65536)
+                    if not data:
+                        return
+                    (upstream if sock is self.connection else self.connection).sendall(data)
+        finally:
+            upstream.close()
+            self.close_connection = True
+
+
+class ArchiveProxy(ThreadingHTTPServer):
+    """
+    Local HTTP proxy that records traffic to a HAR archive or replays it.
+    The Selenium stand-in for Playwright's route_from_har. Plain HTTP
+    requests are archived; HTTPS is tunnelled, since it cannot be read
+    without a man-in-the-middle certificate.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, path: Path, mode: str, fallthrough: bool = True):
+        super().__init__(("127.0.0.1", 0), _ProxyHandler)
+        self.fallthrough = fallthrough
+        self.stats = {"recorded": 0, "replayed": 0, "missing": 0, "tunnelled": 0}
+        self._thread: Optional[threading.Thread] = None
+        self.archive: HarArchive = None
+        self.mode = "off"
+        self.use(path, mode)
+
+    @property
+    def address(self) -> str:
+        host, port = self.server_address[:2]
+        return f"{host}:{port}"
+
+    def use(self, path: Path, mode: str) -> None:
+        """Switches to another archive, saving the one being recorded."""
+        if self.archive is not None and self.mode == "record":
+            self.archive.save()
+        self.archive = HarArchive(path)
+        self.mode = mode
+        logger.info(f"Network archive {path} in {mode} mode")
+
+    def start(self) -> "ArchiveProxy":
+        self._thread = threading.Thread(target=self.serve_forever, name="qa-archive-proxy", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self.mode == "record":
+            self.archive.save()
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,245 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page, TimeoutError as PlaywrightTimeoutError
+from qa_framework.core.drivers.abstract_driver import AbstractDriver
+from qa_framework.core.drivers.locator import Locator
+from qa_framework.core.config import settings
+from qa_framework.core.logger import get_logger
+from qa_framework.core.exceptions import DriverInitializationError
+
+logger = get_logger("async_playwright_driver")
+
+
+class AsyncPlaywrightDriver:
+    """
+    asyncio Playwright driver mirroring the AbstractDriver method names (goto,
+    click, type, get_text, ...) as coroutines. It is not an AbstractDriver
+    itself; AsyncPlaywrightFacade wraps it for the synchronous interface.
+    One browser serves many isolated pages: new_page() opens a sibling driver
+    in its own BrowserContext, and run_many() sweeps a list of items across
+    pages with at most ASYNC_CONCURRENCY in flight.
+
+        async def title_of(page, url):
+            await page.goto(url)
+            return await page.get_title()
+
+        driver = AsyncPlaywrightDriver()
+        await driver.start()
+        titles = await driver.run_many(urls, title_of)
+    """
+
+    def __init__(self, browser: Optional[Browser] = None, concurrency: Optional[int] = None):
+        self._playwright = None
+        self._browser: Browser = browser
+        self._context: BrowserContext = None
+        self._page: Page = None
+        self._owns_browser = browser is None
+        self.concurrency = concurrency or settings.ASYNC_CONCURRENCY
+
+    async def start(self) -> None:
+        try:
+            if self._owns_browser:
+                logger.info("Initializing async Playwright Driver", browser=settings.BROWSER, headless=settings.HEADLESS)
+                self._playwright = await async_playwright().start()
+                browser_type = {"firefox": "firefox", "webkit": "webkit"}.get(settings.BROWSER.lower(), "chromium")
+                self._browser = await getattr(self._playwright, browser_type).launch(headless=settings.HEADLESS)
+            await self._new_context()
+        except Exception as e:
+            logger.error("Failed to initialize async Playwright Driver", error=str(e))
+            raise DriverInitializationError("Async Playwright init failed", original_exception=e)
+
+    async def _new_context(self, storage_state: Optional[Dict[str, Any]] = None) -> None:
+        self._context = await self._browser.new_context(storage_state=storage_state)
+        self._page = await self._context.new_page()
+
+    async def new_page(self) -> "AsyncPlaywrightDriver":
+        """Returns a driver for a new isolated page on the same browser. Close it with close()."""
+        driver = AsyncPlaywrightDriver(browser=self._browser, concurrency=self.concurrency)
+        await driver._new_context()
+        return driver
+
+    async def close(self) -> None:
+        """Closes this driver's context; the shared browser keeps running."""
+        if self._context:
+            await self._context.close()
+            self._context = None
+            self._page = None
+
+    async def quit(self) -> None:
+        await self.close()
+        if self._owns_browser and self._browser:
+            logger.info("Quitting async Playwright Driver")
+            await self._browser.close()
+            await self._playwright.stop()
+            self._browser = None
+            self._playwright = None
+
+    async def run_many(self,
+                       items: Iterable[Any],
+                       fn: Callable[["AsyncPlaywrightDriver", Any], Awaitable[Any]],
+                       concurrency: Optional[int] = None) -> List[Any]:
+        """
+        Runs fn(page_driver, item) for every item, each on a fresh page, with at
+        most `concurrency` pages open. Results keep the order of the items; an
+        item that failed yields its exception instead of aborting the sweep.
+        """
+        limiter = asyncio.Semaphore(concurrency or self.concurrency)
+
+        async def run(item):
+            async with limiter:
+                page = await self.new_page()
+                try:
+                    return await fn(page, item)
+                finally:
+                    await page.close()
+
+        return await asyncio.gather(*(run(item) for item in items), return_exceptions=True)
+
+    async def goto(self, url: str) -> None:
+        await self._page.goto(url)
+
+    async def get_title(self) -> str:
+        return await self._page.title()
+
+    def get_driver(self):
+        return self._page
+
+    @property
+    def page(self) -> Page:
+        return self._page
+
+    async def screenshot(self, path: str) -> str:
+        await self._page.screenshot(path=path)
+        return path
+
+    async def screenshot_bytes(self) -> bytes:
+        return await self._page.screenshot()
+
+    async def find_element(self, selector: str):
+        """
+        Returns a Locator, built once per page for each selector.
+        """
+        locator = Locator(selector)
+        page = self._page
+        return locator.native(page, lambda: page.locator(locator.playwright))
+
+    async def _heal(self, selector: str) -> Optional[str]:
+        """
+        Runs the shared (synchronous) healing flow in a worker thread; its page
+        callbacks are scheduled back onto this event loop.
+        """
+        from qa_framework.core.healing.browser import playwright_runner
+        from qa_framework.core.healing.resolver import HealingResolver
+
+        loop = asyncio.get_running_loop()
+        page = self._page
+        run_script = playwright_runner(page)
+
+        def call(coroutine):
+            return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
+
+        async def probe(css_selector: str):
+            return css_selector if await page.locator(css_selector).count() else None
+
+        resolver = HealingResolver(
+            get_url=lambda: page.url,
+            get_page_source=lambda: call(page.content()),
+            probe=lambda css_selector: call(probe(css_selector)),
+            run_script=lambda meta, k: call(run_script(meta, k)),
+        )
+        return await asyncio.to_thread(resolver.resolve, selector)
+
+    async def _with_healing(self, selector: str, action: Callable[[str, Optional[float]], Awaitable[Any]]) -> Any:
+        """Async counterpart of PlaywrightDriver._with_healing."""
+        from qa_framework.core.healing.cache import BrokenSelectorRegistry
+
+        registry = BrokenSelectorRegistry.shared()
+        known_broken = (settings.ENABLE_SELF_HEALING and registry.is_known(selector)
+                        and registry.is_broken(self._page.url, selector))
+        timeout = max(settings.BROKEN_SELECTOR_WAIT * 1000, 1) if known_broken else None
+        try:
+            return await action(Locator(selector).playwright, timeout)
+        except PlaywrightTimeoutError:
+            if not settings.ENABLE_SELF_HEALING:
+                raise
+            healed_selector = await self._heal(selector)
+            if healed_selector is None:
+                raise
+            return await action(healed_selector, None)
+
+    async def click(self, selector: str):
+        await self._with_healing(selector, lambda s, timeout: self._page.click(s, timeout=timeout))
+
+    async def type(self, selector: str, text: str):
+        await self._with_healing(selector, lambda s, timeout: self._page.fill(s, text, timeout=timeout))
+
+    async def get_text(self, selector: str) -> str:
+        return await self._with_healing(selector, lambda s, timeout: self._page.locator(s).inner_text(timeout=timeout))
+
+
+class AsyncPlaywrightFacade(AbstractDriver):
+    """
+    Synchronous AbstractDriver over an AsyncPlaywrightDriver, so existing page
+    objects work unchanged. The event loop runs in a background thread; each
+    call blocks until its coroutine finishes, while run_many() still drives
+    many pages concurrently on that loop.
+    """
+
+    def __init__(self, driver: Optional[AsyncPlaywrightDriver] = None):
+        self.async_driver = driver or AsyncPlaywrightDriver()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self, coroutine: Awaitable[Any]) -> Any:
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def start(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="qa-async-playwright", daemon=True)
+        self._thread.start()
+        self._run(self.async_driver.start())
+
+    def quit(self) -> None:
+        if self._loop:
+            try:
+                self._run(self.async_driver.quit())
+            finally:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._thread.join()
+                self._loop.close()
+                self._loop = None
+                self._thread = None
+
+    def run_many(self, items: Iterable[Any], fn: Callable[[AsyncPlaywrightDriver, Any], Awaitable[Any]],
+                 concurrency: Optional[int] = None) -> List[Any]:
+        """Blocking AsyncPlaywrightDriver.run_many; fn is still a coroutine function."""
+        return self._run(self.async_driver.run_many(items, fn, concurrency))
+
+    def goto(self, url: str) -> None:
+        self._run(self.async_driver.goto(url))
+
+    def get_title(self) -> str:
+        return self._run(self.async_driver.get_title())
+
+    def get_driver(self):
+        """Returns the async Playwright Page; its methods must run on the facade's loop."""
+        return self.async_driver.get_driver()
+
+    def screenshot(self, path: str) -> str:
+        return self._run(self.async_driver.screenshot(path))
+
+    def screenshot_bytes(self) -> bytes:
+        return self._run(self.async_driver.screenshot_bytes())
+
+    def find_element(self, selector: str):
+        return self._run(self.async_driver.find_element(selector))
+
+    def click(self, selector: str) -> None:
+        self._run(self.async_driver.click(selector))
+
+    def type(self, selector: str, text: str) -> None:
+        self._run(self.async_driver.type(selector, text))
+
+    def get_text(self, selector: str) -> str:
+        return self._run(self.async_driver.get_text(selector))
@@ -1,5 +1,6 @@
-from typing import Any
+from typing import Any, Optional
 from qa_framework.core.drivers.abstract_driver import AbstractDriver
+from qa_framework.core.drivers.locator import compile_class_locators
 from qa_framework.core.logger import get_logger
 
 logger = get_logger("base_page")
@@ -7,7 +8,13 @@ logger = get_logger("base_page")
 class BasePage:
     """
     Base class for all Page Objects.
+    UPPER_CASE selector constants of subclasses become Locators when the
+    class is defined, so they are parsed once rather than on every call.
     """
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        compile_class_locators(cls)
+
     def __init__(self, driver: AbstractDriver):
         self.driver = driver
 
@@ -21,8 +28,34 @@ class BasePage:
         return self.driver.get_title()
 
     def screenshot(self, filename: str) -> str:
-        """Takes a screenshot."""
-        return self.driver.screenshot(filename)
+        """
+        Takes a screenshot; the file is encoded (after its suffix) and written
+        in the background. ScreenshotService.shared().flush() waits for it.
+        """
+        from qa_framework.core.screenshots import ScreenshotService
+        ScreenshotService.shared().save(self.driver, filename)
+        return filename
+
+    # Explicit waits: return as soon as the condition holds, instead of time.sleep
+    def wait_for_visible(self, selector: str, timeout: Optional[float] = None) -> Any:
+        from qa_framework.core.waits.conditions import visible
+        return self.driver.wait_for(visible(selector), timeout)
+
+    def wait_for_clickable(self, selector: str, timeout: Optional[float] = None) -> Any:
+        from qa_framework.core.waits.conditions import clickable
+        return self.driver.wait_for(clickable(selector), timeout)
+
+    def wait_for_text(self, selector: str, text: str, timeout: Optional[float] = None) -> Any:
+        from qa_framework.core.waits.conditions import text_equals
+        return self.driver.wait_for(text_equals(selector, text), timeout)
+
+    def wait_for_count_stable(self, selector: str, stable_ms: int = 500, timeout: Optional[float] = None) -> int:
+        from qa_framework.core.waits.conditions import count_stable
+        return self.driver.wait_for(count_stable(selector, stable_ms), timeout)
+
+    def wait_for_network_idle(self, idle_ms: int = 500, timeout: Optional[float] = None) -> None:
+        from qa_framework.core.waits.conditions import network_idle
+        self.driver.wait_for(network_idle(idle_ms), timeout)
     
     # NOTE:
     # Because Selenium and Playwright handle element location differently 
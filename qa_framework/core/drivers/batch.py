@@ -0,0 +1,114 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from qa_framework.core.drivers.locator import Locator
+from qa_framework.core.exceptions import BatchOperationError
+
+# ("get_text", selector) | ("get_attribute", selector, name) | ("click", selector) | ("type", selector, text)
+BatchOp = Tuple[str, ...]
+
+READ_OPS = ("get_text", "get_attribute")
+OPS = READ_OPS + ("click", "type")
+
+# Runs every operation in one script call and reports each one separately.
+# Elements are looked up without waiting, and click/type are DOM-level
+# (el.click(), value setter + input/change events) rather than native input.
+BATCH_FUNCTION = r"""
+(ops) => {
+    const find = (by, value) => {
+        if (by === 'id') return document.getElementById(value);
+        if (by === 'name') return document.getElementsByName(value)[0] || null;
+        if (by === 'xpath') {
+            return document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        }
+        return document.querySelector(value);
+    };
+    return ops.map((op) => {
+        try {
+            const el = find(op.by, op.value);
+            if (!el) return {error: 'not found', missing: true};
+            if (op.op === 'get_text') return {value: el.innerText !== undefined ? el.innerText : el.textContent};
+            if (op.op === 'get_attribute') return {value: el.getAttribute(op.arg)};
+            if (op.op === 'click') { el.click(); return {value: null}; }
+            if (op.op === 'type') {
+                el.focus();
+                const proto = Object.getPrototypeOf(el);
+                const setter = Object.getOwnPropertyDescriptor(proto, 'value');
+                const value = (el.value || '') + op.arg;
+                if (setter && setter.set) setter.set.call(el, value); else el.value = value;
+                el.dispatchEvent(new Event('input', {bubbles: true}));
+                el.dispatchEvent(new Event('change', {bubbles: true}));
+                return {value: null};
+            }
+            return {error: 'unsupported operation ' + op.op};
+        } catch (e) {
+            return {error: String(e && e.message || e)};
+        }
+    });
+}
+"""
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one batched operation."""
+    op: str
+    selector: str
+    value: Any = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def compile_selector(selector: str) -> Tuple[str, str]:
+    """Maps a framework selector to the (strategy, value) pair understood by BATCH_FUNCTION."""
+    return Locator(selector).script
+
+
+def compile_ops(ops: Sequence[BatchOp]) -> List[Dict[str, Any]]:
+    """Validates the operations and turns them into the script payload."""
+    payload = []
+    for op in ops:
+        if op[0] not in OPS:
+            raise ValueError(f"Unsupported batch operation: {op[0]}")
+        by, value = compile_selector(op[1])
+        payload.append({"op": op[0], "by": by, "value": value, "arg": op[2] if len(op) > 2 else None})
+    return payload
+
+
+def run_individually(driver, op: BatchOp) -> BatchResult:
+    """Runs one operation through the driver's regular (waiting, self-healing) methods."""
+    name, selector, *args = op
+    result = BatchResult(name, selector)
+    try:
+        if name == "get_attribute":
+            result.value = driver.find_element(selector).get_attribute(*args)
+        else:
+            result.value = getattr(driver, name)(selector, *args)
+    except Exception as e:
+        result.error = str(e) or type(e).__name__
+    return result
+
+
+def collect_results(driver, ops: Sequence[BatchOp], raw: List[Dict[str, Any]]) -> List[BatchResult]:
+    """
+    Converts the script output into BatchResults. Reads whose element was not
+    found are retried through the regular methods, so they still get the
+    implicit wait and self-healing; actions are not retried out of order.
+    """
+    results = []
+    for op, item in zip(ops, raw):
+        if item.get("missing") and op[0] in READ_OPS:
+            results.append(run_individually(driver, op))
+        else:
+            results.append(BatchResult(op[0], op[1], item.get("value"), item.get("error")))
+    return results
+
+
+def raise_for_errors(results: List[BatchResult]) -> List[BatchResult]:
+    failed = [r for r in results if not r.ok]
+    if failed:
+        details = "; ".join(f"{r.op} {r.selector}: {r.error}" for r in failed)
+        raise BatchOperationError(f"{len(failed)} of {len(results)} batched operations failed: {details}", results)
+    return results
@@ -0,0 +1,174 @@
+import atexit
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from qa_framework.core.config import settings
+from qa_framework.core.exceptions import DriverInitializationError
+from qa_framework.core.logger import get_logger
+
+logger = get_logger("device_pool")
+
+# Seconds a test waits for a free device
+ACQUIRE_TIMEOUT = 600.0
+
+
+@dataclass
+class Device:
+    udid: str
+    index: int
+    driver: Any = None
+    busy: bool = False
+    failures: int = 0
+    uses: int = 0
+    retired: bool = False
+
+
+def configured_devices() -> List[Tuple[int, str]]:
+    """
+    MOBILE_UDIDS split across pytest-xdist workers, qa run shards and the
+    processes of a qa worker, so no two workers on a host share a device. Each UDID keeps its position in the full list,
+    which its device-side port is derived from.
+    """
+    from qa_framework.core.runner.identity import host_slot, worker_name
+
+    udids = [u.strip() for u in settings.MOBILE_UDIDS.split(",") if u.strip()] or [settings.MOBILE_UDID or ""]
+    devices = list(enumerate(udids))
+    index, count = host_slot()
+    if index is not None and count:
+        devices = devices[index::count]
+        if not devices:
+            raise DriverInitializationError(f"No device left for worker {worker_name()}; configure more MOBILE_UDIDS")
+    return devices
+
+
+def _port_capabilities(index: int) -> Dict[str, Any]:
+    """Parallel sessions on one Appium server need their own device-side ports."""
+    port = settings.MOBILE_PORT_BASE + index
+    if (settings.MOBILE_PLATFORM_NAME or "").lower() == "ios":
+        return {"appium:wdaLocalPort": port}
+    return {"appium:systemPort": port}
+
+
+def _create_mobile_driver(udid: str, index: int):
+    from qa_framework.core.drivers.mobile_driver import MobileDriver
+
+    # noReset: re-provisioned sessions keep the installed app instead of reinstalling it
+    capabilities = {"appium:noReset": True, **_port_capabilities(index)}
+    driver = MobileDriver(udid=udid or None, capabilities=capabilities)
+    if settings.INSTRUMENTATION_ENABLED:
+        from qa_framework.core.instrumentation import instrument
+        instrument(driver)
+    driver.start()
+    return driver
+
+
+class DevicePool:
+    """
+    Hands out Appium sessions across the devices in MOBILE_UDIDS, one test
+    per device at a time. Sessions stay open between tests and the app is
+    reset with MobileDriver.reset() (terminate, clear data, activate) rather
+    than a reinstall. Devices that fail their health check or reset get a
+    new session; after MOBILE_DEVICE_MAX_FAILURES consecutive failures a
+    device is retired for the rest of the run.
+    """
+
+    _shared: Optional["DevicePool"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self,
+                 udids: Optional[List[str]] = None,
+                 create: Callable[[str, int], Any] = _create_mobile_driver,
+                 max_failures: Optional[int] = None):
+        devices = list(enumerate(udids)) if udids is not None else configured_devices()
+        self.devices = [Device(udid, index) for index, udid in devices]
+        self.create = create
+        self.max_failures = max_failures if max_failures is not None else settings.MOBILE_DEVICE_MAX_FAILURES
+        self._available = threading.Condition()
+        self._by_driver: Dict[int, Device] = {}
+
+    @classmethod
+    def shared(cls) -> "DevicePool":
+        """Returns the process-wide pool, closed automatically at interpreter exit."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+                atexit.register(cls._shared.close)
+            return cls._shared
+
+    def _checkout(self, deadline: float) -> Device:
+        with self._available:
+            while True:
+                live = [d for d in self.devices if not d.retired]
+                if not live:
+                    raise DriverInitializationError("Every device in the pool has been retired")
+                # Prefer devices with a session already open
+                free = sorted((d for d in live if not d.busy), key=lambda d: d.driver is None)
+                if free:
+                    free[0].busy = True
+                    return free[0]
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._available.wait(remaining):
+                    raise DriverInitializationError("Timed out waiting for a free device")
+
+    def acquire(self, timeout: Optional[float] = None) -> Any:
+        """Returns a healthy session on a free device, (re-)provisioning it if needed."""
+        deadline = time.monotonic() + (timeout if timeout is not None else ACQUIRE_TIMEOUT)
+        while True:
+            device = self._checkout(deadline)
+            if device.driver is not None and not device.driver.is_healthy():
+                logger.warning("Device failed its health check; re-provisioning", udid=device.udid)
+                self._drop_session(device)
+                device.failures += 1
+            if device.driver is None and device.failures >= self.max_failures:
+                device.retired = True
+                logger.error("Retiring device after repeated failures", udid=device.udid, failures=device.failures)
+                self._give_back(device)
+                continue
+            if device.driver is None:
+                started = time.monotonic()
+                try:
+                    device.driver = self.create(device.udid, device.index)
+                except Exception as e:
+                    device.failures += 1
+                    logger.warning("Device provisioning failed", udid=device.udid, error=str(e))
+                    self._give_back(device)
+                    continue
+                logger.info("Provisioned device session", udid=device.udid, seconds=round(time.monotonic() - started, 2))
+            device.uses += 1
+            self._by_driver[id(device.driver)] = device
+            return device.driver
+
+    def release(self, driver: Any) -> None:
+        """Resets the app for the next test and frees the device."""
+        device = self._by_driver.pop(id(driver))
+        try:
+            driver.reset()
+            device.failures = 0
+        except Exception as e:
+            logger.warning("App reset failed; device will be re-provisioned", udid=device.udid, error=str(e))
+            device.failures += 1
+            self._drop_session(device)
+        self._give_back(device)
+
+    def _drop_session(self, device: Device) -> None:
+        driver, device.driver = device.driver, None
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning("Failed to quit device session", udid=device.udid, error=str(e))
+
+    def _give_back(self, device: Device) -> None:
+        with self._available:
+            device.busy = False
+            self._available.notify_all()
+
+    def status(self) -> List[Dict[str, Any]]:
+        return [{"udid": d.udid, "busy": d.busy, "uses": d.uses, "failures": d.failures,
+                 "retired": d.retired, "session": d.driver is not None} for d in self.devices]
+
+    def close(self) -> None:
+        """Quits every idle session."""
+        for device in self.devices:
+            if device.driver is not None and not device.busy:
+                self._drop_session(device)
@@ -1,23 +1,69 @@
+from typing import Optional
 from qa_framework.core.drivers.abstract_driver import AbstractDriver
-from qa_framework.core.drivers.selenium_driver import SeleniumDriver
-from qa_framework.core.drivers.playwright_driver import PlaywrightDriver
-from qa_framework.core.drivers.mobile_driver import MobileDriver
 from qa_framework.core.config import settings
 from qa_framework.core.exceptions import DriverInitializationError
 
 class DriverFactory:
     """
     Factory to create the appropriate driver instance based on configuration.
+    Backends are imported on first use, so only the selected UI stack
+    (Selenium, Playwright or Appium) is loaded.
     """
     @staticmethod
     def get_driver() -> AbstractDriver:
         # Check for Mobile First
         if settings.MOBILE_PLATFORM_NAME:
+            from qa_framework.core.drivers.mobile_driver import MobileDriver
             driver = MobileDriver()
         elif settings.USE_PLAYWRIGHT:
+            from qa_framework.core.drivers.playwright_driver import PlaywrightDriver
             driver = PlaywrightDriver()
         else:
+            from qa_framework.core.drivers.selenium_driver import SeleniumDriver
             driver = SeleniumDriver()
-        
+
+        if settings.INSTRUMENTATION_ENABLED:
+            from qa_framework.core.instrumentation import instrument
+            instrument(driver)
+
         driver.start()
         return driver
+
+    @staticmethod
+    def acquire_driver(role: Optional[str] = None) -> AbstractDriver:
+        """
+        Returns a driver for one test: a session on a free device when
+        MOBILE_UDIDS lists a device pool, a warm, reset browser from the pool
+        when DRIVER_POOL_ENABLED, otherwise a newly started one.
+        With a role registered in SessionStore the driver starts already logged in.
+        Hand it back with release_driver().
+        """
+        if DriverFactory._uses_device_pool():
+            from qa_framework.core.drivers.device_pool import DevicePool
+            driver = DevicePool.shared().acquire()
+        elif settings.DRIVER_POOL_ENABLED:
+            from qa_framework.core.drivers.pool import DriverPool
+            driver = DriverPool.shared().acquire()
+        else:
+            driver = DriverFactory.get_driver()
+
+        if role:
+            from qa_framework.core.drivers.session import SessionStore
+            SessionStore().authenticate(driver, role)
+        return driver
+
+    @staticmethod
+    def release_driver(driver: AbstractDriver) -> None:
+        """Returns a driver from acquire_driver() to the pool, or quits it."""
+        if DriverFactory._uses_device_pool():
+            from qa_framework.core.drivers.device_pool import DevicePool
+            DevicePool.shared().release(driver)
+        elif settings.DRIVER_POOL_ENABLED:
+            from qa_framework.core.drivers.pool import DriverPool
+            DriverPool.shared().release(driver)
+        else:
+            driver.quit()
+
+    @staticmethod
+    def _uses_device_pool() -> bool:
+        return bool(settings.MOBILE_PLATFORM_NAME and settings.MOBILE_UDIDS)
@@ -0,0 +1,237 @@
+import atexit
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+import urllib3
+from selenium import webdriver
+from selenium.common.exceptions import SessionNotCreatedException, WebDriverException
+from selenium.webdriver.remote.client_config import ClientConfig
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+from qa_framework.core.config import settings
+from qa_framework.core.exceptions import DriverInitializationError
+from qa_framework.core.logger import get_logger
+
+logger = get_logger("grid_connector")
+
+# "Session not created" messages grids and cloud vendors return when every slot is busy
+CAPACITY_ERROR = re.compile(
+    r"capacity|parallel (tests|sessions)|queue (is )?full|no (available|free) (nodes?|slots?)|"
+    r"timed out waiting for a (node|slot)|too many (sessions|requests)",
+    re.IGNORECASE,
+)
+
+# Prewarmed sessions idle longer than this are pinged before being handed out,
+# since grids reap idle sessions (Selenium Grid: 300s by default)
+IDLE_CHECK_SECONDS = 60
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    return round(ordered[min(int(q * len(ordered)), len(ordered) - 1)], 3) if ordered else 0.0
+
+
+class PooledRemoteConnection(RemoteConnection):
+    """RemoteConnection that sends its commands over the connector's shared keep-alive pool."""
+
+    def __init__(self, client_config: ClientConfig, manager: urllib3.PoolManager):
+        self._shared_manager = manager
+        super().__init__(client_config=client_config)
+
+    def _get_connection_manager(self):
+        return self._shared_manager
+
+    def close(self):
+        pass  # the pool outlives the session; GridConnector.close() clears it
+
+
+class GridConnector:
+    """
+    Creates remote WebDriver sessions on REMOTE_GRID_URL.
+
+    Every session shares one urllib3 pool of GRID_POOL_SIZE keep-alive
+    connections, so commands skip the TCP/TLS handshake. GRID_PREWARM_SESSIONS
+    spare sessions are created concurrently in the background and handed out
+    to the next acquire() with the same capabilities. At most GRID_MAX_SESSIONS
+    sessions are open at once; further requests, and requests the grid rejects
+    for capacity, queue for up to GRID_QUEUE_TIMEOUT seconds.
+    """
+
+    _shared: Optional["GridConnector"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self,
+                 url: Optional[str] = None,
+                 pool_size: Optional[int] = None,
+                 max_sessions: Optional[int] = None,
+                 prewarm: Optional[int] = None,
+                 queue_timeout: Optional[float] = None):
+        self.url = url or settings.REMOTE_GRID_URL
+        self.pool_size = pool_size if pool_size is not None else settings.GRID_POOL_SIZE
+        self.max_sessions = max_sessions if max_sessions is not None else settings.GRID_MAX_SESSIONS
+        self.prewarm_count = prewarm if prewarm is not None else settings.GRID_PREWARM_SESSIONS
+        self.queue_timeout = queue_timeout if queue_timeout is not None else settings.GRID_QUEUE_TIMEOUT
+        self.client_config = ClientConfig(remote_server_addr=self.url, keep_alive=True)
+        self.http = urllib3.PoolManager(num_pools=4, maxsize=self.pool_size, timeout=self.client_config.timeout)
+        self._slots = threading.BoundedSemaphore(self.max_sessions) if self.max_sessions else None
+        self._executor = ThreadPoolExecutor(max_workers=max(self.prewarm_count, 1), thread_name_prefix="qa-grid")
+        # Prewarmed sessions per capabilities key: (driver, created at)
+        self._ready: Dict[str, List[Tuple[Any, float]]] = {}
+        self._warming: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._latencies: List[float] = []
+        self._queued = 0.0
+        self._prewarmed_hits = 0
+        self._capacity_retries = 0
+
+    @classmethod
+    def shared(cls) -> "GridConnector":
+        """Returns the process-wide connector, closed automatically at interpreter exit."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+                atexit.register(cls._shared.close)
+            return cls._shared
+
+    @staticmethod
+    def _key(options) -> str:
+        return json.dumps(options.to_capabilities(), sort_keys=True, default=str)
+
+    def connection(self) -> PooledRemoteConnection:
+        return PooledRemoteConnection(self.client_config, self.http)
+
+    def _take_slot(self, deadline: float) -> None:
+        if self._slots and not self._slots.acquire(timeout=max(deadline - time.monotonic(), 0)):
+            raise DriverInitializationError(
+                f"No grid session slot within {self.queue_timeout}s (GRID_MAX_SESSIONS={self.max_sessions})"
+            )
+
+    def _create(self, options, deadline: float):
+        """Opens a session, retrying with backoff while the grid reports it is at capacity."""
+        delay = 1.0
+        while True:
+            try:
+                return webdriver.Remote(command_executor=self.connection(), options=options)
+            except SessionNotCreatedException as e:
+                if not CAPACITY_ERROR.search(str(e)) or time.monotonic() + delay > deadline:
+                    raise
+                with self._lock:
+                    self._capacity_retries += 1
+                logger.info("Grid at capacity, queueing session request", retry_in=delay)
+                time.sleep(delay)
+                delay = min(delay * 2, 15.0)
+
+    def _prewarm_one(self, key: str, options) -> None:
+        try:
+            self._take_slot(time.monotonic() + self.queue_timeout)
+            try:
+                driver = self._create(options, time.monotonic() + self.queue_timeout)
+            except BaseException:
+                self._release_slot()
+                raise
+            with self._lock:
+                self._ready.setdefault(key, []).append((driver, time.monotonic()))
+        except Exception as e:
+            logger.warning("Failed to prewarm grid session", error=str(e))
+        finally:
+            with self._lock:
+                self._warming[key] -= 1
+
+    def prewarm(self, options, count: Optional[int] = None) -> None:
+        """Starts creating spare sessions concurrently, topping the ready stock up to count."""
+        key = self._key(options)
+        count = self.prewarm_count if count is None else count
+        with self._lock:
+            missing = count - len(self._ready.get(key, [])) - self._warming.get(key, 0)
+            self._warming[key] = self._warming.get(key, 0) + max(missing, 0)
+        for _ in range(max(missing, 0)):
+            self._executor.submit(self._prewarm_one, key, options)
+
+    def _pop_ready(self, key: str):
+        while True:
+            with self._lock:
+                ready = self._ready.get(key)
+                if not ready:
+                    return None
+                driver, created = ready.pop(0)
+            if time.monotonic() - created < IDLE_CHECK_SECONDS:
+                return driver
+            try:
+                driver.current_url  # reaped sessions fail here rather than in the test
+                return driver
+            except WebDriverException:
+                logger.warning("Discarding expired prewarmed grid session")
+                self._release_slot()
+
+    def acquire(self, options):
+        """Returns a session for the options: a prewarmed one if available, otherwise a new one."""
+        started = time.monotonic()
+        deadline = started + self.queue_timeout
+        key = self._key(options)
+        driver = self._pop_ready(key)
+        if self.prewarm_count:
+            # Spares are created alongside this request, not after it
+            self.prewarm(options)
+        # While every slot is taken, a spare finishing its warm-up is as good as a free slot
+        while driver is None and self._slots and not self._slots.acquire(timeout=0.1):
+            driver = self._pop_ready(key)
+            if driver is None and time.monotonic() >= deadline:
+                raise DriverInitializationError(
+                    f"No grid session slot within {self.queue_timeout}s (GRID_MAX_SESSIONS={self.max_sessions})"
+                )
+        queued = time.monotonic() - started
+        prewarmed = driver is not None
+        if driver is None:
+            try:
+                driver = self._create(options, deadline)
+            except BaseException:
+                self._release_slot()
+                raise
+        self._record(time.monotonic() - started, queued, prewarmed)
+        return driver
+
+    def release(self, driver) -> None:
+        """Ends the session and frees its slot."""
+        try:
+            driver.quit()
+        finally:
+            self._release_slot()
+
+    def _release_slot(self) -> None:
+        if self._slots:
+            self._slots.release()
+
+    def _record(self, seconds: float, queued: float, prewarmed: bool) -> None:
+        with self._lock:
+            self._latencies.append(seconds)
+            self._queued += queued
+            self._prewarmed_hits += prewarmed
+        logger.info("Grid session acquired", seconds=round(seconds, 3), queued=round(queued, 3), prewarmed=prewarmed)
+        if settings.INSTRUMENTATION_ENABLED:
+            from qa_framework.core.instrumentation import metrics
+            metrics.observe("grid", "acquire_session", seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        """Session-acquisition latency summary."""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            return {
+                "acquired": len(latencies), "prewarmed_hits": self._prewarmed_hits,
+                "p50_s": _percentile(latencies, 0.5), "p95_s": _percentile(latencies, 0.95),
+                "max_s": round(latencies[-1], 3) if latencies else 0.0,
+                "queued_s": round(self._queued, 3), "capacity_retries": self._capacity_retries,
+                "ready": sum(len(r) for r in self._ready.values()),
+            }
+
+    def close(self) -> None:
+        """Ends prewarmed sessions nobody used and closes the pooled connections."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        with self._lock:
+            ready, self._ready = self._ready, {}
+        for driver, _ in (entry for entries in ready.values() for entry in entries):
+            try:
+                self.release(driver)
+            except Exception as e:
+                logger.warning("Failed to quit prewarmed grid session", error=str(e))
+        self.http.clear()
@@ -0,0 +1,118 @@
+"""
+Framework selectors parsed once.
+
+A Locator is the selector string itself (so it still works as a healing,
+cache and registry key) plus its parsed strategy and the native form each
+backend needs. BasePage subclasses get their UPPER_CASE selector constants
+converted when the class is defined; drivers convert any other string on
+first use, and parses are interned.
+
+    id=login-button        -> id
+    name=username          -> name
+    css=.title / .title    -> CSS
+    xpath=//a / //a / (//a)[1]
+    accessibility_id=Login -> accessibility id (Appium); bare selectors
+                              also map to accessibility id on mobile
+"""
+import json
+import weakref
+from typing import Any, Callable, Dict, Tuple
+
+SELECTOR_PREFIXES = ("id=", "css=", "name=", "xpath=", "accessibility_id=", "//", "(/", "#", ".", "[")
+
+# Interned parses of selectors passed as plain strings
+_MAX_INTERNED = 4096
+_interned: Dict[str, "Locator"] = {}
+
+
+def looks_like_selector(value: str) -> bool:
+    return value.startswith(SELECTOR_PREFIXES) and "://" not in value
+
+
+def _parse(selector: str) -> Tuple[str, str, bool]:
+    """(strategy, value, prefixed) for a framework selector."""
+    for prefix, strategy in (("id=", "id"), ("name=", "name"), ("css=", "css"), ("xpath=", "xpath"),
+                             ("accessibility_id=", "accessibility_id")):
+        if selector.startswith(prefix):
+            return strategy, selector[len(prefix):], True
+    if selector.startswith(("//", "(")):
+        return "xpath", selector, False
+    return "css", selector, False
+
+
+class Locator(str):
+    """A selector string with its parse and per-backend native forms."""
+
+    def __new__(cls, selector: str) -> "Locator":
+        if isinstance(selector, Locator):
+            return selector
+        cached = _interned.get(selector)
+        if cached is not None:
+            return cached
+        locator = super().__new__(cls, selector)
+        locator.strategy, locator.value, locator.prefixed = _parse(selector)
+        locator._natives = weakref.WeakKeyDictionary()
+        if len(_interned) >= _MAX_INTERNED:
+            _interned.clear()
+        _interned[selector] = locator
+        return locator
+
+    def __reduce__(self):
+        # Pickled (e.g. to validator worker processes) as the plain selector
+        return Locator, (str(self),)
+
+    @property
+    def selenium(self) -> Tuple[str, str]:
+        """(By strategy, value) for WebDriver find_element."""
+        if self.strategy == "accessibility_id":
+            raise ValueError(f"'{self}' is a mobile-only locator")
+        return {"id": "id", "name": "name", "css": "css selector", "xpath": "xpath"}[self.strategy], self.value
+
+    @property
+    def playwright(self) -> str:
+        """Selector string for page.locator()."""
+        if self.strategy == "id":
+            return f"id={self.value}"
+        if self.strategy == "name":
+            return f"[name={json.dumps(self.value)}]"
+        if self.strategy == "xpath":
+            return f"xpath={self.value}"
+        if self.strategy == "accessibility_id":
+            raise ValueError(f"'{self}' is a mobile-only locator")
+        return self.value
+
+    @property
+    def mobile(self) -> Tuple[str, str]:
+        """(Appium strategy, value). Selectors without a prefix are accessibility ids, except XPath."""
+        if self.strategy == "xpath":
+            return "xpath", self.value
+        if self.strategy == "accessibility_id" or not self.prefixed:
+            return "accessibility id", self.value
+        return {"id": "id", "name": "name", "css": "css selector"}[self.strategy], self.value
+
+    @property
+    def script(self) -> Tuple[str, str]:
+        """(strategy, value) for the in-page batch and wait scripts."""
+        if self.strategy == "accessibility_id":
+            raise ValueError(f"'{self}' is a mobile-only locator")
+        return self.strategy, self.value
+
+    def native(self, owner: Any, build: Callable[[], Any]) -> Any:
+        """
+        Native object for this locator on an owner (e.g. a Playwright Locator
+        per Page), built once and dropped with the owner.
+        """
+        try:
+            return self._natives[owner]
+        except KeyError:
+            native = self._natives[owner] = build()
+            return native
+        except TypeError:  # owner cannot be weakly referenced
+            return build()
+
+
+def compile_class_locators(cls: type) -> None:
+    """Replaces the UPPER_CASE selector constants declared on a class with Locators."""
+    for name, value in list(vars(cls).items()):
+        if name.isupper() and isinstance(value, str) and not isinstance(value, Locator) and looks_like_selector(value):
+            setattr(cls, name, Locator(value))
@@ -4,6 +4,7 @@ from appium.options.common import AppiumOptions
 from appium.options.android import UiAutomator2Options
 from appium.options.ios import XCUITestOptions
 from qa_framework.core.drivers.abstract_driver import AbstractDriver
+from qa_framework.core.drivers.locator import Locator
 from qa_framework.core.config import settings
 from qa_framework.core.logger import get_logger
 from qa_framework.core.exceptions import DriverInitializationError, ElementInteractionError
@@ -15,9 +16,11 @@ class MobileDriver(AbstractDriver):
     Appium-based driver for Mobile Automation (Android/iOS).
     """
 
-    def __init__(self):
+    def __init__(self, udid: Optional[str] = None, capabilities: Optional[Dict[str, Any]] = None):
         self.driver = None
         self.platform = settings.MOBILE_PLATFORM_NAME.lower() if settings.MOBILE_PLATFORM_NAME else None
+        self.udid = udid or settings.MOBILE_UDID
+        self.capabilities = capabilities or {}
 
     def start(self):
         logger.info(f"Initializing Mobile Driver for platform: {self.platform}")
@@ -46,16 +49,68 @@ class MobileDriver(AbstractDriver):
             options.device_name = settings.MOBILE_DEVICE_NAME
         if settings.MOBILE_APP_PATH:
             options.app = settings.MOBILE_APP_PATH
-        if settings.MOBILE_UDID:
-            options.udid = settings.MOBILE_UDID
+        if self.udid:
+            options.udid = self.udid
         
         # Merge any extra caps if needed (could be extended via config)
+        for name, value in self.capabilities.items():
+            options.set_capability(name, value)
         return options
 
     def quit(self):
         if self.driver:
             logger.info("Quitting Mobile Driver")
-            self.driver.quit()
+            try:
+                self.driver.quit()
+            finally:
+                self.driver = None
+
+    @property
+    def app_id(self) -> Optional[str]:
+        """Package (Android) or bundle id (iOS) of the app under test."""
+        if settings.MOBILE_APP_ID:
+            return settings.MOBILE_APP_ID
+        caps = self.driver.capabilities or {}
+        return caps.get("appPackage") or caps.get("bundleId")
+
+    def reset(self) -> None:
+        """
+        Fast app reset between tests: terminate, clear app data and relaunch
+        within the running session. Falls back to a new session (which may
+        reinstall the app) when the app id is unknown or the platform cannot
+        clear data.
+        """
+        app_id = self.app_id
+        if not app_id:
+            logger.warning("No MOBILE_APP_ID or app capability; resetting with a new session")
+            return super().reset()
+        try:
+            self.driver.terminate_app(app_id)
+            if settings.MOBILE_CLEAR_APP_DATA:
+                self.driver.execute_script("mobile: clearApp", self._clear_app_args(app_id))
+            self.driver.activate_app(app_id)
+        except Exception as e:
+            logger.warning(f"Fast reset of {app_id} failed ({e}); starting a new session")
+            try:
+                self.quit()
+            except Exception as quit_error:
+                logger.warning(f"Closing the old session failed ({quit_error}); replacing it anyway")
+            self.start()
+
+    def _clear_app_args(self, app_id: str) -> Dict[str, str]:
+        """UiAutomator2 takes the package as appId, XCUITest the bundle as bundleId."""
+        caps = self.driver.capabilities or {}
+        platform = (caps.get("platformName") or self.platform or "").lower()
+        return {"bundleId": app_id} if platform == "ios" else {"appId": app_id}
+
+    def is_healthy(self) -> bool:
+        if self.driver is None:
+            return False
+        try:
+            self.driver.get_window_size()
+            return True
+        except Exception:
+            return False
 
     def goto(self, url: str):
         # For mobile apps, goto might be deep links or irrelevant
@@ -64,12 +119,8 @@ class MobileDriver(AbstractDriver):
 
     def find_element(self, selector: str) -> Any:
         try:
-            # Defaulting to Accessibility ID or XPath depending on selector content
-            if selector.startswith("//") or selector.startswith("("):
-                return self.driver.find_element("xpath", selector)
-            else:
-                # Assume Accessibility ID by default for robust mobile automation
-                return self.driver.find_element("accessibility id", selector)
+            # Unprefixed selectors are Accessibility IDs (XPath excepted), for robust mobile automation
+            return self.driver.find_element(*Locator(selector).mobile)
         except Exception as e:
             raise ElementInteractionError(f"Could not find element: {selector}", e)
 
@@ -83,9 +134,18 @@ class MobileDriver(AbstractDriver):
         logger.info(f"Typing '{text}' into {selector}")
         element.send_keys(text)
 
+    def get_text(self, selector: str) -> str:
+        return self.find_element(selector).text
+
+    def get_driver(self):
+        return self.driver
+
     def get_title(self) -> str:
         return self.driver.title # Often context dependent in native apps
 
     def screenshot(self, path: str):
         logger.info(f"Saving screenshot to {path}")
         self.driver.save_screenshot(path)
+
+    def screenshot_bytes(self) -> bytes:
+        return self.driver.get_screenshot_as_png()
@@ -0,0 +1,132 @@
+import fnmatch
+import json
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, List, Optional
+from qa_framework.core.config import settings
+from qa_framework.core.logger import get_logger
+
+logger = get_logger("network_blocking")
+
+ANALYTICS_PATTERNS = (
+    "*google-analytics.com/*", "*googletagmanager.com/*", "*doubleclick.net/*", "*facebook.net/*",
+    "*connect.facebook.com/*", "*hotjar.com/*", "*segment.io/*", "*segment.com/*", "*mixpanel.com/*",
+    "*nr-data.net/*", "*newrelic.com/*", "*clarity.ms/*", "*optimizely.com/*", "*sentry.io/*",
+)
+
+# URL patterns standing in for resource types where only URLs can be matched (Chrome CDP)
+RESOURCE_TYPE_PATTERNS = {
+    "image": ("*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.svg*", "*.ico*", "*.avif*"),
+    "font": ("*.woff*", "*.woff2*", "*.ttf*", "*.otf*", "*.eot*"),
+    "media": ("*.mp4*", "*.webm*", "*.mp3*", "*.ogg*", "*.wav*", "*.m3u8*"),
+}
+
+# Blocked responses are never downloaded, so savings are estimated from typical sizes
+ESTIMATED_BYTES = {
+    "image": 40_000, "font": 35_000, "media": 500_000, "script": 60_000,
+    "stylesheet": 25_000, "xhr": 5_000, "fetch": 5_000, "other": 10_000,
+}
+
+
+@dataclass(frozen=True)
+class BlockingProfile:
+    """Resource types and URL patterns (fnmatch wildcards) that are not loaded."""
+    name: str
+    resource_types: FrozenSet[str] = frozenset()
+    url_patterns: tuple = ()
+
+    def url_blocklist(self) -> List[str]:
+        """The profile as plain URL patterns, for backends that cannot see resource types."""
+        patterns = list(self.url_patterns)
+        for resource_type in sorted(self.resource_types):
+            patterns.extend(RESOURCE_TYPE_PATTERNS.get(resource_type, ()))
+        return patterns
+
+
+PROFILES: Dict[str, BlockingProfile] = {
+    "none": BlockingProfile("none"),
+    "no-media": BlockingProfile("no-media", frozenset({"image", "media", "font"})),
+    "no-analytics": BlockingProfile("no-analytics", url_patterns=ANALYTICS_PATTERNS),
+    "minimal": BlockingProfile("minimal", frozenset({"image", "media", "font"}), ANALYTICS_PATTERNS),
+}
+
+
+def resolve_profile(name: Optional[str] = None, patterns: Optional[str] = None) -> BlockingProfile:
+    """
+    Builds the active profile from NETWORK_BLOCK_PROFILE plus the comma-separated
+    NETWORK_BLOCK_PATTERNS.
+    """
+    name = name or settings.NETWORK_BLOCK_PROFILE
+    if name not in PROFILES:
+        raise ValueError(f"Unknown network block profile '{name}'. Choose from: {', '.join(PROFILES)}")
+    profile = PROFILES[name]
+    extra = [p.strip() for p in (patterns if patterns is not None else settings.NETWORK_BLOCK_PATTERNS).split(",") if p.strip()]
+    if extra:
+        profile = BlockingProfile(f"{name}+custom", profile.resource_types, profile.url_patterns + tuple(extra))
+    return profile
+
+
+@dataclass
+class NetworkBlocker:
+    """Decides which requests to block and counts what was saved."""
+    profile: BlockingProfile
+    blocked: Dict[str, int] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def active(self) -> bool:
+        return bool(self.profile.resource_types or self.profile.url_patterns)
+
+    def should_block(self, url: str, resource_type: str) -> bool:
+        return resource_type in self.profile.resource_types or any(
+            fnmatch.fnmatchcase(url, pattern) for pattern in self.profile.url_patterns
+        )
+
+    def record(self, resource_type: str) -> None:
+        with self._lock:
+            self.blocked[resource_type] = self.blocked.get(resource_type, 0) + 1
+
+    def report(self, reset: bool = True) -> Dict[str, Any]:
+        """Blocked requests and estimated bytes saved since the last report."""
+        with self._lock:
+            by_type = dict(self.blocked)
+            if reset:
+                self.blocked.clear()
+        return {
+            "profile": self.profile.name,
+            "blocked_requests": sum(by_type.values()),
+            "estimated_bytes_saved": sum(ESTIMATED_BYTES.get(t, ESTIMATED_BYTES["other"]) * n for t, n in by_type.items()),
+            "by_type": by_type,
+        }
+
+
+def playwright_route_handler(blocker: NetworkBlocker):
+    """Route handler for context.route('**/*', ...)."""
+    def handle(route):
+        request = route.request
+        if blocker.should_block(request.url, request.resource_type):
+            blocker.record(request.resource_type)
+            route.abort("blockedbyclient")
+        else:
+            route.fallback()
+    return handle
+
+
+# CDP resource types are capitalised ("Image"); Playwright's are lower case
+def _cdp_type(resource_type: Optional[str]) -> str:
+    return (resource_type or "other").lower()
+
+
+def record_cdp_blocked(blocker: NetworkBlocker, performance_log: List[Dict[str, Any]]) -> None:
+    """
+    Counts requests Chrome refused via Network.setBlockedURLs, from the
+    'performance' log entries (Network.loadingFailed with a blockedReason).
+    """
+    for entry in performance_log:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, ValueError, TypeError):
+            continue
+        params = message.get("params", {})
+        if message.get("method") == "Network.loadingFailed" and params.get("blockedReason"):
+            blocker.record(_cdp_type(params.get("type")))
@@ -1,8 +1,12 @@
-from playwright.sync_api import sync_playwright, Page, Browser
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from playwright.sync_api import sync_playwright, Page, Browser, BrowserContext, TimeoutError as PlaywrightTimeoutError
 from qa_framework.core.drivers.abstract_driver import AbstractDriver
+from qa_framework.core.drivers.archive import archive_path, effective_mode
+from qa_framework.core.drivers.locator import Locator
+from qa_framework.core.drivers.network import NetworkBlocker, playwright_route_handler, resolve_profile
 from qa_framework.core.config import settings
 from qa_framework.core.logger import get_logger
-from qa_framework.core.exceptions import DriverInitializationError
+from qa_framework.core.exceptions import DriverInitializationError, WaitTimeoutError
 
 logger = get_logger("playwright_driver")
 
@@ -13,12 +17,17 @@ class PlaywrightDriver(AbstractDriver):
     def __init__(self):
         self._playwright = None
         self._browser: Browser = None
+        self._context: BrowserContext = None
         self._page: Page = None
+        self._blocker = None
+        # Set by use_archive(); contexts opened before that are not archived
+        self._archive_name: Optional[str] = None
 
     def start(self) -> None:
         try:
             logger.info("Initializing Playwright Driver", browser=settings.BROWSER, headless=settings.HEADLESS)
             self._playwright = sync_playwright().start()
+            self._blocker = NetworkBlocker(resolve_profile())
             
             browser_type = settings.BROWSER.lower()
             launch_args = {"headless": settings.HEADLESS}
@@ -33,23 +42,91 @@ class PlaywrightDriver(AbstractDriver):
                 # Default to chromium if unknown, or raise error
                  self._browser = self._playwright.chromium.launch(**launch_args)
             
-            self._page = self._browser.new_page()
+            self._new_context()
 
         except Exception as e:
             logger.error("Failed to initialize Playwright Driver", error=str(e))
             raise DriverInitializationError("Playwright init failed", original_exception=e)
 
+    def _new_context(self, storage_state: Optional[Dict[str, Any]] = None) -> None:
+        """Opens an isolated context (cookies, storage, cache) with a single page."""
+        self._context = self._browser.new_context(storage_state=storage_state)
+        if self._blocker is not None and self._blocker.active:
+            self._context.route("**/*", playwright_route_handler(self._blocker))
+        self._route_archive()
+        self._page = self._context.new_page()
+
+    def _route_archive(self) -> None:
+        """Serves (or records) the context's traffic from the test's HAR archive."""
+        if settings.NETWORK_ARCHIVE_MODE == "off" or self._archive_name is None:
+            return
+        path = archive_path(self._archive_name)
+        mode = effective_mode(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._context.route_from_har(
+            str(path),
+            update=mode == "record",
+            update_content="embed",
+            not_found="fallback" if settings.NETWORK_ARCHIVE_FALLTHROUGH else "abort",
+        )
+        logger.info(f"Network archive {path} in {mode} mode")
+
+    def use_archive(self, name: str) -> None:
+        """Re-opens the context on the named archive; a recorded HAR is written when its context closes."""
+        self._archive_name = name
+        if settings.NETWORK_ARCHIVE_MODE != "off" and self._browser:
+            self.reset()
+
+    def reset(self) -> None:
+        """Swaps in a fresh BrowserContext; the browser process stays warm."""
+        if self._context:
+            self._context.close()
+        self._new_context()
+
+    def is_healthy(self) -> bool:
+        return self._browser is not None and self._browser.is_connected()
+
+    def network_report(self) -> Dict[str, Any]:
+        return self._blocker.report() if self._blocker is not None and self._blocker.active else {}
+
+    def save_session(self) -> Dict[str, Any]:
+        return {**self._context.storage_state(), "url": self._page.url}
+
+    def load_session(self, state: Dict[str, Any]) -> None:
+        """Starts a new context from the storage_state, so no login round trips are needed."""
+        if self._context:
+            self._context.close()
+        self._new_context({"cookies": state.get("cookies", []), "origins": state.get("origins", [])})
+        if state.get("url"):
+            self._page.goto(state["url"])
+
     def quit(self) -> None:
         if self._browser:
             logger.info("Quitting Playwright Driver")
+            # A recorded HAR archive is only written when its context closes
+            if self._context:
+                self._context.close()
             self._browser.close()
             self._playwright.stop()
             self._page = None
+            self._context = None
             self._browser = None
             self._playwright = None
 
     def goto(self, url: str) -> None:
         self._page.goto(url)
+        if settings.PAGE_TIMING_ENABLED:
+            self._record_page_timing()
+
+    def _record_page_timing(self) -> None:
+        """Stores the page's load metrics; never fails the navigation."""
+        from qa_framework.core.performance.page_timing import TIMING_FUNCTION, record
+
+        try:
+            timing = self._page.evaluate(f"() => new Promise((resolve) => ({TIMING_FUNCTION})(resolve))")
+            record(timing, driver=type(self).__name__)
+        except Exception as e:
+            logger.warning("Failed to capture page timing", error=str(e))
 
     def get_title(self) -> str:
         return self._page.title()
@@ -65,37 +142,104 @@ class PlaywrightDriver(AbstractDriver):
         self._page.screenshot(path=path)
         return path
 
-    def _parse_selector(self, selector: str) -> str:
+    def screenshot_bytes(self) -> bytes:
+        return self._page.screenshot()
+
+    def find_element(self, selector: str):
         """
-        Converts framework-specific selectors (id=, css=) to Playwright selectors.
+        Returns a Locator, built once per page for each selector.
         """
-        if selector.startswith("id="):
-            return f"id={selector[3:]}" # Playwright actually supports id= engine or we can use #
-            # Better: use CSS ID selector for robustness
-            return f"#{selector[3:]}"
-        elif selector.startswith("css="):
-            return selector[4:]
-        elif selector.startswith("name="):
-            return f"[name='{selector[5:]}']"
-        # XPath usually detected automatically if starts with //
-        return selector
+        locator = Locator(selector)
+        page = self._page
+        return locator.native(page, lambda: page.locator(locator.playwright))
 
-    def find_element(self, selector: str):
+    def _heal(self, selector: str) -> Optional[str]:
         """
-        Returns a Locator.
+        Resolves a broken selector through the shared healing flow.
+        Returns the healed CSS selector, or None if healing failed.
         """
-        parsed_selector = self._parse_selector(selector)
-        return self._page.locator(parsed_selector)
+        from qa_framework.core.healing.browser import playwright_runner
+        from qa_framework.core.healing.resolver import HealingResolver
+
+        resolver = HealingResolver(
+            get_url=lambda: self._page.url,
+            get_page_source=self._page.content,
+            probe=lambda css_selector: css_selector if self._page.locator(css_selector).count() else None,
+            run_script=playwright_runner(self._page),
+        )
+        return resolver.resolve(selector)
+
+    def _is_known_broken(self, selector: str) -> bool:
+        from qa_framework.core.healing.cache import BrokenSelectorRegistry
+
+        registry = BrokenSelectorRegistry.shared()
+        return registry.is_known(selector) and registry.is_broken(self._page.url, selector)
+
+    def _with_healing(self, selector: str, action: Callable[[str, Optional[float]], Any]) -> Any:
+        """
+        Runs an action against the selector, healing and retrying once
+        if Playwright times out waiting for the element.
+        Selectors already known to be broken on this page only get
+        BROKEN_SELECTOR_WAIT before healing instead of the default timeout.
+        """
+        known_broken = settings.ENABLE_SELF_HEALING and self._is_known_broken(selector)
+        # Playwright treats timeout=0 as "no timeout", so probe with at least 1ms
+        timeout = max(settings.BROKEN_SELECTOR_WAIT * 1000, 1) if known_broken else None
+        try:
+            return action(Locator(selector).playwright, timeout)
+        except PlaywrightTimeoutError:
+            if not settings.ENABLE_SELF_HEALING:
+                raise
+            healed_selector = self._heal(selector)
+            if healed_selector is None:
+                raise
+            return action(healed_selector, None)
+
+    def wait_for(self, condition, timeout: Optional[float] = None):
+        """Waits with Playwright's native auto-waiting; returns the Locator for element conditions."""
+        import re
+        from playwright.sync_api import expect
+        from qa_framework.core.waits.conditions import WAIT_FUNCTION
+
+        timeout_ms = (settings.EXPLICIT_WAIT if timeout is None else timeout) * 1000
+        try:
+            if condition.kind == "network_idle":
+                self._page.wait_for_load_state("networkidle", timeout=timeout_ms)
+                return None
+            if condition.kind == "count_stable":
+                result = self._page.evaluate(
+                    f"([cond, ms]) => new Promise((done) => ({WAIT_FUNCTION})(cond, ms, done))",
+                    [condition.payload(), timeout_ms],
+                )
+                if not result.get("ok"):
+                    raise WaitTimeoutError(f"Timed out after {timeout_ms / 1000}s waiting for {condition}")
+                return result["value"]
+
+            locator = self._page.locator(Locator(condition.selector).playwright)
+            if condition.kind == "text_equals":
+                pattern = re.compile(rf"^\s*{re.escape(condition.expected)}\s*$")
+                locator = locator.filter(has_text=pattern)
+            locator = locator.first
+            locator.wait_for(state="visible", timeout=timeout_ms)
+            if condition.kind == "clickable":
+                expect(locator).to_be_enabled(timeout=timeout_ms)
+            return locator
+        except (PlaywrightTimeoutError, AssertionError) as e:
+            raise WaitTimeoutError(f"Timed out after {timeout_ms / 1000}s waiting for {condition}", original_exception=e)
+
+    def batch(self, ops: Sequence[tuple]) -> List[Any]:
+        """All operations run in a single page.evaluate round trip."""
+        from qa_framework.core.drivers.batch import BATCH_FUNCTION, collect_results, compile_ops
+
+        if not ops:
+            return []
+        return collect_results(self, ops, self._page.evaluate(BATCH_FUNCTION, compile_ops(ops)))
 
     def click(self, selector: str):
-        parsed_selector = self._parse_selector(selector)
-        self._page.click(parsed_selector)
+        self._with_healing(selector, lambda s, timeout: self._page.click(s, timeout=timeout))
 
     def type(self, selector: str, text: str):
-        parsed_selector = self._parse_selector(selector)
-        self._page.fill(parsed_selector, text)
+        self._with_healing(selector, lambda s, timeout: self._page.fill(s, text, timeout=timeout))
 
     def get_text(self, selector: str) -> str:
-        parsed_selector = self._parse_selector(selector)
-        return self._page.locator(parsed_selector).inner_text()
-
+        return self._with_healing(selector, lambda s, timeout: self._page.locator(s).inner_text(timeout=timeout))
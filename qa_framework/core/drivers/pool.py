@@ -0,0 +1,100 @@
+import atexit
+import threading
+from typing import Callable, Dict, List, Optional
+from qa_framework.core.drivers.abstract_driver import AbstractDriver
+from qa_framework.core.config import settings
+from qa_framework.core.logger import get_logger
+
+logger = get_logger("driver_pool")
+
+
+class DriverPool:
+    """
+    Keeps warm browser sessions for reuse across tests.
+    Drivers are reset (fresh Playwright context, or cleared cookies/storage/
+    windows for Selenium) when released, health-checked when acquired and
+    recycled after max_uses tests. Pools are per process, so every
+    pytest-xdist worker keeps its own browsers.
+    """
+
+    _shared: Optional["DriverPool"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self,
+                 create: Callable[[], AbstractDriver],
+                 size: Optional[int] = None,
+                 max_uses: Optional[int] = None):
+        self.create = create
+        self.size = size if size is not None else settings.DRIVER_POOL_SIZE
+        self.max_uses = max_uses if max_uses is not None else settings.DRIVER_POOL_MAX_USES
+        self._idle: List[AbstractDriver] = []
+        self._uses: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> "DriverPool":
+        """Returns the process-wide pool, closed automatically at interpreter exit."""
+        from qa_framework.core.drivers.factory import DriverFactory
+
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls(DriverFactory.get_driver)
+                atexit.register(cls._shared.close)
+            return cls._shared
+
+    def acquire(self) -> AbstractDriver:
+        """Returns a healthy idle driver, or starts a new one."""
+        while True:
+            with self._lock:
+                driver = self._idle.pop() if self._idle else None
+            if driver is None:
+                break
+            if driver.is_healthy():
+                return driver
+            logger.warning("Discarding unhealthy pooled driver")
+            self._discard(driver)
+
+        driver = self.create()
+        with self._lock:
+            self._uses[id(driver)] = 0
+        return driver
+
+    def release(self, driver: AbstractDriver) -> None:
+        """Resets the driver and returns it to the pool, or quits it if it is worn out or the pool is full."""
+        with self._lock:
+            uses = self._uses.get(id(driver), 0) + 1
+            self._uses[id(driver)] = uses
+            full = len(self._idle) >= self.size
+
+        if full or (self.max_uses and uses >= self.max_uses):
+            logger.info("Recycling pooled driver", uses=uses)
+            self._discard(driver)
+            return
+
+        try:
+            driver.reset()
+        except Exception as e:
+            logger.warning("Failed to reset pooled driver", error=str(e))
+            self._discard(driver)
+            return
+
+        with self._lock:
+            self._idle.append(driver)
+
+    def _discard(self, driver: AbstractDriver) -> None:
+        with self._lock:
+            self._uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning("Failed to quit pooled driver", error=str(e))
+
+    def close(self) -> None:
+        """Quits every idle driver."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            self._discard(driver)
+
+    def __len__(self) -> int:
+        return len(self._idle)
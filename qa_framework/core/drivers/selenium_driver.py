@@ -1,10 +1,16 @@
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from urllib.parse import urlsplit
 from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.chrome.options import Options as ChromeOptions
 from selenium.webdriver.firefox.options import Options as FirefoxOptions
 from qa_framework.core.drivers.abstract_driver import AbstractDriver
+from qa_framework.core.drivers.locator import Locator
+from qa_framework.core.drivers.network import NetworkBlocker, record_cdp_blocked, resolve_profile
 from qa_framework.core.config import settings
 from qa_framework.core.logger import get_logger
-from qa_framework.core.exceptions import DriverInitializationError
+from qa_framework.core.exceptions import DriverInitializationError, WaitTimeoutError
 
 logger = get_logger("selenium_driver")
 
@@ -14,6 +20,16 @@ class SeleniumDriver(AbstractDriver):
     """
     def __init__(self):
         self.driver = None
+        self._implicit_wait = None
+        self._wait_budget_used = 0.0
+        # Element handle cache, valid for one page generation (see _invalidate_elements)
+        self._generation = 0
+        self._elements: Dict[str, Any] = {}
+        self._elements_url: Optional[str] = None
+        self._url_check_pending = False
+        self._blocker = None
+        self._archive_proxy = None
+        self._grid = None
 
     def start(self) -> None:
         try:
@@ -21,14 +37,21 @@ class SeleniumDriver(AbstractDriver):
             headless = settings.HEADLESS
             
             logger.info("Initializing Selenium Driver", browser=browser, headless=headless)
+            blocker = NetworkBlocker(resolve_profile())
+            proxy = self._start_archive_proxy()
 
             if browser == "chrome":
                 options = ChromeOptions()
                 if headless:
                     options.add_argument("--headless")
+                if blocker.active:
+                    # Blocked requests show up as Network.loadingFailed in the performance log
+                    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+                if proxy:
+                    options.proxy = proxy
                 
                 if settings.REMOTE_GRID_URL:
-                    self.driver = webdriver.Remote(command_executor=settings.REMOTE_GRID_URL, options=options)
+                    self.driver = self._start_remote(options)
                 else:
                     self.driver = webdriver.Chrome(options=options)
 
@@ -36,16 +59,20 @@ class SeleniumDriver(AbstractDriver):
                 options = FirefoxOptions()
                 if headless:
                     options.add_argument("--headless")
+                if proxy:
+                    options.proxy = proxy
                 
                 if settings.REMOTE_GRID_URL:
-                    self.driver = webdriver.Remote(command_executor=settings.REMOTE_GRID_URL, options=options)
+                    self.driver = self._start_remote(options)
                 else:
                     self.driver = webdriver.Firefox(options=options)
             else:
                 raise DriverInitializationError(f"Unsupported browser: {browser}")
                 
-            self.driver.implicitly_wait(settings.IMPLICIT_WAIT)
+            self._set_implicit_wait(settings.IMPLICIT_WAIT)
             self.driver.maximize_window()
+            if blocker.active:
+                self._enable_blocking(blocker)
             
         except Exception as e:
             logger.error("Failed to initialize Selenium Driver", error=str(e))
@@ -54,65 +81,361 @@ class SeleniumDriver(AbstractDriver):
     def quit(self) -> None:
         if self.driver:
             logger.info("Quitting Selenium Driver")
-            self.driver.quit()
+            if self._grid is not None:
+                self._grid.release(self.driver)
+            else:
+                self.driver.quit()
             self.driver = None
+        if self._archive_proxy is not None:
+            self._archive_proxy.stop()
+            self._archive_proxy = None
+
+    def _start_remote(self, options):
+        """Gets a session from the shared grid connector (pooled connections, prewarmed sessions)."""
+        from qa_framework.core.drivers.grid import GridConnector
+
+        self._grid = GridConnector.shared()
+        return self._grid.acquire(options)
+
+    def _start_archive_proxy(self):
+        """Starts the record/replay proxy when NETWORK_ARCHIVE_MODE is on; returns the browser proxy setting."""
+        if settings.NETWORK_ARCHIVE_MODE == "off":
+            return None
+        from selenium.webdriver.common.proxy import Proxy, ProxyType
+        from qa_framework.core.drivers.archive import ArchiveProxy, archive_path, effective_mode
+
+        path = archive_path("session")
+        self._archive_proxy = ArchiveProxy(path, effective_mode(path), settings.NETWORK_ARCHIVE_FALLTHROUGH).start()
+        address = self._archive_proxy.address
+        return Proxy({"proxyType": ProxyType.MANUAL, "httpProxy": address, "sslProxy": address})
+
+    def use_archive(self, name: str) -> None:
+        if self._archive_proxy is not None:
+            from qa_framework.core.drivers.archive import archive_path, effective_mode
+            path = archive_path(name)
+            self._archive_proxy.use(path, effective_mode(path))
+
+    def _enable_blocking(self, blocker: NetworkBlocker) -> None:
+        """Blocks the profile's URL patterns through CDP (local Chromium only)."""
+        if not hasattr(self.driver, "execute_cdp_cmd"):
+            logger.warning("Network blocking needs Chrome DevTools; not applied", profile=blocker.profile.name)
+            return
+        self.driver.execute_cdp_cmd("Network.enable", {})
+        self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocker.profile.url_blocklist()})
+        self._blocker = blocker
+
+    def network_report(self) -> Dict[str, Any]:
+        if self._blocker is None:
+            return {}
+        record_cdp_blocked(self._blocker, self.driver.get_log("performance"))
+        return self._blocker.report()
+
+    def reset(self) -> None:
+        """
+        Clears cookies, web storage and extra windows so the warm browser
+        can be reused by the next test (see DriverPool).
+        """
+        handles = self.driver.window_handles
+        for handle in handles[1:]:
+            self.driver.switch_to.window(handle)
+            self.driver.close()
+        self.driver.switch_to.window(handles[0])
+
+        # Web storage is per origin, so clear it before leaving the current page
+        try:
+            self.driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        except WebDriverException:
+            pass  # about:blank and data: URLs have no storage
+        if hasattr(self.driver, "execute_cdp_cmd"):
+            # Chromium: cookies of every domain, not just the current one
+            self.driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        self.driver.delete_all_cookies()
+        self.driver.get("about:blank")
+
+        self._set_implicit_wait(settings.IMPLICIT_WAIT)
+        self._wait_budget_used = 0.0
+        self._invalidate_elements()
+
+    def is_healthy(self) -> bool:
+        if self.driver is None:
+            return False
+        try:
+            self.driver.current_url
+            return True
+        except WebDriverException:
+            return False
+
+    def save_session(self) -> Dict[str, Any]:
+        url = self.driver.current_url
+        parts = urlsplit(url)
+        local_storage = self.driver.execute_script(
+            "return Object.keys(localStorage).map((k) => ({name: k, value: localStorage.getItem(k)}));"
+        ) or []
+        return {
+            "url": url,
+            "cookies": self.driver.get_cookies(),
+            "origins": [{"origin": f"{parts.scheme}://{parts.netloc}", "localStorage": local_storage}],
+        }
+
+    def load_session(self, state: Dict[str, Any]) -> None:
+        """
+        Cookies and storage can only be set on a page of their origin, so each
+        origin is visited once before opening the snapshot URL.
+        """
+        from selenium.common.exceptions import InvalidCookieDomainException
+
+        origins = state.get("origins") or [{"origin": state["url"], "localStorage": []}]
+        for origin in origins:
+            self.driver.get(origin["origin"])
+            host = urlsplit(origin["origin"]).hostname or ""
+            for cookie in state.get("cookies", []):
+                if host.endswith(cookie.get("domain", host).lstrip(".")):
+                    try:
+                        self.driver.add_cookie(cookie)
+                    except InvalidCookieDomainException:
+                        logger.warning("Skipping cookie for another domain", cookie=cookie.get("name"))
+            for item in origin.get("localStorage", []):
+                self.driver.execute_script("localStorage.setItem(arguments[0], arguments[1]);", item["name"], item["value"])
+        self.goto(state["url"])
 
     def goto(self, url: str) -> None:
         self.driver.get(url)
+        self._wait_budget_used = 0.0
+        self._invalidate_elements()
+        if settings.PAGE_TIMING_ENABLED:
+            self._record_page_timing()
+
+    def _record_page_timing(self) -> None:
+        """Stores the page's load metrics; never fails the navigation."""
+        from qa_framework.core.performance.page_timing import TIMING_FUNCTION, record
+
+        try:
+            # The script timeout is session-wide; put back whatever the test had set
+            previous = self.driver.timeouts.script
+            self.driver.set_script_timeout(10)
+            try:
+                timing = self.driver.execute_async_script(f"({TIMING_FUNCTION})(arguments[arguments.length - 1]);")
+            finally:
+                self.driver.set_script_timeout(previous)
+            record(timing, driver=type(self).__name__)
+        except Exception as e:
+            logger.warning("Failed to capture page timing", error=str(e))
+
+    def _invalidate_elements(self) -> None:
+        """Starts a new page generation: every cached element handle is dropped."""
+        self._generation += 1
+        self._elements.clear()
+        self._elements_url = None
+        self._url_check_pending = False
+
+    def _cached_element(self, selector: str):
+        """
+        Returns the cached handle for the selector on the current page generation.
+        After a click the URL is compared once, since the click may have navigated.
+        """
+        if selector not in self._elements:
+            return None
+        if self._url_check_pending:
+            self._url_check_pending = False
+            if str(self.driver.current_url) != self._elements_url:
+                self._invalidate_elements()
+                return None
+        return self._elements[selector]
+
+    def _cache_element(self, selector: str, element) -> None:
+        self._elements[selector] = element
+
+    def _expect_navigation(self) -> None:
+        """
+        Called around actions that may navigate. The URL is only fetched while
+        handles are cached, and compared once on the next cache hit.
+        """
+        if self._elements and self._elements_url is None:
+            self._elements_url = str(self.driver.current_url)
+        self._url_check_pending = bool(self._elements)
+
+    def _with_element(self, selector: str, action: Callable[[Any], Any]) -> Any:
+        """
+        Runs an action on the (possibly cached) element. A stale handle means the
+        DOM was replaced: the generation is bumped and the lookup repeated once.
+        """
+        from selenium.common.exceptions import StaleElementReferenceException
+
+        try:
+            return action(self.find_element(selector))
+        except StaleElementReferenceException:
+            logger.info("Cached element went stale, looking it up again", selector=selector)
+            self._invalidate_elements()
+            return action(self.find_element(selector))
 
     def get_title(self) -> str:
         return self.driver.title
 
     def get_driver(self):
+        # The raw driver can navigate behind the cache's back (back(), get(), scripts)
+        self._invalidate_elements()
         return self.driver
 
     def screenshot(self, path: str) -> str:
         self.driver.save_screenshot(path)
         return path
 
+    def screenshot_bytes(self) -> bytes:
+        return self.driver.get_screenshot_as_png()
+
+    def _set_implicit_wait(self, seconds: float) -> None:
+        """Applies the implicit wait, skipping the round trip if it is already set."""
+        if seconds != self._implicit_wait:
+            self.driver.implicitly_wait(seconds)
+            self._implicit_wait = seconds
+
+    def _lookup_wait(self) -> float:
+        """
+        Wait for a regular lookup: IMPLICIT_WAIT, capped by what is left of the
+        per-page SELECTOR_WAIT_BUDGET (time already lost on lookups that failed).
+        """
+        if settings.SELECTOR_WAIT_BUDGET is None:
+            return settings.IMPLICIT_WAIT
+        remaining = max(settings.SELECTOR_WAIT_BUDGET - self._wait_budget_used, 0.0)
+        return min(settings.IMPLICIT_WAIT, remaining)
+
+    def _is_known_broken(self, selector: str) -> bool:
+        from qa_framework.core.healing.cache import BrokenSelectorRegistry
+
+        registry = BrokenSelectorRegistry.shared()
+        # current_url is only fetched for selectors that were broken somewhere before
+        return registry.is_known(selector) and registry.is_broken(str(self.driver.current_url), selector)
+
     def find_element(self, selector: str):
         """
         Finds an element with Self-Healing capabilities.
+        Selectors already known to be broken on this page are probed with
+        BROKEN_SELECTOR_WAIT instead of the full implicit wait before healing.
+        With ELEMENT_CACHE_ENABLED, handles found on the current page are reused;
+        actions on them retry once with a fresh lookup if the handle went stale.
         """
-        from selenium.webdriver.common.by import By
+        if settings.ELEMENT_CACHE_ENABLED:
+            element = self._cached_element(selector)
+            if element is not None:
+                return element
+            element = self._find_element(selector)
+            self._cache_element(selector, element)
+            return element
+        return self._find_element(selector)
+
+    def _find_element(self, selector: str):
         from selenium.common.exceptions import NoSuchElementException
-        from qa_framework.core.healing.healer import Healer
-
-        # Determine strategy (heuristic validation)
-        strategy = By.CSS_SELECTOR
-        if selector.startswith("//") or selector.startswith("("):
-            strategy = By.XPATH
-        elif selector.startswith("id="):
-            strategy = By.ID
-            selector = selector.replace("id=", "")
-        elif selector.startswith("name="):
-            strategy = By.NAME
-            selector = selector.replace("name=", "")
 
+        raw_selector = selector
+        strategy, selector = Locator(selector).selenium
+
+        known_broken = settings.ENABLE_SELF_HEALING and self._is_known_broken(raw_selector)
+        self._set_implicit_wait(settings.BROKEN_SELECTOR_WAIT if known_broken else self._lookup_wait())
+
+        started = time.monotonic()
         try:
-            return self.driver.find_element(strategy, selector)
+            element = self.driver.find_element(strategy, selector)
+            if known_broken:
+                from qa_framework.core.healing.cache import BrokenSelectorRegistry
+                BrokenSelectorRegistry.shared().clear(str(self.driver.current_url), raw_selector)
+            return element
         except NoSuchElementException:
+            if not known_broken:
+                self._wait_budget_used += time.monotonic() - started
             if settings.ENABLE_SELF_HEALING:
-                logger.warning(f"Element not found: {selector}. Attempting Self-Healing...")
-                healer = Healer(self.driver.page_source)
-                new_selector = healer.heal(selector)
-                
-                if new_selector:
-                    logger.info(f"Retrying with healed selector: {new_selector}")
-                    # Strategy for healed selector is usually CSS or ID based on Healer logic
-                    # For simplicity, if it starts with #, treat as CSS, else CSS (tag name)
-                    return self.driver.find_element(By.CSS_SELECTOR, new_selector)
+                # Healed selectors get a regular wait while the page settles
+                self._set_implicit_wait(self._lookup_wait())
+                element = self._heal(raw_selector)
+                if element is not None:
+                    return element
             
             raise
 
+    def _heal(self, selector: str):
+        """
+        Resolves a broken selector through the shared healing flow
+        (cached heal first, then in-browser or page-source healing).
+        """
+        from selenium.webdriver.common.by import By
+        from selenium.common.exceptions import NoSuchElementException
+        from qa_framework.core.healing.browser import selenium_runner
+        from qa_framework.core.healing.resolver import HealingResolver
+
+        def probe(css_selector: str):
+            # Healer always generates CSS selectors (#id, [name=...], tag.class)
+            try:
+                return self.driver.find_element(By.CSS_SELECTOR, css_selector)
+            except NoSuchElementException:
+                return None
+
+        resolver = HealingResolver(
+            get_url=lambda: self.driver.current_url,
+            get_page_source=lambda: self.driver.page_source,
+            probe=probe,
+            run_script=selenium_runner(self.driver),
+        )
+        return resolver.resolve(selector)
+
+    def wait_for(self, condition, timeout: Optional[float] = None):
+        """
+        Waits inside the page: the condition is re-checked on every DOM mutation
+        (MutationObserver) and returns the moment it holds, without polling.
+        A navigation during the wait unloads the script; it is then re-armed
+        on the new page for the remaining time.
+        """
+        from qa_framework.core.waits.conditions import WAIT_FUNCTION
+
+        timeout = settings.EXPLICIT_WAIT if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        script = f"({WAIT_FUNCTION})(arguments[0], arguments[1], arguments[arguments.length - 1]);"
+        previous = self.driver.timeouts.script
+        try:
+            while True:
+                remaining = max(deadline - time.monotonic(), 0)
+                # The in-page timeout fires first; the script timeout is only a backstop
+                self.driver.set_script_timeout(remaining + 5)
+                try:
+                    result = self.driver.execute_async_script(script, condition.payload(), int(remaining * 1000))
+                except WebDriverException as e:
+                    if time.monotonic() < deadline:
+                        logger.info("Wait script interrupted, re-arming", condition=str(condition), error=e.msg)
+                        time.sleep(0.05)  # let the next document start loading
+                        continue
+                    raise WaitTimeoutError(f"Timed out after {timeout}s waiting for {condition}", original_exception=e)
+                if result and result.get("ok"):
+                    return result.get("value")
+                if result and result.get("error") != "timeout":
+                    raise WaitTimeoutError(f"Waiting for {condition} failed: {result.get('error')}")
+                raise WaitTimeoutError(f"Timed out after {timeout}s waiting for {condition}")
+        finally:
+            # Restore the session's script timeout for the test's own execute_async_script calls
+            self.driver.set_script_timeout(previous)
+
+    def batch(self, ops: Sequence[tuple]) -> List[Any]:
+        """All operations run in a single execute_script round trip."""
+        from qa_framework.core.drivers.batch import BATCH_FUNCTION, collect_results, compile_ops
+
+        if not ops:
+            return []
+        if any(op[0] == "click" for op in ops):
+            self._expect_navigation()
+        raw = self.driver.execute_script(f"return ({BATCH_FUNCTION})(arguments[0]);", compile_ops(ops))
+        return collect_results(self, ops, raw)
+
     def click(self, selector: str):
-        el = self.find_element(selector)
-        el.click()
+        def click(el):
+            self._expect_navigation()
+            el.click()
+
+        self._with_element(selector, click)
 
     def type(self, selector: str, text: str):
-        el = self.find_element(selector)
-        el.send_keys(text)
+        def type_text(el):
+            # Enter (or a keystroke handler) may submit a form
+            self._expect_navigation()
+            el.send_keys(text)
+
+        self._with_element(selector, type_text)
 
     def get_text(self, selector: str) -> str:
-        el = self.find_element(selector)
-        return el.text
+        return self._with_element(selector, lambda el: el.text)
@@ -0,0 +1,107 @@
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+from qa_framework.core.drivers.abstract_driver import AbstractDriver
+from qa_framework.core.config import settings
+from qa_framework.core.logger import get_logger
+
+logger = get_logger("session_store")
+
+LoginFn = Callable[[AbstractDriver], None]
+CheckFn = Callable[[AbstractDriver], bool]
+
+
+class SessionStore:
+    """
+    Per-role snapshots of an authenticated browser session.
+    A role logs in through the UI once; its cookies and local storage are saved
+    to SESSION_STORE_DIR and later drivers for that role start from the
+    snapshot instead. Snapshots are refreshed when they exceed SESSION_TTL,
+    when one of their cookies expires, or when the role's check fails.
+
+        SessionStore.register("standard_user", lambda d: LoginPage(d).login("standard_user", "secret"))
+        driver = DriverFactory.acquire_driver(role="standard_user")
+    """
+
+    _logins: Dict[str, LoginFn] = {}
+    _checks: Dict[str, CheckFn] = {}
+
+    def __init__(self, directory: Optional[str] = None, ttl: Optional[int] = None):
+        self.directory = Path(directory or settings.SESSION_STORE_DIR)
+        self.ttl = ttl if ttl is not None else settings.SESSION_TTL
+
+    @classmethod
+    def register(cls, role: str, login: LoginFn, check: Optional[CheckFn] = None) -> None:
+        """
+        Registers how to log in as a role. The optional check runs after a
+        snapshot is restored and returns False if the session was rejected.
+        """
+        cls._logins[role] = login
+        if check is not None:
+            cls._checks[role] = check
+
+    def _path(self, role: str, driver: AbstractDriver) -> Path:
+        # Selenium cookies and Playwright storage_state differ slightly, so keep them apart
+        safe_role = re.sub(r"[^\w.-]", "_", role)
+        return self.directory / f"{safe_role}.{type(driver).__name__.lower()}.json"
+
+    def _expires_at(self, snapshot: Dict[str, Any]) -> float:
+        """The earlier of created + TTL and the first expiring cookie (session cookies never expire)."""
+        expiries = [snapshot["created"] + self.ttl] if self.ttl else []
+        for cookie in snapshot["state"].get("cookies", []):
+            # Playwright uses 'expires' (-1 for session cookies), Selenium 'expiry'
+            expiry = cookie.get("expires", cookie.get("expiry", -1))
+            if expiry and expiry > 0:
+                expiries.append(expiry)
+        return min(expiries) if expiries else float("inf")
+
+    def load(self, role: str, driver: AbstractDriver) -> Optional[Dict[str, Any]]:
+        """Returns the role's snapshot state if present and not expired."""
+        path = self._path(role, driver)
+        try:
+            with open(path) as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() >= self._expires_at(snapshot):
+            logger.info(f"Session snapshot for {role} expired")
+            return None
+        return snapshot["state"]
+
+    def save(self, role: str, driver: AbstractDriver, state: Dict[str, Any]) -> None:
+        path = self._path(role, driver)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Atomic replace: parallel workers may refresh the same role
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w") as f:
+            json.dump({"role": role, "created": time.time(), "state": state}, f)
+        os.replace(tmp, path)
+
+    def invalidate(self, role: str, driver: AbstractDriver) -> None:
+        self._path(role, driver).unlink(missing_ok=True)
+
+    def _login(self, role: str, driver: AbstractDriver) -> None:
+        logger.info(f"Logging in as {role} through the UI")
+        self._logins[role](driver)
+        self.save(role, driver, driver.save_session())
+
+    def authenticate(self, driver: AbstractDriver, role: str) -> None:
+        """Starts the driver's session as the role, logging in only when no usable snapshot exists."""
+        if role not in self._logins:
+            raise KeyError(f"No login registered for role '{role}'")
+
+        state = self.load(role, driver)
+        if state is None:
+            self._login(role, driver)
+            return
+
+        driver.load_session(state)
+        check = self._checks.get(role)
+        if check is not None and not check(driver):
+            logger.warning(f"Restored session for {role} was rejected. Logging in again.")
+            self.invalidate(role, driver)
+            driver.reset()
+            self._login(role, driver)
@@ -23,3 +23,13 @@ class APIGatewayError(QAFrameworkException):
 class DataLoadingError(QAFrameworkException):
     """Raised when loading test data fails."""
     pass
+
+class BatchOperationError(ElementInteractionError):
+    """Raised when items of a batched element operation fail; holds the per-item results."""
+    def __init__(self, message: str, results: list = None):
+        super().__init__(message)
+        self.results = results or []
+
+class WaitTimeoutError(QAFrameworkException):
+    """Raised when an explicit wait condition does not hold within its timeout."""
+    pass
@@ -0,0 +1,170 @@
+from typing import Any, Callable, Dict, List, Optional
+from qa_framework.core.healing.healer import Healer
+from qa_framework.core.logger import get_logger
+
+logger = get_logger("self_healing")
+
+# Scoring and selector generation, evaluated inside the page. A port of
+# CandidateScorer (same fields, weights, exact/substring rules, trigram Dice
+# similarity, number discount and depth tie-break) and Healer._generate_selector,
+# so both healing modes rank the same page identically; only the top-k results
+# cross the wire.
+HEAL_FUNCTION = r"""
+(meta, k) => {
+    const WEIGHTS = [['id', 1.0], ['name', 1.0], ['class', 1.0], ['text', 1.0], ['tag', 0.5]];
+    const PARTIAL = {id: 0.7, text: 0.8};
+    const NUMBER_MISMATCH = 0.8;
+    const SKIP = new Set(['script', 'style', 'noscript', 'template']);
+
+    const norm = (s) => (s || '').split(/\s+/).filter(Boolean).join(' ');
+    const fuzzyKey = (s) => norm(s.replace(/(?<=[a-z0-9])(?=[A-Z])/g, ' ')
+        .replace(/[^\p{L}\p{N}]+/gu, ' ').toLowerCase());
+    const numbers = (s) => new Set(s.match(/\p{Nd}+/gu) || []);
+    const trigrams = (s) => {
+        const grams = new Set();
+        const key = fuzzyKey(s);
+        if (!key) return grams;
+        const chars = Array.from(' ' + key + ' ');
+        for (let i = 0; i + 2 < chars.length; i++) grams.add(chars[i] + chars[i + 1] + chars[i + 2]);
+        return grams;
+    };
+    const classes = (el) => (el.getAttribute('class') || '').split(/\s+/).filter(Boolean);
+    const directText = (el, tag) => {
+        if (SKIP.has(tag)) return '';
+        const parts = [];
+        for (const node of el.childNodes) if (node.nodeType === 3) parts.push(node.nodeValue);
+        return norm(parts.join(' '));
+    };
+
+    const elements = Array.from(document.getElementsByTagName('*'));
+    const tags = elements.map((el) => el.tagName.toLowerCase());
+    const depthOf = new Map();
+    const depth = (el) => {
+        if (!el) return -1;
+        if (!depthOf.has(el)) depthOf.set(el, depth(el.parentElement) + 1);
+        return depthOf.get(el);
+    };
+    const values = {
+        id: elements.map((el) => el.getAttribute('id') || ''),
+        name: elements.map((el) => el.getAttribute('name') || ''),
+        text: elements.map((el, pos) => directText(el, tags[pos])),
+    };
+
+    const attributeScores = (field, value) => {
+        if (field === 'text') value = norm(value);
+        const query = trigrams(value);
+        const wantedNumbers = numbers(value);
+        const partial = PARTIAL[field];
+        return values[field].map((elValue) => {
+            if (!elValue) return 0.0;
+            if (elValue === value || (field === 'text' && elValue.toLowerCase() === value.toLowerCase())) return 1.0;
+            let score = 0.0;
+            if (query.size) {
+                const grams = trigrams(elValue);
+                let overlap = 0;
+                for (const gram of query) if (grams.has(gram)) overlap++;
+                score = 2.0 * overlap / (query.size + grams.size);
+            }
+            const elNumbers = numbers(elValue);
+            for (const number of wantedNumbers) {
+                if (!elNumbers.has(number)) { score *= NUMBER_MISMATCH; break; }
+            }
+            if (partial && elValue.includes(value)) score = Math.max(score, partial);
+            return score;
+        });
+    };
+    const fieldScores = (field, value) => {
+        if (field === 'class') {
+            const wanted = value.split(/\s+/).filter(Boolean);
+            return elements.map((el) => {
+                const own = classes(el);
+                let hits = 0;
+                for (const cls of wanted) hits += own.filter((c) => c === cls).length;
+                return hits === wanted.length ? 1.0 : 0.7 * hits / wanted.length;
+            });
+        }
+        if (field === 'tag') return tags.map((tag) => tag === value.toLowerCase() ? 1.0 : 0.0);
+        return attributeScores(field, value);
+    };
+
+    const combined = elements.map(() => 0.0);
+    let totalWeight = 0;
+    for (const [field, weight] of WEIGHTS) {
+        if (meta[field] === undefined) continue;
+        totalWeight += weight;
+        fieldScores(field, meta[field]).forEach((score, pos) => { combined[pos] += weight * score; });
+    }
+    if (!totalWeight) return [];
+
+    const selectorFor = (el, tag) => {
+        if (el.getAttribute('id')) return '#' + el.getAttribute('id');
+        if (el.getAttribute('name')) return "[name='" + el.getAttribute('name') + "']";
+        const own = classes(el);
+        if (own.length) return tag + '.' + own[0];
+        return tag;
+    };
+
+    return combined
+        .map((total, pos) => ({pos: pos, score: total / totalWeight, depth: depth(elements[pos])}))
+        .filter((c) => c.score > 0)
+        .sort((a, b) => b.score - a.score || b.depth - a.depth || a.pos - b.pos)
+        .slice(0, k)
+        .map((c) => ({selector: selectorFor(elements[c.pos], tags[c.pos]), score: c.score}));
+}
+"""
+
+ScriptRunner = Callable[[Dict[str, str], int], List[Dict[str, Any]]]
+
+
+def selenium_runner(webdriver) -> ScriptRunner:
+    """Runs the heal script through a Selenium WebDriver."""
+    script = f"return ({HEAL_FUNCTION})(arguments[0], arguments[1]);"
+    return lambda meta, k: webdriver.execute_script(script, meta, k)
+
+
+def playwright_runner(page) -> ScriptRunner:
+    """Runs the heal script through a Playwright Page."""
+    script = f"([meta, k]) => ({HEAL_FUNCTION})(meta, k)"
+    return lambda meta, k: page.evaluate(script, [meta, k])
+
+
+class BrowserHealer:
+    """
+    Self-healing that runs inside the browser.
+    Instead of transferring page_source, the scoring of every element is
+    injected as a script and only the top-k candidates are returned.
+    """
+
+    def __init__(self, run_script: ScriptRunner, top_k: int = 3):
+        self.run_script = run_script
+        self.top_k = top_k
+        self.last_score = 0.0
+        self.last_candidates: List[Dict[str, Any]] = []
+
+    def heal(self, failed_selector: str) -> Optional[str]:
+        """
+        Attempts to find a better selector for the failed one.
+        Returns the new selector string if found, else None.
+        """
+        logger.info(f"Attempting in-browser heal of selector: {failed_selector}")
+        self.last_score = 0.0
+        self.last_candidates = []
+
+        meta = Healer._parse_selector(failed_selector)
+        if not meta or set(meta) == {'tag'}:
+            logger.warning("Could not parse selector metadata. Skipping healing.")
+            return None
+
+        self.last_candidates = self.run_script(meta, self.top_k) or []
+        if not self.last_candidates:
+            logger.warning("Healing failed. No candidates found in page.")
+            return None
+
+        best = self.last_candidates[0]
+        self.last_score = float(best["score"])
+        if self.last_score > 0.8:
+            logger.info(f"Healed! New Selector: {best['selector']} (Score: {self.last_score:.2f})")
+            return best["selector"]
+
+        logger.warning(f"Healing failed. Best match score {self.last_score:.2f} was too low.")
+        return None
@@ -0,0 +1,242 @@
+import json
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+from qa_framework.core.config import settings
+from qa_framework.core.logger import get_logger
+
+logger = get_logger("healing_cache")
+
+# Path segments that identify a record rather than a page (ids, uuids, hashes)
+_VOLATILE_SEGMENT = re.compile(r"^(\d+|[0-9a-fA-F]{8}-[0-9a-fA-F-]{27}|[0-9a-fA-F]{16,})$")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS healed_selectors (
+    url_pattern TEXT NOT NULL,
+    selector TEXT NOT NULL,
+    healed_selector TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    last_verified REAL NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (url_pattern, selector)
+)
+"""
+
+_healed_maps: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+
+def url_pattern(url: str) -> str:
+    """
+    Reduces a URL to the page it represents: drops query and fragment and
+    replaces record-specific path segments with '*'.
+    'https://shop/items/42?ref=x' -> 'https://shop/items/*'
+    """
+    parts = urlsplit(url)
+    segments = ["*" if _VOLATILE_SEGMENT.match(seg) else seg for seg in parts.path.split("/")]
+    return f"{parts.scheme}://{parts.netloc}{'/'.join(segments)}" if parts.netloc else "/".join(segments)
+
+
+def load_healed_map(path: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Returns {failed selector: entry} from the map written by the offline
+    validator (HEALED_SELECTORS_FILE); each entry holds 'healed' and
+    'confidence'. The file is read once per path.
+    """
+    path = path or settings.HEALED_SELECTORS_FILE
+    if not path:
+        return {}
+    if path not in _healed_maps:
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            _healed_maps[path] = {
+                selector: entry for selector, entry in data.get("selectors", {}).items() if entry.get("healed")
+            }
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning(f"Could not load healed selector map {path}: {e}")
+            _healed_maps[path] = {}
+    return _healed_maps[path]
+
+
+@dataclass
+class HealedSelector:
+    """A healed selector as stored in the cache."""
+    url_pattern: str
+    selector: str
+    healed_selector: str
+    confidence: float
+    hits: int
+    last_verified: float
+    last_used: float
+
+
+class HealingCache:
+    """
+    Persistent SQLite store of healed selectors, keyed by URL pattern and failed selector.
+    Entries expire after a TTL and the least recently used ones are evicted
+    once the store grows past its maximum size.
+    """
+
+    _shared: Dict[str, "HealingCache"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, path: Optional[str] = None, ttl: Optional[int] = None, max_entries: Optional[int] = None):
+        self.path = Path(path or settings.HEALING_CACHE_PATH)
+        self.ttl = ttl if ttl is not None else settings.HEALING_CACHE_TTL
+        self.max_entries = max_entries if max_entries is not None else settings.HEALING_CACHE_MAX_ENTRIES
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=5, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(_SCHEMA)
+
+    @classmethod
+    def shared(cls) -> "HealingCache":
+        """Returns the process-wide cache for the configured HEALING_CACHE_PATH."""
+        path = str(settings.HEALING_CACHE_PATH)
+        with cls._shared_lock:
+            if path not in cls._shared:
+                cls._shared[path] = cls(path)
+            return cls._shared[path]
+
+    def get(self, url: str, selector: str) -> Optional[HealedSelector]:
+        """Returns the live entry for the failed selector on this page, if any."""
+        pattern = url_pattern(url)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url_pattern, selector, healed_selector, confidence, hits, last_verified, last_used "
+                "FROM healed_selectors WHERE url_pattern = ? AND selector = ?",
+                (pattern, selector),
+            ).fetchone()
+        if row is None:
+            return None
+
+        entry = HealedSelector(*row)
+        if self.ttl and time.time() - entry.last_verified > self.ttl:
+            logger.info(f"Cached heal for {selector} on {pattern} expired")
+            self.invalidate(url, selector)
+            return None
+        return entry
+
+    def put(self, url: str, selector: str, healed_selector: str, confidence: float) -> None:
+        """Stores (or re-verifies) a heal and applies TTL/LRU eviction."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO healed_selectors "
+                "(url_pattern, selector, healed_selector, confidence, hits, last_verified, last_used) "
+                "VALUES (?, ?, ?, ?, 0, ?, ?) "
+                "ON CONFLICT(url_pattern, selector) DO UPDATE SET "
+                "healed_selector = excluded.healed_selector, confidence = excluded.confidence, "
+                "last_verified = excluded.last_verified, last_used = excluded.last_used",
+                (url_pattern(url), selector, healed_selector, confidence, now, now),
+            )
+        self.evict()
+
+    def record_hit(self, url: str, selector: str) -> None:
+        """Marks a cached heal as used and verified against the live page."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE healed_selectors SET hits = hits + 1, last_used = ?, last_verified = ? "
+                "WHERE url_pattern = ? AND selector = ?",
+                (now, now, url_pattern(url), selector),
+            )
+
+    def invalidate(self, url: str, selector: str) -> None:
+        """Drops a cached heal that no longer resolves."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM healed_selectors WHERE url_pattern = ? AND selector = ?",
+                (url_pattern(url), selector),
+            )
+
+    def evict(self) -> None:
+        """Removes expired entries, then the least recently used beyond max_entries."""
+        with self._lock, self._conn:
+            if self.ttl:
+                self._conn.execute("DELETE FROM healed_selectors WHERE last_verified < ?", (time.time() - self.ttl,))
+            if self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM healed_selectors WHERE rowid IN ("
+                    "SELECT rowid FROM healed_selectors ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+
+    def keys(self) -> List[Tuple[str, str]]:
+        """Returns the (url_pattern, selector) pairs currently cached."""
+        with self._lock:
+            return self._conn.execute("SELECT url_pattern, selector FROM healed_selectors").fetchall()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM healed_selectors").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class BrokenSelectorRegistry:
+    """
+    In-memory record of selectors known to be broken on a page (URL pattern).
+    Seeded from the persistent HealingCache, so a selector healed in an earlier
+    run is recognised without a round trip; drivers probe such selectors with
+    a short wait instead of the full implicit wait. Selectors in the offline
+    healed-selector map are treated as broken on every page ('*').
+    """
+
+    _shared: Dict[Tuple[Optional[str], Optional[str]], "BrokenSelectorRegistry"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, cache: Optional[HealingCache] = None, healed_map: Optional[Dict[str, Any]] = None):
+        # The shared registry is used by every driver thread of the process
+        self._lock = threading.Lock()
+        self._pages: Dict[str, Set[str]] = {}
+        if cache is not None:
+            for pattern, selector in cache.keys():
+                self._pages.setdefault(selector, set()).add(pattern)
+        for selector in healed_map or {}:
+            self._pages.setdefault(selector, set()).add("*")
+
+    @classmethod
+    def shared(cls) -> "BrokenSelectorRegistry":
+        """Returns the process-wide registry, seeded from the configured cache if enabled."""
+        cache_path = str(settings.HEALING_CACHE_PATH) if settings.HEALING_CACHE_ENABLED else None
+        key = (cache_path, settings.HEALED_SELECTORS_FILE)
+        with cls._shared_lock:
+            if key not in cls._shared:
+                cls._shared[key] = cls(HealingCache.shared() if cache_path else None, load_healed_map())
+            return cls._shared[key]
+
+    def is_known(self, selector: str) -> bool:
+        """Cheap pre-check: has this selector been broken on any page?"""
+        with self._lock:
+            return selector in self._pages
+
+    def is_broken(self, url: str, selector: str) -> bool:
+        pattern = url_pattern(url)
+        with self._lock:
+            pages = self._pages.get(selector, ())
+            return "*" in pages or pattern in pages
+
+    def mark(self, url: str, selector: str) -> None:
+        pattern = url_pattern(url)
+        with self._lock:
+            self._pages.setdefault(selector, set()).add(pattern)
+
+    def clear(self, url: str, selector: str) -> None:
+        pattern = url_pattern(url)
+        with self._lock:
+            pages = self._pages.get(selector)
+            if pages:
+                pages.discard(pattern)
+                if not pages:
+                    del self._pages[selector]
@@ -1,6 +1,6 @@
-from bs4 import BeautifulSoup
 from typing import Optional, List, Dict, Any
 import re
+from qa_framework.core.healing.index import DOMIndex
 from qa_framework.core.logger import get_logger
 
 logger = get_logger("self_healing")
@@ -9,10 +9,19 @@ class Healer:
     """
     Intelligent Self-Healing mechanism.
     Analyzes page source to find alternative selectors when the primary one fails.
+    The page is indexed once; pass an existing DOMIndex to reuse it across heals.
     """
 
-    def __init__(self, page_source: str):
-        self.soup = BeautifulSoup(page_source, 'html.parser')
+    def __init__(self, page_source: Optional[str] = None, index: Optional[DOMIndex] = None, top_k: int = 3):
+        if index is None:
+            if page_source is None:
+                raise ValueError("Healer requires either page_source or a prebuilt index")
+            index = DOMIndex(page_source)
+        self.index = index
+        self.soup = index.soup
+        self.top_k = top_k
+        self.last_score = 0.0
+        self.last_candidates: List[Dict[str, Any]] = []
 
     def heal(self, failed_selector: str) -> Optional[str]:
         """
@@ -20,25 +29,29 @@ class Healer:
         Returns the new selector string if found, else None.
         """
         logger.info(f"Attempting to heal selector: {failed_selector}")
+        self.last_score = 0.0
         
-        # 1. Parse metadata from the failed selector
+        self.last_candidates = []
+
+        # 1. Parse metadata from the failed selector (a tag alone is too weak to heal on)
         meta = self._parse_selector(failed_selector)
-        if not meta:
+        if not meta or set(meta) == {'tag'}:
             logger.warning("Could not parse selector metadata. Skipping healing.")
             return None
 
-        # 2. Find Candidates in the current DOM
-        candidates = self._find_candidates(meta)
-        
-        # 3. Score Candidates
-        best_match = None
-        highest_score = 0.0
+        # 2. Score every indexed element in one batch and keep the top k
+        ranked = self.index.scorer.top_k(meta, self.top_k)
+        if not ranked:
+            logger.warning("Healing failed. No candidates found in page.")
+            return None
 
-        for candidate in candidates:
-            score = self._score_match(meta, candidate)
-            if score > highest_score:
-                highest_score = score
-                best_match = candidate
+        self.last_candidates = [
+            {"selector": self._generate_selector(self.index.elements[pos]), "score": score}
+            for score, pos in ranked
+        ]
+        highest_score, best_pos = ranked[0]
+        best_match = self.index.elements[best_pos]
+        self.last_score = highest_score
 
         # 4. Threshold Check (e.g., 80% confidence)
         if highest_score > 0.8:
@@ -49,9 +62,10 @@ class Healer:
         logger.warning(f"Healing failed. Best match score {highest_score:.2f} was too low.")
         return None
 
-    def _parse_selector(self, selector: str) -> Dict[str, str]:
+    @staticmethod
+    def _parse_selector(selector: str) -> Dict[str, str]:
         """
-        Extracts key attributes (id, name, class, text) from a selector.
+        Extracts key attributes (id, name, class, text, tag) from a selector.
         Very basic heuristic parser.
         """
         meta = {}
@@ -59,12 +73,16 @@ class Healer:
         # ID selector (#foo or [id='foo'])
         if '#' in selector:
             meta['id'] = selector.split('#')[-1].split(' ')[0]
+        elif selector.startswith('id='):
+            meta['id'] = selector[3:]
         elif 'id=' in selector:
             match = re.search(r"id=['\"](.*?)['\"]", selector)
             if match: meta['id'] = match.group(1)
 
         # Name selector
-        if 'name=' in selector:
+        if selector.startswith('name='):
+            meta['name'] = selector[5:]
+        elif 'name=' in selector:
             match = re.search(r"name=['\"](.*?)['\"]", selector)
             if match: meta['name'] = match.group(1)
             
@@ -72,70 +90,26 @@ class Healer:
         if 'text()' in selector:
             match = re.search(r"text\(\)\s*=\s*['\"](.*?)['\"]", selector)
             if match: meta['text'] = match.group(1)
-            
-        return meta
-
-    def _find_candidates(self, meta: Dict[str, str]) -> List[Any]:
-        """
-        Finds elements that match *at least one* attribute partially.
-        """
-        candidates = []
-        
-        # Search by ID (fuzzy)
-        if 'id' in meta:
-            # Find all elements with an id
-            elements = self.soup.find_all(attrs={"id": True})
-            candidates.extend(elements)
-            
-        # Search by Name
-        if 'name' in meta:
-            elements = self.soup.find_all(attrs={"name": True})
-            candidates.extend(elements)
-            
-        # Search by Text
-        if 'text' in meta:
-            # Find all elements with text
-            elements = self.soup.find_all(string=True)
-            # Get their parents
-            candidates.extend([e.parent for e in elements if e.parent.name != 'script'])
 
-        return list(set(candidates)) # Dedupe
+        # Class selector (.foo or @class='foo'), ignoring quoted values
+        if '@class' in selector:
+            match = re.search(r"@class\s*=\s*['\"](.*?)['\"]", selector)
+            if match: meta['class'] = match.group(1)
+        elif not selector.startswith(('/', '(')):
+            unquoted = re.sub(r"(['\"]).*?\1", "", selector)
+            classes = re.findall(r"\.(-?[_a-zA-Z][\w-]*)", unquoted)
+            if classes: meta['class'] = " ".join(classes)
 
-    def _score_match(self, meta: Dict[str, str], element) -> float:
-        """
-        Scores an element based on how many attributes match the metadata.
-        Uses simplistic scoring for demonstration.
-        """
-        score = 0.0
-        total_weight = 0.0
-        
-        # Check ID
-        if 'id' in meta:
-            total_weight += 1.0
-            el_id = element.get('id', '')
-            if el_id == meta['id']:
-                score += 1.0
-            elif meta['id'] in el_id or el_id in meta['id']:
-                score += 0.7 # Partial match
-        
-        # Check Name
-        if 'name' in meta:
-            total_weight += 1.0
-            el_name = element.get('name', '')
-            if el_name == meta['name']:
-                score += 1.0
-        
-        # Check Text
-        if 'text' in meta:
-            total_weight += 1.0
-            el_text = element.get_text(strip=True)
-            if meta['text'] == el_text:
-                score += 1.0
-            elif meta['text'] in el_text:
-                score += 0.8
-        
-        if total_weight == 0: return 0.0
-        return score / total_weight
+        # Tag of the targeted element (last XPath step / last CSS compound)
+        if selector.startswith(('/', '(')):
+            steps = re.findall(r"/([a-zA-Z][\w-]*)", selector)
+            if steps: meta['tag'] = steps[-1].lower()
+        elif not selector.startswith(('id=', 'name=')):
+            compound = re.split(r"[\s>+~]+", selector.replace('css=', '', 1).strip())[-1]
+            match = re.match(r"[a-zA-Z][\w-]*", compound)
+            if match: meta['tag'] = match.group(0).lower()
+            
+        return meta
 
     def _generate_selector(self, element) -> str:
         """
@@ -148,6 +122,10 @@ class Healer:
         # Prefer Name
         if element.get('name'):
             return f"[name='{element.get('name')}']"
+
+        # Prefer tag + first class
+        if element.get('class'):
+            return f"{element.name}.{element.get('class')[0]}"
         
         # Fallback to loose CSS path (simplified)
         return f"{element.name}"
@@ -0,0 +1,101 @@
+from typing import Dict, List
+from bs4 import BeautifulSoup, NavigableString, Tag
+
+try:
+    import lxml  # noqa: F401
+    PARSER = "lxml"
+except ImportError:
+    PARSER = "html.parser"
+
+# Elements whose text content is never a useful healing target
+SKIP_TEXT_TAGS = {"script", "style", "noscript", "template"}
+
+
+def normalize_text(text: str) -> str:
+    """Collapses whitespace so that text keys are layout independent."""
+    return " ".join(text.split())
+
+
+class DOMIndex:
+    """
+    Positional index over a page, built in a single pass over the parsed DOM.
+    Keeps every element with its tag, depth and direct text, plus exact-value
+    maps of ids, names, classes and normalized text that the CandidateScorer
+    uses for its exact-match features. A single index can serve any number of
+    heals against the same page source.
+    """
+
+    def __init__(self, page_source: str):
+        self.soup = BeautifulSoup(page_source, PARSER)
+
+        # Positional storage, in document order
+        self.elements: List[Tag] = []
+        self.tags: List[str] = []
+        self.depths: List[int] = []
+        self.texts: List[str] = []
+
+        # Exact-value indexes
+        self.by_id: Dict[str, List[int]] = {}
+        self.by_name: Dict[str, List[int]] = {}
+        self.by_class: Dict[str, List[int]] = {}
+        self.by_text: Dict[str, List[int]] = {}
+
+        self._scorer = None
+        self._build()
+
+    def __len__(self) -> int:
+        return len(self.elements)
+
+    @property
+    def scorer(self):
+        """Batch similarity scorer over this index, built on first use and then reused."""
+        if self._scorer is None:
+            from qa_framework.core.healing.scoring import CandidateScorer
+            self._scorer = CandidateScorer(self)
+        return self._scorer
+
+    def _build(self) -> None:
+        stack = [(self.soup, -1)]
+        while stack:
+            node, depth = stack.pop()
+            children = []
+            text_parts = []
+            for child in node.contents:
+                if isinstance(child, Tag):
+                    children.append(child)
+                elif type(child) is NavigableString:
+                    # Exact type check skips comments, CDATA and doctypes
+                    text_parts.append(child)
+
+            if depth >= 0:
+                text = "" if node.name in SKIP_TEXT_TAGS else normalize_text(" ".join(text_parts))
+                self._add(node, depth, text)
+
+            # Reversed so that popping yields document (pre-)order
+            stack.extend((child, depth + 1) for child in reversed(children))
+
+    def _add(self, element: Tag, depth: int, text: str) -> None:
+        pos = len(self.elements)
+        self.elements.append(element)
+        self.tags.append(element.name)
+        self.depths.append(depth)
+        self.texts.append(text)
+
+        attrs = element.attrs
+        el_id = attrs.get("id")
+        if el_id:
+            self.by_id.setdefault(el_id, []).append(pos)
+
+        el_name = attrs.get("name")
+        if el_name:
+            self.by_name.setdefault(el_name, []).append(pos)
+
+        classes = attrs.get("class")
+        if classes:
+            if isinstance(classes, str):
+                classes = classes.split()
+            for cls in classes:
+                self.by_class.setdefault(cls, []).append(pos)
+
+        if text:
+            self.by_text.setdefault(text.lower(), []).append(pos)
@@ -0,0 +1,89 @@
+import time
+from typing import Any, Callable, Optional, Tuple
+from qa_framework.core.config import settings
+from qa_framework.core.healing.browser import BrowserHealer, ScriptRunner
+from qa_framework.core.healing.healer import Healer
+from qa_framework.core.logger import get_logger
+
+logger = get_logger("self_healing")
+
+
+class HealingResolver:
+    """
+    Driver-agnostic healing flow shared by the UI drivers.
+    A cached heal for the current page is tried first, then the offline
+    healed-selector map (HEALED_SELECTORS_FILE); on a miss the selector is
+    healed in the browser (HEALING_MODE=browser) or from the page source (dom).
+
+    The driver supplies callables for the current URL, the page source, the
+    in-page script runner and a probe that returns the element for a CSS
+    selector, or None if it does not match.
+    """
+
+    def __init__(self,
+                 get_url: Callable[[], str],
+                 get_page_source: Callable[[], str],
+                 probe: Callable[[str], Any],
+                 run_script: Optional[ScriptRunner] = None):
+        self.get_url = get_url
+        self.get_page_source = get_page_source
+        self.probe = probe
+        self.run_script = run_script
+
+    def _healer(self):
+        if settings.HEALING_MODE == "browser" and self.run_script is not None:
+            return BrowserHealer(self.run_script, top_k=settings.HEALING_TOP_K)
+        return Healer(self.get_page_source())
+
+    def resolve(self, selector: str) -> Any:
+        """Returns the probe result for the healed selector, or None if healing failed."""
+        if not settings.INSTRUMENTATION_ENABLED:
+            return self._resolve(selector)[0]
+
+        from qa_framework.core.instrumentation import metrics
+        started = time.perf_counter()
+        element, outcome = self._resolve(selector)
+        metrics.record_healing(outcome, time.perf_counter() - started)
+        return element
+
+    def _resolve(self, selector: str) -> Tuple[Any, str]:
+        """Returns the element and the outcome: cache_hit, map_hit, healed or failed."""
+        from qa_framework.core.healing.cache import BrokenSelectorRegistry, HealingCache, load_healed_map
+
+        url = str(self.get_url())
+        BrokenSelectorRegistry.shared().mark(url, selector)
+
+        cache = None
+        if settings.HEALING_CACHE_ENABLED:
+            cache = HealingCache.shared()
+            cached = cache.get(url, selector)
+            if cached:
+                element = self.probe(cached.healed_selector)
+                if element is not None:
+                    logger.info(f"Using cached healed selector: {cached.healed_selector}", selector=selector)
+                    cache.record_hit(url, selector)
+                    return element, "cache_hit"
+                logger.warning(f"Cached healed selector no longer matches: {cached.healed_selector}")
+                cache.invalidate(url, selector)
+
+        mapped = load_healed_map().get(selector)
+        if mapped:
+            element = self.probe(mapped["healed"])
+            if element is not None:
+                logger.info(f"Using pre-healed selector: {mapped['healed']}", selector=selector)
+                if cache is not None:
+                    cache.put(url, selector, mapped["healed"], float(mapped.get("confidence", 0.0)))
+                return element, "map_hit"
+            logger.warning(f"Pre-healed selector does not match on this page: {mapped['healed']}")
+
+        logger.warning(f"Element not found: {selector}. Attempting Self-Healing...")
+        healer = self._healer()
+        new_selector = healer.heal(selector)
+        if not new_selector:
+            return None, "failed"
+
+        logger.info(f"Retrying with healed selector: {new_selector}")
+        element = self.probe(new_selector)
+        if element is not None and cache is not None:
+            cache.put(url, selector, new_selector, healer.last_score)
+        return element, "healed" if element is not None else "failed"
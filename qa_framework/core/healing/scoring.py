@@ -0,0 +1,246 @@
+import heapq
+import re
+from typing import Dict, List, Sequence, Set, Tuple
+from qa_framework.core.healing.index import DOMIndex, normalize_text
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Relative weight of each feature in the combined score
+FIELD_WEIGHTS = {"id": 1.0, "name": 1.0, "class": 1.0, "text": 1.0, "tag": 0.5}
+
+# Rule-based score when the wanted value is a substring of the element's value.
+# The reverse case (element value inside the wanted one) is left to trigram similarity.
+PARTIAL_SCORES = {"id": 0.7, "text": 0.8}
+
+# Trigram similarity is scaled by this when the numbers in the wanted value are not
+# all present in the element's value: 'item-6' and 'item-8' are different elements.
+NUMBER_MISMATCH = 0.8
+
+_SEPARATORS = re.compile(r"[\W_]+")
+_CAMEL_BOUNDARY = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+_NUMBERS = re.compile(r"\d+")
+
+
+def fuzzy_key(value: str) -> str:
+    """Separator and case insensitive form: 'userName', 'user-name' and 'User_Name' compare equal."""
+    return " ".join(_SEPARATORS.sub(" ", _CAMEL_BOUNDARY.sub(" ", value)).lower().split())
+
+
+def numbers(value: str) -> Set[str]:
+    return set(_NUMBERS.findall(value))
+
+
+def trigrams(value: str) -> Set[str]:
+    """Character trigrams of the fuzzy key, padded so short values still produce grams."""
+    key = fuzzy_key(value)
+    if not key:
+        return set()
+    padded = f" {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _np_gram_postings(keys: List[str]):
+    """
+    Vectorized trigram extraction over all keys at once.
+    Each trigram is packed into one int64 (3 x 21-bit code points); returns the
+    deduplicated (owner, gram code) postings and the gram-set size per key.
+    """
+    padded = [f" {key} " if key else "" for key in keys]
+    lengths = np.fromiter(map(len, padded), dtype=np.int64, count=len(padded))
+    chars = np.frombuffer("".join(padded).encode("utf-32-le"), dtype=np.uint32).astype(np.int64)
+    if len(chars) < 3:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(len(keys))
+
+    char_owner = np.repeat(np.arange(len(keys), dtype=np.int64), lengths)
+    codes = (chars[:-2] << 42) | (chars[1:-1] << 21) | chars[2:]
+    within = char_owner[:-2] == char_owner[2:]
+    owners, codes = char_owner[:-2][within], codes[within]
+
+    order = np.lexsort((codes, owners))
+    owners, codes = owners[order], codes[order]
+    unique = np.ones(len(codes), dtype=bool)
+    unique[1:] = (owners[1:] != owners[:-1]) | (codes[1:] != codes[:-1])
+    owners, codes = owners[unique], codes[unique]
+    sizes = np.bincount(owners, minlength=len(keys)).astype(np.float64)
+    return owners, codes, sizes
+
+
+class CandidateScorer:
+    """
+    Scores every element of a DOMIndex against selector metadata in one batch.
+    Each attribute feature (id, name, class, text) takes the best of the exact /
+    substring rules and a character trigram (Dice) similarity, discounted when
+    the numbers in the wanted value do not all reappear; tag equality is
+    a structural feature and depth breaks ties in favour of the deeper element.
+
+    With NumPy installed all features are computed as array operations over the
+    whole page; without it the same scores are computed in plain Python.
+    """
+
+    def __init__(self, index: DOMIndex):
+        self.index = index
+        self.size = len(index)
+        self.values: Dict[str, List[str]] = {
+            "id": [el.get("id") or "" for el in index.elements],
+            "name": [el.get("name") or "" for el in index.elements],
+            "text": index.texts,
+        }
+        self._grams: Dict[str, object] = {}
+        self._numbers: Dict[str, object] = {}
+        self._arrays: Dict[str, object] = {}
+
+    def _field_grams(self, field: str):
+        """Per-field trigram postings, built once per index."""
+        if field in self._grams:
+            return self._grams[field]
+
+        values = self.values[field]
+        if np is None:
+            grams = [trigrams(value) if value else set() for value in values]
+        else:
+            grams = _np_gram_postings([fuzzy_key(value) for value in values])
+        self._grams[field] = grams
+        return grams
+
+    def _field_numbers(self, field: str):
+        """Per-field numbers: ' 4 12 ' strings for NumPy, sets otherwise."""
+        if field not in self._numbers:
+            found = [numbers(value) for value in self.values[field]]
+            if np is not None:
+                found = np.asarray([f" {' '.join(sorted(nums))} " for nums in found], dtype=str)
+            self._numbers[field] = found
+        return self._numbers[field]
+
+    def _field_array(self, field: str):
+        if field not in self._arrays:
+            self._arrays[field] = np.asarray(self.values[field], dtype=str)
+        return self._arrays[field]
+
+    def _positions(self, exact_index: Dict[str, List[int]], key: str):
+        return np.asarray(exact_index.get(key, ()), dtype=np.int64)
+
+    # --- NumPy implementation -------------------------------------------------
+
+    def _np_similarity(self, field: str, value: str):
+        owners, codes, sizes = self._field_grams(field)
+        _, query, query_sizes = _np_gram_postings([fuzzy_key(value)])
+        if not len(query) or not len(codes):
+            return np.zeros(self.size)
+        overlap = np.bincount(owners[np.isin(codes, query)], minlength=self.size)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            dice = np.where(sizes > 0, 2.0 * overlap / (sizes + query_sizes[0]), 0.0)
+
+        wanted_numbers = numbers(value)
+        if wanted_numbers:
+            element_numbers = self._field_numbers(field)
+            present = np.ones(self.size, dtype=bool)
+            for number in wanted_numbers:
+                present &= np.char.find(element_numbers, f" {number} ") >= 0
+            dice = np.where(present, dice, dice * NUMBER_MISMATCH)
+        return dice
+
+    def _np_field_score(self, field: str, value: str):
+        index = self.index
+        if field == "class":
+            wanted = value.split()
+            hits = np.zeros(self.size)
+            for cls in wanted:
+                np.add.at(hits, self._positions(index.by_class, cls), 1.0)
+            return np.where(hits == len(wanted), 1.0, 0.7 * hits / len(wanted))
+        if field == "tag":
+            return (np.asarray(index.tags, dtype=str) == value.lower()).astype(np.float64)
+
+        score = self._np_similarity(field, value)
+        values = self._field_array(field)
+        if field == "text":
+            value = normalize_text(value)
+            exact = self._positions(index.by_text, value.lower())
+        else:
+            exact = self._positions(index.by_id if field == "id" else index.by_name, value)
+
+        partial = PARTIAL_SCORES.get(field)
+        if partial:
+            contains = (np.char.find(values, value) >= 0) & (values != "")
+            score = np.maximum(score, np.where(contains, partial, 0.0))
+        score[exact] = 1.0
+        return score
+
+    # --- Pure Python implementation -------------------------------------------
+
+    def _py_field_score(self, field: str, value: str) -> List[float]:
+        index = self.index
+        if field == "class":
+            wanted = value.split()
+            hits = [0] * self.size
+            for cls in wanted:
+                for pos in index.by_class.get(cls, ()):
+                    hits[pos] += 1
+            return [1.0 if h == len(wanted) else 0.7 * h / len(wanted) for h in hits]
+        if field == "tag":
+            return [1.0 if tag == value.lower() else 0.0 for tag in index.tags]
+
+        if field == "text":
+            value = normalize_text(value)
+        query = trigrams(value)
+        wanted_numbers = numbers(value)
+        partial = PARTIAL_SCORES.get(field)
+        scores = []
+        for el_value, el_grams, el_numbers in zip(self.values[field], self._field_grams(field),
+                                                  self._field_numbers(field)):
+            if not el_value:
+                scores.append(0.0)
+                continue
+            if el_value == value or (field == "text" and el_value.lower() == value.lower()):
+                scores.append(1.0)
+                continue
+            score = 2.0 * len(query & el_grams) / (len(query) + len(el_grams)) if query else 0.0
+            if not wanted_numbers <= el_numbers:
+                score *= NUMBER_MISMATCH
+            if partial and value in el_value:
+                score = max(score, partial)
+            scores.append(score)
+        return scores
+
+    # --- Public API -----------------------------------------------------------
+
+    def scores(self, meta: Dict[str, str]) -> Sequence[float]:
+        """Combined score of every indexed element, aligned with index.elements."""
+        fields = [field for field in FIELD_WEIGHTS if field in meta]
+        total_weight = sum(FIELD_WEIGHTS[field] for field in fields)
+        if not fields or not self.size:
+            return [0.0] * self.size
+
+        if np is not None:
+            combined = np.zeros(self.size)
+            for field in fields:
+                combined += FIELD_WEIGHTS[field] * self._np_field_score(field, meta[field])
+            return combined / total_weight
+
+        combined = [0.0] * self.size
+        for field in fields:
+            weight = FIELD_WEIGHTS[field]
+            for pos, score in enumerate(self._py_field_score(field, meta[field])):
+                combined[pos] += weight * score
+        return [score / total_weight for score in combined]
+
+    def top_k(self, meta: Dict[str, str], k: int = 5) -> List[Tuple[float, int]]:
+        """
+        Returns up to k (score, position) pairs, best first.
+        Ties are broken by depth (deeper wins), then document order.
+        """
+        scores = self.scores(meta)
+        depths = self.index.depths
+        if np is not None:
+            positions = np.flatnonzero(scores)
+            if len(positions) > k:
+                # Narrow to a k-sized window in C before the heap does tie-breaking
+                cutoff = np.partition(scores[positions], len(positions) - k)[len(positions) - k]
+                positions = positions[scores[positions] >= cutoff]
+            ranked = ((float(scores[pos]), depths[pos], -int(pos)) for pos in positions)
+        else:
+            ranked = ((score, depths[pos], -pos) for pos, score in enumerate(scores) if score > 0)
+
+        return [(score, -neg_pos) for score, _, neg_pos in heapq.nlargest(k, ranked)]
@@ -0,0 +1,173 @@
+import ast
+import json
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+from qa_framework.core.drivers.locator import Locator, looks_like_selector
+from qa_framework.core.healing.healer import Healer
+from qa_framework.core.healing.index import DOMIndex
+from qa_framework.core.logger import get_logger
+
+logger = get_logger("selector_validator")
+
+SNAPSHOT_SUFFIXES = (".html", ".htm")
+
+
+@dataclass
+class SelectorRef:
+    """A selector constant declared on a page object class."""
+    selector: str
+    page_class: str
+    attribute: str
+    path: str
+    lineno: int
+
+    @property
+    def source(self) -> str:
+        return f"{self.path}:{self.lineno} {self.page_class}.{self.attribute}"
+
+
+def _snake_case(name: str) -> str:
+    return re.sub(r"(?<=[a-z0-9])(?=[A-Z])", "_", name).lower()
+
+
+def collect_selectors(paths: Iterable[str]) -> List[SelectorRef]:
+    """
+    Statically collects UPPER_CASE string constants that look like selectors
+    from the classes of every module under the given files/directories.
+    Modules are parsed, not imported, so collection has no side effects.
+    """
+    refs = []
+    for root in paths:
+        root_path = Path(root)
+        files = [root_path] if root_path.is_file() else sorted(root_path.rglob("*.py"))
+        for file in files:
+            tree = ast.parse(file.read_text(), filename=str(file))
+            for node in ast.walk(tree):
+                if not isinstance(node, ast.ClassDef):
+                    continue
+                for stmt in node.body:
+                    if not (isinstance(stmt, ast.Assign) and isinstance(stmt.value, ast.Constant)):
+                        continue
+                    value = stmt.value.value
+                    if not (isinstance(value, str) and looks_like_selector(value)):
+                        continue
+                    for target in stmt.targets:
+                        if isinstance(target, ast.Name) and target.id.isupper():
+                            refs.append(SelectorRef(value, node.name, target.id, str(file), stmt.lineno))
+    return refs
+
+
+def selector_matches(index: DOMIndex, selector: str, page_source: str = "") -> Optional[bool]:
+    """
+    Evaluates a framework selector against a parsed snapshot.
+    Returns None when the selector cannot be evaluated offline (XPath without lxml).
+    """
+    locator = Locator(selector)
+    if locator.strategy == "id":
+        return locator.value in index.by_id
+    if locator.strategy == "name":
+        return locator.value in index.by_name
+    if locator.strategy == "xpath":
+        try:
+            import lxml.html
+        except ImportError:
+            return None
+        return bool(lxml.html.fromstring(page_source).xpath(locator.value))
+    if locator.strategy == "accessibility_id":
+        return None
+    try:
+        return index.soup.select_one(locator.value) is not None
+    except Exception:
+        return False
+
+
+def _validate_snapshot(snapshot: str, selectors: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Worker: parses one snapshot once, checks its selectors and heals the failures."""
+    page_source = Path(snapshot).read_text(errors="replace")
+    index = DOMIndex(page_source)
+    healer = Healer(index=index)
+
+    results = {}
+    for selector in selectors:
+        matched = selector_matches(index, selector, page_source)
+        result = {"matched": matched, "healed": None, "confidence": 0.0}
+        if matched is False:
+            result["healed"] = healer.heal(selector)
+            result["confidence"] = healer.last_score
+        results[selector] = result
+    return results
+
+
+def _snapshots_for(ref: SelectorRef, snapshots: List[Path]) -> List[Path]:
+    """Snapshots named after the page object (login_page.html for LoginPage), else all of them."""
+    names = {_snake_case(ref.page_class), Path(ref.path).stem}
+    named = [snap for snap in snapshots if snap.stem in names]
+    return named or snapshots
+
+
+def validate(page_paths: Iterable[str], snapshot_dir: str, workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Checks every collected selector against the saved DOM snapshots in parallel.
+    A selector is 'ok' if it matches any snapshot it applies to; otherwise the
+    best-scoring heal across those snapshots is reported.
+    """
+    refs = collect_selectors(page_paths)
+    snapshots = sorted(p for p in Path(snapshot_dir).rglob("*") if p.suffix.lower() in SNAPSHOT_SUFFIXES)
+    if not snapshots:
+        raise FileNotFoundError(f"No HTML snapshots found in {snapshot_dir}")
+
+    work: Dict[Path, List[str]] = {}
+    for ref in refs:
+        for snap in _snapshots_for(ref, snapshots):
+            work.setdefault(snap, [])
+            if ref.selector not in work[snap]:
+                work[snap].append(ref.selector)
+
+    logger.info(f"Validating {len(refs)} selectors against {len(work)} snapshots")
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {snap: pool.submit(_validate_snapshot, str(snap), selectors) for snap, selectors in work.items()}
+        per_snapshot = {snap: future.result() for snap, future in futures.items()}
+
+    entries = []
+    for ref in refs:
+        entry = {**asdict(ref), "source": ref.source, "status": "broken", "healed": None,
+                 "confidence": 0.0, "snapshot": None}
+        statuses = []
+        for snap in _snapshots_for(ref, snapshots):
+            result = per_snapshot[snap][ref.selector]
+            statuses.append(result["matched"])
+            if result["healed"] and result["confidence"] > entry["confidence"]:
+                entry.update(healed=result["healed"], confidence=result["confidence"], snapshot=snap.name)
+        if any(statuses):
+            entry.update(status="ok", healed=None, confidence=0.0, snapshot=None)
+        elif all(status is None for status in statuses):
+            entry["status"] = "unsupported"
+        elif entry["healed"]:
+            entry["status"] = "healed"
+        entries.append(entry)
+
+    summary = {status: sum(e["status"] == status for e in entries) for status in ("ok", "healed", "broken", "unsupported")}
+    return {"snapshots": [snap.name for snap in snapshots], "summary": summary, "selectors": entries}
+
+
+def healed_map(report: Dict[str, Any]) -> Dict[str, Any]:
+    """Builds the healed-selector map the drivers load via HEALED_SELECTORS_FILE."""
+    selectors = {}
+    for entry in report["selectors"]:
+        if entry["status"] == "healed":
+            selectors[entry["selector"]] = {
+                "healed": entry["healed"],
+                "confidence": entry["confidence"],
+                "snapshot": entry["snapshot"],
+                "source": entry["source"],
+            }
+    return {"version": 1, "selectors": selectors}
+
+
+def write_json(data: Dict[str, Any], path: str) -> None:
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
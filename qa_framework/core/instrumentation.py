@@ -0,0 +1,191 @@
+"""
+Per-command latency instrumentation for the UI drivers.
+
+Enabled with INSTRUMENTATION_ENABLED. Drivers created by DriverFactory then
+have their AbstractDriver methods wrapped; when disabled nothing is wrapped
+and the drivers run unchanged.
+"""
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from qa_framework.core.config import settings
+from qa_framework.core.logger import get_logger
+
+logger = get_logger("instrumentation")
+
+# Prometheus-style upper bounds in seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+INSTRUMENTED_METHODS = (
+    "start", "quit", "reset", "goto", "get_title", "screenshot", "screenshot_bytes", "find_element", "click", "type",
+    "get_text", "get_texts", "batch", "wait_for", "save_session", "load_session",
+)
+
+HEALING_OUTCOMES = ("cache_hit", "map_hit", "healed", "failed")
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram."""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+        self.errors = 0
+
+    def observe(self, seconds: float, error: bool = False) -> None:
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+        self.max = max(self.max, seconds)
+        self.errors += error
+
+    def quantile(self, q: float) -> float:
+        """Bucket upper bound holding the q-quantile (as Prometheus' histogram_quantile, without interpolation)."""
+        if not self.count:
+            return 0.0
+        rank, seen = q * self.count, 0
+        for bound, count in zip(BUCKETS + (self.max,), self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count, "errors": self.errors, "sum_s": round(self.sum, 6), "max_s": round(self.max, 6),
+            "p50_s": self.quantile(0.5), "p95_s": self.quantile(0.95),
+            "buckets": dict(zip([str(b) for b in BUCKETS] + ["+Inf"], self.counts)),
+        }
+
+
+class Metrics:
+    """
+    Process-wide store of command latencies (overall and per test), healing
+    outcomes and time spent in explicit waits and healing.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.commands: Dict[Tuple[str, str], Histogram] = {}
+        self.tests: Dict[str, Dict[str, Histogram]] = {}
+        self.healing: Dict[str, int] = dict.fromkeys(HEALING_OUTCOMES, 0)
+        self.current_test: Optional[str] = None
+
+    def start_test(self, test_id: str) -> None:
+        self.current_test = test_id
+
+    def observe(self, driver: str, command: str, seconds: float, error: bool = False) -> None:
+        with self._lock:
+            self.commands.setdefault((driver, command), Histogram()).observe(seconds, error)
+            if self.current_test:
+                self.tests.setdefault(self.current_test, {}).setdefault(command, Histogram()).observe(seconds, error)
+
+    def record_healing(self, outcome: str, seconds: float) -> None:
+        with self._lock:
+            self.healing[outcome] = self.healing.get(outcome, 0) + 1
+        self.observe("healing", "heal", seconds, error=outcome == "failed")
+
+    def test_summary(self, test_id: str) -> Dict[str, Any]:
+        with self._lock:
+            histograms = self.tests.get(test_id, {})
+            return {command: h.to_dict() for command, h in sorted(histograms.items())}
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "commands": [{"driver": d, "command": c, **h.to_dict()} for (d, c), h in sorted(self.commands.items())],
+                "healing": dict(self.healing),
+                "wait_seconds": round(sum(h.sum for (_, c), h in self.commands.items() if c == "wait_for"), 6),
+                "tests": {t: {c: h.to_dict() for c, h in sorted(hs.items())} for t, hs in self.tests.items()},
+            }
+
+    def to_prometheus(self) -> str:
+        lines = [
+            "# HELP qa_driver_command_seconds Latency of UI driver commands.",
+            "# TYPE qa_driver_command_seconds histogram",
+        ]
+        with self._lock:
+            for (driver, command), h in sorted(self.commands.items()):
+                labels = f'driver="{driver}",command="{command}"'
+                cumulative = 0
+                for bound, count in zip([str(b) for b in BUCKETS] + ["+Inf"], h.counts):
+                    cumulative += count
+                    lines.append(f'qa_driver_command_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f"qa_driver_command_seconds_sum{{{labels}}} {h.sum}")
+                lines.append(f"qa_driver_command_seconds_count{{{labels}}} {h.count}")
+            lines += ["# HELP qa_driver_command_errors_total UI driver commands that raised.",
+                      "# TYPE qa_driver_command_errors_total counter"]
+            for (driver, command), h in sorted(self.commands.items()):
+                lines.append(f'qa_driver_command_errors_total{{driver="{driver}",command="{command}"}} {h.errors}')
+            lines += ["# HELP qa_healing_attempts_total Self-healing attempts by outcome.",
+                      "# TYPE qa_healing_attempts_total counter"]
+            for outcome, count in sorted(self.healing.items()):
+                lines.append(f'qa_healing_attempts_total{{outcome="{outcome}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def export(self, directory: Optional[str] = None) -> List[Path]:
+        """
+        Writes metrics.json and a Prometheus textfile (node_exporter textfile
+        collector format). pytest-xdist workers and qa run shards get their own files.
+        """
+        from qa_framework.core.runner.identity import worker_name
+
+        out = Path(directory or settings.METRICS_DIR)
+        out.mkdir(parents=True, exist_ok=True)
+        worker = worker_name()
+        suffix = f"-{worker}" if worker else ""
+        json_path, prom_path = out / f"metrics{suffix}.json", out / f"qa_framework{suffix}.prom"
+        json_path.write_text(json.dumps(self.to_dict(), indent=2))
+        # Textfile collectors may read at any time, so replace atomically
+        tmp = prom_path.with_suffix(".prom.tmp")
+        tmp.write_text(self.to_prometheus())
+        os.replace(tmp, prom_path)
+        logger.info(f"Metrics written to {json_path} and {prom_path}")
+        return [json_path, prom_path]
+
+    def clear(self) -> None:
+        with self._lock:
+            self.commands.clear()
+            self.tests.clear()
+            self.healing = dict.fromkeys(HEALING_OUTCOMES, 0)
+            self.current_test = None
+
+
+metrics = Metrics()
+
+
+def _timed(method, driver_name: str, command: str):
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            result = method(*args, **kwargs)
+        except BaseException:
+            metrics.observe(driver_name, command, time.perf_counter() - started, error=True)
+            raise
+        metrics.observe(driver_name, command, time.perf_counter() - started)
+        return result
+    return wrapper
+
+
+def instrument(driver):
+    """
+    Wraps the driver's AbstractDriver methods on the instance, so calls made
+    by the driver itself (click -> find_element) are measured as well.
+    """
+    if getattr(driver, "_instrumented", False):
+        return driver
+    driver_name = type(driver).__name__
+    for name in INSTRUMENTED_METHODS:
+        method = getattr(driver, name, None)
+        if callable(method):
+            setattr(driver, name, _timed(method, driver_name, name))
+    driver._instrumented = True
+    return driver
@@ -1,3 +1,4 @@
+import json
 import allure
 from qa_framework.core.drivers.abstract_driver import AbstractDriver
 
@@ -9,24 +10,38 @@ class AllureListener:
     def attach_screenshot(driver: AbstractDriver, name: str = "Screenshot"):
         """
         Attaches a screenshot to the Allure report.
+        With the framework's pytest plugin active only the capture happens here;
+        the screenshot service encodes it in the background and the plugin adds
+        it to the test after teardown.
         """
         try:
-            # We need to get the binary data
-            if hasattr(driver, 'get_driver'):
-                inner_driver = driver.get_driver()
-                # Selenium
-                if hasattr(inner_driver, 'get_screenshot_as_png'):
-                    allure.attach(
-                        inner_driver.get_screenshot_as_png(),
-                        name=name,
-                        attachment_type=allure.attachment_type.PNG
-                    )
-                # Playwright
-                elif hasattr(inner_driver, 'screenshot'):
-                    allure.attach(
-                        inner_driver.screenshot(),
-                        name=name,
-                        attachment_type=allure.attachment_type.PNG
-                    )
+            from qa_framework.core.screenshots import ScreenshotService
+            ScreenshotService.shared().attach(driver, name=name)
         except Exception as e:
             print(f"Failed to attach screenshot: {e}")
+
+    @staticmethod
+    def attach_pending():
+        """
+        Adds the screenshots captured by attach_screenshot to the current test.
+        The framework's pytest plugin does this after every teardown.
+        """
+        try:
+            from qa_framework.core.screenshots import ScreenshotService
+            ScreenshotService.shared().attach_pending()
+        except Exception as e:
+            print(f"Failed to attach screenshots: {e}")
+
+    @staticmethod
+    def attach_json(data, name: str = "Data"):
+        """
+        Attaches a JSON document (e.g. a network or metrics report) to the Allure report.
+        """
+        try:
+            allure.attach(
+                json.dumps(data, indent=2),
+                name=name,
+                attachment_type=allure.attachment_type.JSON
+            )
+        except Exception as e:
+            print(f"Failed to attach {name}: {e}")
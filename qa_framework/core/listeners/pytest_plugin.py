@@ -0,0 +1,26 @@
+"""
+pytest plugin registered by the qa-framework package (pytest11 entry point).
+
+Screenshots attached during a test (AllureListener.attach_screenshot) are
+encoded in the background while the test tears down, and added to its Allure
+result once teardown has finished, on the test's own thread.
+"""
+import pytest
+
+
+def pytest_configure(config):
+    from qa_framework.core.screenshots import ScreenshotService
+    ScreenshotService.shared().defer_attachments = True
+
+
+def pytest_unconfigure(config):
+    from qa_framework.core.screenshots import ScreenshotService
+    ScreenshotService.shared().defer_attachments = False
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    if outcome.get_result().when == "teardown":
+        from qa_framework.core.listeners.allure_listener import AllureListener
+        AllureListener.attach_pending()
@@ -0,0 +1,195 @@
+"""
+Page-load timing captured from the functional UI suite.
+
+With PAGE_TIMING_ENABLED, SeleniumDriver and PlaywrightDriver read
+Navigation Timing, paint and Web Vitals entries after every goto() and
+append them to a per-run JSONL file. compare() then flags pages whose p75
+regressed against a stored baseline:
+
+    qa-init page-timing                      # latest run vs baseline
+    qa-init page-timing --update-baseline    # accept the latest run
+"""
+import json
+import math
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import urlsplit, urlunsplit
+from qa_framework.core.config import settings
+from qa_framework.core.logger import get_logger
+
+logger = get_logger("page_timing")
+
+# Evaluated in the page after navigation; calls done(metrics) once the load
+# event has fired and the buffered paint/LCP/layout-shift entries are read.
+# Times are milliseconds from navigation start.
+TIMING_FUNCTION = r"""
+(done) => {
+    const collect = () => {
+        const nav = performance.getEntriesByType('navigation')[0];
+        const paint = {};
+        performance.getEntriesByType('paint').forEach((e) => { paint[e.name] = e.startTime; });
+        const result = {
+            url: location.href,
+            ttfb: nav ? nav.responseStart : null,
+            dom_content_loaded: nav ? nav.domContentLoadedEventEnd : null,
+            load: nav ? nav.loadEventEnd : null,
+            dns: nav ? nav.domainLookupEnd - nav.domainLookupStart : null,
+            connect: nav ? nav.connectEnd - nav.connectStart : null,
+            transfer_size: nav ? nav.transferSize : null,
+            fp: paint['first-paint'] === undefined ? null : paint['first-paint'],
+            fcp: paint['first-contentful-paint'] === undefined ? null : paint['first-contentful-paint'],
+            lcp: null,
+            cls: 0,
+        };
+        // observe({buffered: true}) fills the observer's buffer synchronously, so takeRecords() sees past entries
+        const read = (type, onEntries) => {
+            try {
+                const po = new PerformanceObserver(() => {});
+                po.observe({type: type, buffered: true});
+                onEntries(po.takeRecords());
+                po.disconnect();
+            } catch (e) {}  // entry type not supported by this browser
+        };
+        read('largest-contentful-paint', (entries) => {
+            if (entries.length) result.lcp = entries[entries.length - 1].startTime;
+        });
+        read('layout-shift', (entries) => {
+            entries.forEach((e) => { if (!e.hadRecentInput) result.cls += e.value; });
+        });
+        done(result);
+    };
+    // loadEventEnd is only set once the load handlers have returned, so read after a tick
+    if (document.readyState === 'complete') setTimeout(collect, 0);
+    else window.addEventListener('load', () => setTimeout(collect, 0), {once: true});
+}
+"""
+
+# Gated metrics and the smallest change that counts as a regression (ms, CLS is unitless)
+GATED_METRICS = {"ttfb": 50.0, "fcp": 50.0, "lcp": 50.0, "dom_content_loaded": 50.0, "load": 50.0, "cls": 0.02}
+
+_lock = threading.Lock()
+_run_id: Optional[str] = None
+
+
+def page_key(url: str) -> str:
+    """Store key for a URL: scheme, host and path (query and fragment dropped)."""
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path or "/", "", ""))
+
+
+def run_id() -> str:
+    """Shared by every worker (pytest-xdist or qa run / qa worker) of one run."""
+    from qa_framework.core.runner.identity import run_id as parallel_run_id
+
+    global _run_id
+    if _run_id is None:
+        _run_id = (settings.PAGE_TIMING_RUN_ID or parallel_run_id()
+                   or time.strftime("%Y%m%d-%H%M%S") + f"-{os.getpid()}")
+    return _run_id
+
+
+def _runs_dir(directory: Optional[str] = None) -> Path:
+    return Path(directory or settings.PAGE_TIMING_DIR) / "runs"
+
+
+def record(timing: Dict[str, Any], driver: str, directory: Optional[str] = None) -> Dict[str, Any]:
+    """Appends one navigation's metrics to this run's store."""
+    test = os.environ.get("PYTEST_CURRENT_TEST", "").rsplit(" (", 1)[0] or None
+    entry = {
+        "run": run_id(), "ts": time.time(), "url": page_key(timing.pop("url")), "test": test,
+        "driver": driver, "metrics": timing,
+    }
+    from qa_framework.core.runner.identity import worker_name
+
+    worker = worker_name()
+    path = _runs_dir(directory) / f"{run_id()}{'-' + worker if worker else ''}.jsonl"
+    with _lock:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+    return entry
+
+
+def load_run(run: Optional[str] = None, directory: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Entries of a run (every worker file), by default the most recent one."""
+    runs = _runs_dir(directory)
+    files = sorted(runs.glob("*.jsonl"), key=lambda p: p.stat().st_mtime) if runs.exists() else []
+    if not files:
+        return []
+    if run is None:
+        with open(files[-1]) as f:
+            run = json.loads(f.readline())["run"]
+    entries = []
+    for path in files:
+        if path.stem == run or re.fullmatch(rf"{re.escape(run)}-(gw|qa)\d+", path.stem):
+            with open(path) as f:
+                entries.extend(json.loads(line) for line in f if line.strip())
+    return entries
+
+
+def _p75(values: List[float]) -> float:
+    ordered = sorted(values)
+    # Nearest-rank percentile, as used for Web Vitals reporting
+    return ordered[max(math.ceil(0.75 * len(ordered)) - 1, 0)]
+
+
+def summarize(entries: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """p75 of every gated metric per page, with the sample count."""
+    samples: Dict[str, Dict[str, List[float]]] = {}
+    for entry in entries:
+        page = samples.setdefault(entry["url"], {})
+        for metric, value in entry["metrics"].items():
+            if metric in GATED_METRICS and value is not None:
+                page.setdefault(metric, []).append(value)
+    return {
+        url: {"samples": max((len(v) for v in metrics.values()), default=0),
+              **{metric: round(_p75(values), 3) for metric, values in metrics.items()}}
+        for url, metrics in samples.items()
+    }
+
+
+def compare(current: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+            threshold: Optional[float] = None) -> List[Dict[str, Any]]:
+    """
+    Pages whose p75 grew by more than threshold (a fraction) and by more than
+    the metric's noise floor. Pages missing from the baseline are skipped.
+    """
+    threshold = settings.PAGE_TIMING_THRESHOLD if threshold is None else threshold
+    regressions = []
+    for url, metrics in sorted(current.items()):
+        base = baseline.get(url)
+        if not base:
+            continue
+        for metric, floor in GATED_METRICS.items():
+            now, before = metrics.get(metric), base.get(metric)
+            if now is None or before is None:
+                continue
+            if now - before > floor and now > before * (1 + threshold):
+                regressions.append({"url": url, "metric": metric, "baseline_p75": before, "current_p75": now,
+                                    "change": round(now / before - 1, 3) if before else None})
+    return regressions
+
+
+def baseline_path(directory: Optional[str] = None) -> Path:
+    return Path(directory or settings.PAGE_TIMING_DIR) / "baseline.json"
+
+
+def load_baseline(path: Optional[Path] = None) -> Dict[str, Dict[str, Any]]:
+    path = Path(path or baseline_path())
+    if not path.exists():
+        return {}
+    with open(path) as f:
+        return json.load(f)["pages"]
+
+
+def write_baseline(summary: Dict[str, Dict[str, Any]], path: Optional[Path] = None) -> Path:
+    path = Path(path or baseline_path())
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps({"version": 1, "updated": time.time(), "pages": summary}, indent=2))
+    os.replace(tmp, path)
+    return path
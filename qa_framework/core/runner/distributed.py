@@ -0,0 +1,322 @@
+"""
+Distributed `qa run` across hosts.
+
+A coordinator collects the tests and serves them over TCP (JSON lines) to
+worker agents, which pull batches as they become free. Batches shrink as the
+queue drains (a batch is at most the remaining tests over twice the
+connected workers), so fast nodes take more work and the run ends evenly.
+Workers run each batch as a pytest process with the project's own conftest
+and DriverFactory, stream every test result back as it finishes, then send
+the batch's Allure result files, which the coordinator writes into one
+results directory.
+
+A worker that disconnects or goes quiet for DIST_HEARTBEAT_TIMEOUT has its
+unfinished tests put back at the front of the queue; a test that has been
+handed out DIST_MAX_ATTEMPTS times without a result is reported as an error.
+Every node must have the same checkout of the project.
+
+    qa coordinator --port 7800 tests/ui          # on the coordinator
+    qa worker coordinator-host:7800 --processes 4  # on each runner node
+"""
+import base64
+import json
+import math
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from qa_framework.core.config import settings
+from qa_framework.core.logger import get_logger
+from qa_framework.core.runner import identity, shards as sharding
+from qa_framework.core.runner.parallel import PLUGIN
+
+logger = get_logger("distributed")
+
+# Seconds between worker heartbeats while a batch runs
+HEARTBEAT_INTERVAL = 5.0
+
+
+def _send(sock: socket.socket, lock: threading.Lock, message: Dict[str, Any]) -> None:
+    data = (json.dumps(message) + "\n").encode()
+    with lock:
+        sock.sendall(data)
+
+
+class Coordinator:
+    """Hands out test batches to connected workers and gathers their results."""
+
+    def __init__(self,
+                 tests: Sequence[str],
+                 pytest_args: Sequence[str] = (),
+                 host: Optional[str] = None,
+                 port: Optional[int] = None,
+                 batch_size: Optional[int] = None,
+                 alluredir: str = "reports/allure-results",
+                 durations_file: Optional[str] = None,
+                 heartbeat_timeout: Optional[float] = None,
+                 max_attempts: Optional[int] = None):
+        self.pytest_args = list(pytest_args)
+        self.batch_size = batch_size or settings.DIST_BATCH_SIZE
+        self.alluredir = Path(alluredir)
+        self.durations_file = durations_file
+        self.heartbeat_timeout = heartbeat_timeout or settings.DIST_HEARTBEAT_TIMEOUT
+        self.max_attempts = max_attempts or settings.DIST_MAX_ATTEMPTS
+        self.run_id = time.strftime("%Y%m%d-%H%M%S") + f"-{os.getpid()}"
+        durations = sharding.load_durations(durations_file)
+        fallback = sharding.DEFAULT_DURATION
+        # Longest first, so long tests do not start last on a single node
+        self.tests = list(dict.fromkeys(tests))
+        self._queue = deque(sorted(self.tests, key=lambda t: -durations.get(t, fallback)))
+        self._cond = threading.Condition()
+        self._assigned: Dict[str, set] = {}
+        self._attempts: Dict[str, int] = {}
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self.workers: Dict[str, Dict[str, Any]] = {}
+        self.requeued = 0
+        self._closed = False
+        self._server = socket.create_server((host if host is not None else settings.DIST_HOST,
+                                             port if port is not None else settings.DIST_PORT))
+        self.address: Tuple[str, int] = self._server.getsockname()[:2]
+
+    # Scheduling
+
+    def _done(self) -> bool:
+        return len(self.results) >= len(self.tests)
+
+    def _next_batch(self, worker: str) -> Optional[List[str]]:
+        """Blocks until tests are available; None once every test has a result."""
+        with self._cond:
+            while not self._queue and not self._done() and not self._closed:
+                self._cond.wait(1.0)
+            if not self._queue:
+                return None
+            active = max(1, sum(1 for w in self.workers.values() if w["connected"]))
+            size = max(1, min(self.batch_size, math.ceil(len(self._queue) / (2 * active))))
+            batch = [self._queue.popleft() for _ in range(min(size, len(self._queue)))]
+            for test in batch:
+                self._attempts[test] = self._attempts.get(test, 0) + 1
+            self._assigned[worker] |= set(batch)
+            self.workers[worker]["batches"] += 1
+            return batch
+
+    def _record(self, worker: str, message: Dict[str, Any]) -> None:
+        with self._cond:
+            nodeid = message["nodeid"]
+            if nodeid not in self._assigned.get(worker, ()):
+                return  # e.g. a late result for a test already handed to another worker
+            self._assigned[worker].discard(nodeid)
+            self.results[nodeid] = {"outcome": message["outcome"], "duration": message["duration"], "worker": worker}
+            self.workers[worker]["tests"] += 1
+            self._cond.notify_all()
+
+    def _requeue(self, worker: str, reason: str) -> None:
+        """Puts a worker's unfinished tests back at the front of the queue."""
+        with self._cond:
+            unfinished = sorted(self._assigned.get(worker, ()))
+            self._assigned[worker] = set()
+            for test in unfinished:
+                if self._attempts[test] >= self.max_attempts:
+                    self.results[test] = {"outcome": "error", "duration": 0.0, "worker": worker,
+                                          "message": f"No result after {self._attempts[test]} attempts ({reason})"}
+                else:
+                    self._queue.appendleft(test)
+                    self.requeued += 1
+            if unfinished:
+                logger.warning(f"Rescheduling {len(unfinished)} tests from {worker}", reason=reason)
+            self._cond.notify_all()
+
+    # Connections
+
+    def start(self) -> "Coordinator":
+        threading.Thread(target=self._accept, name="qa-coordinator", daemon=True).start()
+        logger.info(f"Coordinator listening on {self.address[0]}:{self.address[1]}", tests=len(self.tests))
+        return self
+
+    def _accept(self) -> None:
+        while not self._closed:
+            try:
+                conn, peer = self._server.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._serve, args=(conn, peer), daemon=True).start()
+
+    def _serve(self, conn: socket.socket, peer: Tuple[str, int]) -> None:
+        conn.settimeout(self.heartbeat_timeout)
+        lock, worker, reason = threading.Lock(), None, "disconnected"
+        try:
+            for line in conn.makefile("rb"):
+                message = json.loads(line)
+                kind = message["type"]
+                if kind == "hello":
+                    with self._cond:
+                        index = len(self.workers)
+                        worker = f"{message.get('name') or peer[0]}-{index}"
+                        self.workers[worker] = {"host": peer[0], "connected": True, "batches": 0, "tests": 0}
+                        self._assigned[worker] = set()
+                    _send(conn, lock, {"type": "welcome", "worker": worker, "index": index,
+                                       "run": self.run_id, "pytest_args": self.pytest_args})
+                elif kind == "request":
+                    batch = self._next_batch(worker)
+                    _send(conn, lock, {"type": "batch", "tests": batch} if batch else {"type": "done"})
+                elif kind == "result":
+                    self._record(worker, message)
+                elif kind == "artifact":
+                    self._write_artifact(message["name"], base64.b64decode(message["data"]))
+                elif kind == "batch_done":
+                    self._requeue(worker, "batch ended without reporting them")
+        except socket.timeout:
+            reason = f"no heartbeat for {self.heartbeat_timeout}s"
+        except (OSError, ValueError, KeyError) as e:
+            reason = f"connection error: {e}"
+        finally:
+            conn.close()
+            if worker:
+                with self._cond:
+                    self.workers[worker]["connected"] = False
+                self._requeue(worker, reason)
+                logger.info(f"Worker {worker} left", reason=reason)
+
+    def _write_artifact(self, name: str, data: bytes) -> None:
+        path = self.alluredir / Path(name).name  # never outside the results directory
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+    # Lifecycle
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Waits until every test has a result. Returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while not self._done():
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining if remaining is not None else 1.0)
+        return True
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._server.close()
+
+    def summary(self) -> Dict[str, Any]:
+        """Results, per-worker stats and the pytest-style exit code; stores the measured durations."""
+        durations = {t: r["duration"] for t, r in self.results.items() if "message" not in r}
+        if durations:
+            sharding.update_durations(durations, self.durations_file)
+        outcomes = [r["outcome"] for r in self.results.values()]
+        exit_code = 1 if any(o in ("failed", "error") for o in outcomes) or not self._done() else 0
+        return {"run": self.run_id, "results": self.results, "workers": self.workers,
+                "requeued": self.requeued, "exit_code": exit_code}
+
+
+class Worker:
+    """Runner agent: pulls batches from a coordinator and runs them with pytest."""
+
+    def __init__(self, address: Tuple[str, int], name: Optional[str] = None, workdir: Optional[str] = None,
+                 slot: Optional[Tuple[int, int]] = None):
+        self.address = address
+        self.name = name or socket.gethostname()
+        self.workdir = workdir
+        # (index, count) among the worker processes of this host, which split its devices
+        self.slot = slot
+        self.tests_run = 0
+
+    def run(self) -> int:
+        """Works until the coordinator has no tests left. Returns the number of tests run."""
+        sock = socket.create_connection(self.address)
+        lock = threading.Lock()
+        reader = sock.makefile("rb")
+        try:
+            _send(sock, lock, {"type": "hello", "name": self.name})
+            welcome = json.loads(reader.readline())
+            logger.info(f"Connected to coordinator as {welcome['worker']}", run=welcome["run"])
+            while True:
+                _send(sock, lock, {"type": "request"})
+                line = reader.readline()
+                if not line:
+                    break
+                message = json.loads(line)
+                if message["type"] != "batch":
+                    break
+                self._run_batch(message["tests"], welcome, sock, lock)
+        except OSError as e:
+            logger.warning("Lost connection to the coordinator", error=str(e))
+        finally:
+            reader.close()
+            sock.close()
+        return self.tests_run
+
+    def _run_batch(self, tests: List[str], welcome: Dict[str, Any], sock: socket.socket, lock: threading.Lock) -> None:
+        with tempfile.TemporaryDirectory(prefix="qa-worker-", dir=self.workdir) as tmp:
+            work = Path(tmp)
+            (work / "tests.txt").write_text("\n".join(tests) + "\n")
+            results, allure = work / "results.jsonl", work / "allure"
+            env = dict(os.environ,
+                       QA_SHARD_TESTS=str(work / "tests.txt"),
+                       QA_SHARD_RESULTS=str(results))
+            env.update({identity.WORKER_INDEX: str(welcome["index"]), identity.RUN_ID: welcome["run"]})
+            # Workers join and leave during the run, so only the processes of this host split its devices
+            env.pop(identity.WORKER_COUNT, None)
+            if self.slot is not None:
+                env.update({identity.HOST_WORKER_INDEX: str(self.slot[0]), identity.HOST_WORKER_COUNT: str(self.slot[1])})
+            command = [sys.executable, "-m", "pytest", "-p", PLUGIN, f"--alluredir={allure}", *welcome["pytest_args"]]
+            with open(work / "pytest.log", "w") as log:
+                process = subprocess.Popen(command, stdout=log, stderr=subprocess.STDOUT, env=env)
+
+            sent, last_heartbeat = 0, time.monotonic()
+            try:
+                while True:
+                    running = process.poll() is None
+                    sent += self._stream_results(results, sent, sock, lock)
+                    if not running:
+                        break
+                    if time.monotonic() - last_heartbeat >= HEARTBEAT_INTERVAL:
+                        _send(sock, lock, {"type": "heartbeat"})
+                        last_heartbeat = time.monotonic()
+                    time.sleep(0.2)
+            finally:
+                if process.poll() is None:  # the coordinator went away
+                    process.kill()
+                    process.wait()
+            self.tests_run += sent
+            if sent < len(tests):
+                tail = (work / "pytest.log").read_text(errors="replace")[-2000:]
+                logger.warning(f"pytest reported {sent} of {len(tests)} tests", exit_code=process.returncode, output=tail)
+
+            if allure.is_dir():
+                for path in sorted(allure.iterdir()):
+                    _send(sock, lock, {"type": "artifact", "name": path.name,
+                                       "data": base64.b64encode(path.read_bytes()).decode()})
+            _send(sock, lock, {"type": "batch_done"})
+
+    @staticmethod
+    def _stream_results(results: Path, already_sent: int, sock: socket.socket, lock: threading.Lock) -> int:
+        """Sends result lines written since the last call; returns how many were sent."""
+        if not results.exists():
+            return 0
+        # Only newline-terminated lines; the last one may still be being written
+        complete = results.read_text().split("\n")[:-1][already_sent:]
+        for line in complete:
+            _send(sock, lock, {"type": "result", **json.loads(line)})
+        return len(complete)
+
+
+def serve_workers(address: Tuple[str, int], processes: int = 1, name: Optional[str] = None) -> int:
+    """Runs several worker connections from this host (one pytest process each). Returns tests run."""
+    workers = [Worker(address, name=name, slot=(i, processes)) for i in range(processes)]
+    threads = [threading.Thread(target=w.run, name=f"qa-worker-{i}") for i, w in enumerate(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sum(w.tests_run for w in workers)
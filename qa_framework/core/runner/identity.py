@@ -0,0 +1,61 @@
+"""
+Which worker of a parallel run this process is.
+
+`qa run` shards and `qa worker` batches export QA_WORKER_INDEX, QA_WORKER_COUNT
+(shards only; distributed workers join and leave freely) and QA_RUN_ID.
+pytest-xdist workers are recognised by their own PYTEST_XDIST_* variables,
+which take precedence since they name the innermost process.
+
+`qa worker --processes N` also exports QA_HOST_WORKER_INDEX / QA_HOST_WORKER_COUNT:
+the process's slot on its host, which is what local devices are split by.
+"""
+import os
+from typing import Optional, Tuple
+
+WORKER_INDEX = "QA_WORKER_INDEX"
+WORKER_COUNT = "QA_WORKER_COUNT"
+RUN_ID = "QA_RUN_ID"
+HOST_WORKER_INDEX = "QA_HOST_WORKER_INDEX"
+HOST_WORKER_COUNT = "QA_HOST_WORKER_COUNT"
+
+
+def worker_index() -> Optional[int]:
+    """0-based index of this worker, None outside a parallel run."""
+    xdist = os.environ.get("PYTEST_XDIST_WORKER")
+    if xdist:
+        return int(xdist.lstrip("gw") or 0)
+    index = os.environ.get(WORKER_INDEX)
+    return int(index) if index else None
+
+
+def worker_count() -> Optional[int]:
+    """Number of workers sharing the run, None when unknown."""
+    if os.environ.get("PYTEST_XDIST_WORKER"):
+        count = os.environ.get("PYTEST_XDIST_WORKER_COUNT")
+    else:
+        count = os.environ.get(WORKER_COUNT) if os.environ.get(WORKER_INDEX) else None
+    return int(count) if count else None
+
+
+def worker_name() -> Optional[str]:
+    """Label used in per-worker file names: gwN for xdist, qaN for qa run / qa worker."""
+    xdist = os.environ.get("PYTEST_XDIST_WORKER")
+    if xdist:
+        return xdist
+    index = os.environ.get(WORKER_INDEX)
+    return f"qa{index}" if index else None
+
+
+def run_id() -> Optional[str]:
+    """Id shared by every worker of one run, None outside a parallel run."""
+    return os.environ.get("PYTEST_XDIST_TESTRUNUID") or os.environ.get(RUN_ID)
+
+
+def host_slot() -> Tuple[Optional[int], Optional[int]]:
+    """
+    (index, count) of this process among the workers sharing the host's
+    devices: the xdist / qa run worker, or the local slot of a `qa worker`.
+    """
+    if not os.environ.get("PYTEST_XDIST_WORKER") and os.environ.get(HOST_WORKER_INDEX):
+        return int(os.environ[HOST_WORKER_INDEX]), int(os.environ.get(HOST_WORKER_COUNT) or 1)
+    return worker_index(), worker_count()
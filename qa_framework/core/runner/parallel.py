@@ -0,0 +1,136 @@
+"""
+`qa run`: runs the collected tests in N pytest processes, each with its own
+driver, balanced by the durations of previous runs (see shards.py).
+
+Every shard writes Allure results to its own directory; they are merged into
+the final results directory at the end, and the measured durations are folded
+back into RUNNER_DURATIONS_FILE for the next plan.
+
+Shards get QA_WORKER_INDEX, QA_WORKER_COUNT and QA_RUN_ID (see identity.py),
+so device pools, metrics and page timing split their resources and files per shard.
+"""
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+from qa_framework.core.config import settings
+from qa_framework.core.logger import get_logger
+from qa_framework.core.runner import identity, shards as sharding
+
+logger = get_logger("runner")
+
+PLUGIN = "qa_framework.core.runner.plugin"
+# pytest exit code when a shard ran no tests (e.g. all deselected by -k)
+NO_TESTS_COLLECTED = 5
+
+
+@dataclass
+class ShardResult:
+    index: int
+    tests: int
+    expected: float
+    elapsed: float
+    exit_code: int
+    log: Path
+
+
+def collect(pytest_args: Sequence[str]) -> List[str]:
+    """Node ids pytest collects for these arguments."""
+    result = subprocess.run([sys.executable, "-m", "pytest", "--collect-only", "-q", *pytest_args],
+                            capture_output=True, text=True)
+    if result.returncode not in (0, NO_TESTS_COLLECTED):
+        raise RuntimeError(f"Test collection failed:\n{result.stdout[-4000:]}{result.stderr[-2000:]}")
+    return [line.strip() for line in result.stdout.splitlines() if "::" in line and not line.startswith(" ")]
+
+
+def merge_allure(sources: Sequence[Path], target: Path) -> int:
+    """Copies shard results into one directory. Result files are uuid-named, so they never collide."""
+    target.mkdir(parents=True, exist_ok=True)
+    copied = 0
+    for source in sources:
+        if not source.is_dir():
+            continue
+        for path in source.iterdir():
+            shutil.copy2(path, target / path.name)
+            copied += 1
+    return copied
+
+
+def _exit_code(codes: Sequence[int]) -> int:
+    failed = [code for code in codes if code not in (0, NO_TESTS_COLLECTED)]
+    if failed:
+        return max(failed)
+    return 0 if 0 in codes else NO_TESTS_COLLECTED
+
+
+def run(pytest_args: Sequence[str] = (),
+        workers: Optional[int] = None,
+        alluredir: str = "reports/allure-results",
+        durations_file: Optional[str] = None,
+        workdir: Optional[str] = None,
+        only: Optional[Sequence[str]] = None) -> Dict:
+    """
+    Plans, runs and merges the shards. Returns the plan, shard results and
+    overall exit code. `only` restricts the run to these node ids (file::test,
+    matching every parametrization).
+    """
+    workers = workers or settings.RUNNER_WORKERS or os.cpu_count() or 1
+    tests = collect(pytest_args)
+    if only is not None:
+        wanted = set(only)
+        tests = [t for t in tests if t.split("[", 1)[0] in wanted]
+    if not tests:
+        logger.warning("No tests collected", args=list(pytest_args))
+        return {"shards": [], "exit_code": NO_TESTS_COLLECTED}
+
+    plan = sharding.plan(tests, workers, sharding.load_durations(durations_file))
+    run_id = time.strftime("%Y%m%d-%H%M%S") + f"-{os.getpid()}"
+    work = Path(workdir or ".qa_cache/run") / run_id
+    work.mkdir(parents=True, exist_ok=True)
+
+    processes = []
+    for shard in plan:
+        tests_file = work / f"shard-{shard.index}.txt"
+        tests_file.write_text("\n".join(shard.tests) + "\n")
+        env = dict(os.environ,
+                   QA_SHARD_TESTS=str(tests_file),
+                   QA_SHARD_DURATIONS=str(work / f"shard-{shard.index}.json"))
+        env.update({identity.WORKER_INDEX: str(shard.index), identity.WORKER_COUNT: str(len(plan)),
+                    identity.RUN_ID: run_id})
+        command = [sys.executable, "-m", "pytest", "-p", PLUGIN, f"--alluredir={work / f'allure-{shard.index}'}",
+                   *pytest_args]
+        log = work / f"shard-{shard.index}.log"
+        logger.info(f"Starting shard {shard.index}", tests=len(shard.tests), expected=round(shard.expected, 1))
+        with open(log, "w") as out:
+            process = subprocess.Popen(command, stdout=out, stderr=subprocess.STDOUT, env=env)
+        processes.append((shard, process, time.monotonic(), log))
+
+    results, measured = [], {}
+    pending = list(processes)
+    while pending:
+        for entry in list(pending):
+            shard, process, started, log = entry
+            code = process.poll()
+            if code is None:
+                continue
+            pending.remove(entry)
+            results.append(ShardResult(shard.index, len(shard.tests), shard.expected, time.monotonic() - started, code, log))
+        if pending:
+            time.sleep(0.1)
+    results.sort(key=lambda r: r.index)
+
+    for shard in plan:
+        durations = work / f"shard-{shard.index}.json"
+        if durations.exists():
+            measured.update(json.loads(durations.read_text()))
+
+    if measured:
+        sharding.update_durations(measured, durations_file)
+    merged = merge_allure([work / f"allure-{shard.index}" for shard in plan], Path(alluredir))
+    logger.info(f"Merged {merged} Allure result files into {alluredir}")
+    return {"run": run_id, "workdir": work, "shards": results, "exit_code": _exit_code([r.exit_code for r in results])}
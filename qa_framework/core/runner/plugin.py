@@ -0,0 +1,52 @@
+"""
+pytest plugin loaded into each `qa run` shard (-p qa_framework.core.runner.plugin).
+
+QA_SHARD_TESTS names a file with the node ids this shard runs, one per line;
+everything else collected is deselected. The setup + call + teardown time of
+every test is written as JSON to QA_SHARD_DURATIONS at the end of the session.
+With QA_SHARD_RESULTS each test's outcome is appended there as a JSON line
+as soon as its teardown finishes (distributed workers stream these back).
+"""
+import json
+import os
+from pathlib import Path
+from typing import Dict
+
+_durations: Dict[str, float] = {}
+_outcomes: Dict[str, str] = {}
+
+
+def pytest_collection_modifyitems(session, config, items):
+    tests_file = os.environ.get("QA_SHARD_TESTS")
+    if not tests_file:
+        return
+    wanted = set(Path(tests_file).read_text().splitlines())
+    selected = [item for item in items if item.nodeid in wanted]
+    deselected = [item for item in items if item.nodeid not in wanted]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+
+
+def _outcome(report) -> str:
+    if report.failed:
+        return "failed" if report.when == "call" else "error"
+    return "skipped" if report.skipped else "passed"
+
+
+def pytest_runtest_logreport(report):
+    _durations[report.nodeid] = _durations.get(report.nodeid, 0.0) + report.duration
+    outcome = _outcome(report)
+    if report.when == "setup" or _outcomes.get(report.nodeid) == "passed" or outcome == "error":
+        _outcomes[report.nodeid] = outcome
+    out = os.environ.get("QA_SHARD_RESULTS")
+    if out and report.when == "teardown":
+        with open(out, "a") as f:
+            f.write(json.dumps({"nodeid": report.nodeid, "outcome": _outcomes.pop(report.nodeid),
+                                "duration": _durations[report.nodeid]}) + "\n")
+
+
+def pytest_sessionfinish(session, exitstatus):
+    out = os.environ.get("QA_SHARD_DURATIONS")
+    if out and _durations:
+        Path(out).write_text(json.dumps(_durations))
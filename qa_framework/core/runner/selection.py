@@ -0,0 +1,407 @@
+"""
+Change-based test selection.
+
+Every Python file of the project is summarized from its AST: imports
+(including lazy ones inside functions), the names each test, fixture and
+module-level block references, its fixture definitions and the data file
+paths it mentions. Resolving those gives each test the set of files it
+depends on: its own file, the conftest.py files above it, the fixtures it
+requests (transitively, with pytest's nearest-conftest lookup), the page
+objects / framework modules it references (transitively through their
+imports) and data files. Tests whose set intersects the git diff are
+selected.
+
+Summaries are cached in SELECTION_CACHE_FILE and only files whose content
+changed are parsed again.
+
+    qa select --base origin/main
+    qa run --changed-since origin/main
+"""
+import ast
+import hashlib
+import json
+import os
+import subprocess
+import time
+from pathlib import Path, PurePosixPath
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from qa_framework.core.config import settings
+from qa_framework.core.logger import get_logger
+
+logger = get_logger("selection")
+
+CACHE_VERSION = 1
+SKIP_DIRS = {".git", ".hg", ".venv", "venv", "env", "node_modules", "__pycache__", ".qa_cache", ".pytest_cache",
+             ".tox", ".mypy_cache", "build", "dist", "reports", "site-packages"}
+DATA_SUFFIXES = (".json", ".csv", ".yaml", ".yml", ".xlsx", ".xml", ".txt", ".html", ".feature", ".robot", ".har")
+# A change to one of these can affect any test, so everything is selected
+RUN_ALL_FILES = {"pytest.ini", "pyproject.toml", "setup.cfg", "setup.py", "tox.ini", "requirements.txt", ".env"}
+
+
+def _is_test_file(name: str) -> bool:
+    return (name.startswith("test_") or name.endswith("_test.py")) and name.endswith(".py")
+
+
+def _is_fixture(node: ast.AST) -> Tuple[bool, bool]:
+    """(is a pytest fixture, is autouse) for a function definition."""
+    for decorator in getattr(node, "decorator_list", []):
+        call = decorator if isinstance(decorator, ast.Call) else None
+        target = call.func if call else decorator
+        name = target.attr if isinstance(target, ast.Attribute) else getattr(target, "id", "")
+        if name == "fixture":
+            autouse = any(k.arg == "autouse" and isinstance(k.value, ast.Constant) and k.value.value is True
+                          for k in (call.keywords if call else []))
+            return True, autouse
+    return False, False
+
+
+def _args(node: ast.AST) -> List[str]:
+    args = node.args
+    return [a.arg for a in args.posonlyargs + args.args + args.kwonlyargs if a.arg not in ("self", "cls")]
+
+
+def _scope(nodes: Iterable[ast.AST]) -> Dict[str, List[str]]:
+    """Names referenced and data paths mentioned by some AST nodes."""
+    names, data = set(), set()
+    for root in nodes:
+        for node in ast.walk(root):
+            if isinstance(node, ast.Name):
+                names.add(node.id)
+            elif isinstance(node, ast.Constant) and isinstance(node.value, str) and node.value.endswith(DATA_SUFFIXES) \
+                    and len(node.value) < 256 and "\n" not in node.value:
+                data.add(node.value)
+    return {"names": sorted(names), "data": sorted(data)}
+
+
+def _imports(tree: ast.AST, relpath: str) -> Dict[str, List[str]]:
+    """
+    Local name -> import targets. Absolute targets are dotted names; relative
+    ones are resolved to a path form starting with '/' (from the project root).
+    """
+    imports: Dict[str, Set[str]] = {}
+    package = list(PurePosixPath(relpath).parent.parts)
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                local = alias.asname or alias.name.split(".")[0]
+                imports.setdefault(local, set()).add(alias.name)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                base = package[:len(package) - (node.level - 1)] if node.level > 1 else package
+                prefix = "/" + "/".join(base + (node.module.split(".") if node.module else []))
+                join = "/"
+            else:
+                prefix, join = node.module or "", "."
+            for alias in node.names:
+                if alias.name == "*":
+                    imports.setdefault("*", set()).add(prefix)
+                    continue
+                imports.setdefault(alias.asname or alias.name, set()).add(f"{prefix}{join}{alias.name}".replace("//", "/"))
+    return {local: sorted(targets) for local, targets in imports.items()}
+
+
+def summarize(source: str, relpath: str) -> Dict[str, Any]:
+    """AST summary of one file (what the cache stores)."""
+    tree = ast.parse(source, filename=relpath)
+    summary: Dict[str, Any] = {"imports": _imports(tree, relpath), "fixtures": {}, "tests": {}, "classes": {}}
+    name = PurePosixPath(relpath).name
+    if not (_is_test_file(name) or name == "conftest.py"):
+        summary["module"] = _scope([tree])
+        return summary
+
+    module_nodes = []
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            fixture, autouse = _is_fixture(node)
+            if fixture:
+                summary["fixtures"][node.name] = {**_scope([node]), "args": _args(node), "autouse": autouse}
+            elif node.name.startswith("test") and name != "conftest.py":
+                summary["tests"][node.name] = {**_scope([node]), "args": _args(node)}
+            else:
+                module_nodes.append(node)
+        elif isinstance(node, ast.ClassDef) and node.name.startswith("Test"):
+            class_nodes, class_args = list(node.bases) + list(node.decorator_list), []
+            for member in node.body:
+                if isinstance(member, (ast.FunctionDef, ast.AsyncFunctionDef)) and member.name.startswith("test"):
+                    summary["tests"][f"{node.name}::{member.name}"] = {**_scope([member]), "args": _args(member)}
+                else:
+                    class_nodes.append(member)
+                    if _is_fixture(member)[0]:
+                        class_args.extend(_args(member))
+            summary["classes"][node.name] = {**_scope(class_nodes), "args": sorted(set(class_args))}
+        else:
+            module_nodes.append(node)
+    summary["module"] = _scope(module_nodes)
+    return summary
+
+
+class DependencyMap:
+    """Per-file AST summaries of a project, cached and refreshed incrementally."""
+
+    def __init__(self, root: str = ".", cache_path: Optional[str] = None):
+        self.root = Path(root).resolve()
+        self.cache_path = Path(cache_path or settings.SELECTION_CACHE_FILE)
+        if not self.cache_path.is_absolute():
+            self.cache_path = self.root / self.cache_path
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.data_files: Set[str] = set()
+        self.parsed = 0
+        self._module_index: Dict[str, List[str]] = {}
+        self._closures: Dict[str, Set[str]] = {}
+
+    def _walk(self) -> Tuple[List[str], List[str]]:
+        python, data = [], []
+        for directory, dirs, names in os.walk(self.root):
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS and not d.endswith(".egg-info")]
+            rel = Path(directory).relative_to(self.root)
+            for name in names:
+                path = (rel / name).as_posix()
+                if name.endswith(".py"):
+                    python.append(path)
+                elif name.endswith(DATA_SUFFIXES):
+                    data.append(path)
+        return python, data
+
+    def _load_cache(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            cache = json.loads(self.cache_path.read_text())
+            return cache["files"] if cache.get("version") == CACHE_VERSION else {}
+        except (OSError, ValueError, KeyError):
+            return {}
+
+    def refresh(self) -> "DependencyMap":
+        """Scans the project; only files whose content changed since the cached run are parsed."""
+        cached, python, data = self._load_cache(), *self._walk()
+        self.data_files = set(data)
+        files, dirty = {}, len(cached) != len(python)
+        for relpath in python:
+            path = self.root / relpath
+            stat = path.stat()
+            entry = cached.get(relpath)
+            if entry and entry["mtime"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                files[relpath] = entry
+                continue
+            raw = path.read_bytes()
+            sha = hashlib.sha1(raw).hexdigest()
+            dirty = True
+            if entry and entry["sha"] == sha:
+                files[relpath] = {**entry, "mtime": stat.st_mtime_ns, "size": stat.st_size}
+                continue
+            try:
+                summary = summarize(raw.decode("utf-8", "replace"), relpath)
+            except SyntaxError as e:
+                logger.warning(f"Cannot parse {relpath}; tests depending on it are selected on any change", error=str(e))
+                summary = {"imports": {}, "fixtures": {}, "tests": {}, "classes": {}, "module": {"names": [], "data": []}}
+            self.parsed += 1
+            files[relpath] = {"mtime": stat.st_mtime_ns, "size": stat.st_size, "sha": sha, "summary": summary}
+        self.files = files
+        self._index(self.files)
+        if dirty:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_path.with_suffix(".tmp")
+            tmp.write_text(json.dumps({"version": CACHE_VERSION, "updated": time.time(), "files": files}))
+            os.replace(tmp, self.cache_path)
+        return self
+
+    def _index(self, paths: Iterable[str]) -> None:
+        """Dotted-name suffixes -> files, so imports resolve whatever directory is on sys.path."""
+        self._module_index.clear()
+        self._closures.clear()
+        for relpath in paths:
+            parts = list(PurePosixPath(relpath).with_suffix("").parts)
+            if parts[-1] == "__init__":
+                parts = parts[:-1]
+            for start in range(len(parts)):
+                self._module_index.setdefault(".".join(parts[start:]), []).append(relpath)
+
+    # Resolution
+
+    def _nearest(self, candidates: List[str], importer: str) -> str:
+        importer_parts = PurePosixPath(importer).parts
+
+        def shared(path: str) -> int:
+            count = 0
+            for a, b in zip(PurePosixPath(path).parts, importer_parts):
+                if a != b:
+                    break
+                count += 1
+            return count
+        return max(candidates, key=lambda p: (shared(p), -len(p)))
+
+    def _packages(self, relpath: str) -> Set[str]:
+        """__init__.py files executed when a module is imported."""
+        found, parent = set(), PurePosixPath(relpath).parent
+        while parent.parts:
+            init = (parent / "__init__.py").as_posix()
+            if init in self._module_index.get(".".join(parent.parts), []):
+                found.add(init)
+            parent = parent.parent
+        return found
+
+    def _resolve_target(self, target: str, importer: str) -> Set[str]:
+        if target.startswith("/"):
+            parts = target.strip("/").split("/")
+            for end in range(len(parts), 0, -1):
+                for candidate in ("/".join(parts[:end]) + ".py", "/".join(parts[:end] + ["__init__.py"])):
+                    if candidate in self.files or candidate in self._module_index.get(".".join(parts[:end]), []):
+                        return {candidate} | self._packages(candidate)
+            return set()
+        parts = target.split(".")
+        for end in range(len(parts), 0, -1):
+            candidates = self._module_index.get(".".join(parts[:end]))
+            if candidates:
+                module = self._nearest(candidates, importer)
+                return {module} | self._packages(module)
+        return set()
+
+    def _resolve_names(self, relpath: str, names: Iterable[str]) -> Set[str]:
+        imports = self.files[relpath]["summary"]["imports"] if relpath in self.files else {}
+        found = set()
+        for name in list(names) + ["*"]:
+            for target in imports.get(name, ()):
+                found |= self._resolve_target(target, relpath)
+        return found
+
+    def _resolve_data(self, relpath: str, values: Iterable[str]) -> Set[str]:
+        found = set()
+        for value in values:
+            value = value.replace("\\", "/")
+            local = os.path.normpath(os.path.join(str(PurePosixPath(relpath).parent), value)).replace(os.sep, "/")
+            if local in self.data_files:
+                found.add(local)
+            elif value.lstrip("./") in self.data_files:
+                found.add(value.lstrip("./"))
+            else:
+                matches = [p for p in self.data_files if p.endswith("/" + value.lstrip("./"))]
+                if matches:
+                    found.add(self._nearest(matches, relpath))
+        return found
+
+    def _closure(self, relpath: str) -> Set[str]:
+        """A module and every project file it imports, transitively (lazy imports included)."""
+        if relpath in self._closures:
+            return self._closures[relpath]
+        seen, stack = set(), [relpath]
+        while stack:
+            current = stack.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+            if current in self._closures:
+                seen |= self._closures[current]
+                continue
+            entry = self.files.get(current)
+            if entry is None:
+                continue
+            summary = entry["summary"]
+            for targets in summary["imports"].values():
+                for target in targets:
+                    stack.extend(self._resolve_target(target, current) - seen)
+            seen |= self._resolve_data(current, summary["module"]["data"])
+        self._closures[relpath] = seen
+        return seen
+
+    def _scope_deps(self, relpath: str, scope: Dict[str, Any]) -> Set[str]:
+        deps = self._resolve_data(relpath, scope.get("data", ()))
+        for module in self._resolve_names(relpath, scope.get("names", ())):
+            deps |= self._closure(module)
+        return deps
+
+    def _conftests(self, relpath: str) -> List[str]:
+        """conftest.py files applying to a file, nearest first."""
+        found, parent = [], PurePosixPath(relpath).parent
+        while True:
+            conftest = (parent / "conftest.py").as_posix() if parent.parts else "conftest.py"
+            if conftest in self.files:
+                found.append(conftest)
+            if not parent.parts:
+                return found
+            parent = parent.parent
+
+    def _find_fixture(self, name: str, relpath: str, skip: Set[Tuple[str, str]]) -> Optional[Tuple[str, str]]:
+        for candidate in [relpath] + self._conftests(relpath):
+            if (candidate, name) not in skip and name in self.files.get(candidate, {}).get("summary", {}).get("fixtures", {}):
+                return candidate, name
+        return None
+
+    def _fixture_deps(self, requested: Iterable[str], relpath: str) -> Set[str]:
+        deps: Set[str] = set()
+        seen: Set[Tuple[str, str]] = set()
+        autouse = [(conftest, name) for conftest in [relpath] + self._conftests(relpath)
+                   for name, f in self.files[conftest]["summary"]["fixtures"].items() if f["autouse"]]
+        stack = [(name, relpath) for name in requested] + [(name, where) for where, name in autouse]
+        while stack:
+            name, where = stack.pop()
+            found = self._find_fixture(name, where, seen) if (where, name) not in autouse else (where, name)
+            if found is None or found in seen:
+                continue
+            seen.add(found)
+            fixture_file, fixture_name = found
+            fixture = self.files[fixture_file]["summary"]["fixtures"][fixture_name]
+            deps |= {fixture_file} | self._scope_deps(fixture_file, fixture)
+            # A fixture requesting its own name gets the one from a conftest further up
+            stack.extend((arg, fixture_file) for arg in fixture["args"])
+        return deps
+
+    def tests(self) -> Dict[str, Set[str]]:
+        """Test node id (file::[Class::]function) -> files it depends on."""
+        mapping = {}
+        for relpath, entry in self.files.items():
+            summary = entry["summary"]
+            if not summary["tests"]:
+                continue
+            file_deps = {relpath} | self._scope_deps(relpath, summary["module"])
+            for conftest in self._conftests(relpath):
+                file_deps |= {conftest} | self._scope_deps(conftest, self.files[conftest]["summary"]["module"])
+            for test, scope in summary["tests"].items():
+                deps = file_deps | self._scope_deps(relpath, scope)
+                requested = list(scope["args"])
+                if "::" in test:
+                    cls = summary["classes"].get(test.split("::")[0], {})
+                    deps |= self._scope_deps(relpath, cls)
+                    requested += cls.get("args", [])
+                mapping[f"{relpath}::{test}"] = deps | self._fixture_deps(requested, relpath)
+        return mapping
+
+    def affected(self, changed: Iterable[str]) -> Optional[List[str]]:
+        """Tests depending on any changed file, or None when the change can affect every test."""
+        changed = {PurePosixPath(c).as_posix() for c in changed}
+        if any(PurePosixPath(c).name in RUN_ALL_FILES for c in changed):
+            return None
+        # Deleted modules still resolve, so their importers are selected
+        self._index(set(self.files) | {c for c in changed if c.endswith(".py")})
+        return sorted(test for test, deps in self.tests().items() if deps & changed)
+
+
+def _git(args: List[str], cwd: Path) -> str:
+    return subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True, check=True).stdout
+
+
+def changed_files(base: str = "HEAD", root: str = ".") -> List[str]:
+    """
+    Files changed since the merge base with `base` (committed, staged,
+    unstaged and untracked), relative to root.
+    """
+    root_path = Path(root).resolve()
+    top = Path(_git(["rev-parse", "--show-toplevel"], root_path).strip())
+    merge_base = _git(["merge-base", base, "HEAD"], root_path).strip() if base != "HEAD" else "HEAD"
+    names = _git(["diff", "--name-only", merge_base], top).splitlines()
+    names += _git(["ls-files", "--others", "--exclude-standard"], top).splitlines()
+    changed = []
+    for name in dict.fromkeys(names):
+        path = top / name
+        try:
+            changed.append(path.relative_to(root_path).as_posix())
+        except ValueError:
+            continue  # outside the project
+    return changed
+
+
+def select(base: str = "HEAD", root: str = ".", cache_path: Optional[str] = None) -> Dict[str, Any]:
+    """Changed files and the tests they affect ("tests" is None when everything must run)."""
+    changed = changed_files(base, root)
+    dependency_map = DependencyMap(root, cache_path).refresh()
+    tests = dependency_map.affected(changed)
+    logger.info("Change-based selection", changed=len(changed), parsed=dependency_map.parsed,
+                selected="all" if tests is None else len(tests))
+    return {"changed": changed, "tests": tests, "total": len(dependency_map.tests())}
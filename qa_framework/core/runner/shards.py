@@ -0,0 +1,77 @@
+"""
+Duration-balanced sharding for `qa run`.
+
+Durations measured by previous runs (setup + call + teardown per test) are
+kept in RUNNER_DURATIONS_FILE. Tests are assigned longest first to the
+currently lightest shard (LPT scheduling), which keeps the longest shard
+within 4/3 of the optimum; tests never measured count as the median.
+"""
+import heapq
+import json
+import os
+import statistics
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from qa_framework.core.config import settings
+
+# Assumed for every test when nothing has been measured yet
+DEFAULT_DURATION = 1.0
+# Weight of the newest measurement in the stored duration
+SMOOTHING = 0.5
+
+
+@dataclass
+class Shard:
+    index: int
+    tests: List[str] = field(default_factory=list)
+    expected: float = 0.0
+
+
+def durations_path(path: Optional[str] = None) -> Path:
+    return Path(path or settings.RUNNER_DURATIONS_FILE)
+
+
+def load_durations(path: Optional[str] = None) -> Dict[str, float]:
+    path = durations_path(path)
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text())["tests"]
+    except (ValueError, KeyError):
+        return {}
+
+
+def update_durations(measured: Dict[str, float], path: Optional[str] = None) -> Path:
+    """Folds this run's durations into the store (exponential smoothing against flaky timings)."""
+    path = durations_path(path)
+    stored = load_durations(path)
+    for nodeid, seconds in measured.items():
+        previous = stored.get(nodeid)
+        stored[nodeid] = round(seconds if previous is None else SMOOTHING * seconds + (1 - SMOOTHING) * previous, 4)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps({"version": 1, "updated": time.time(), "tests": stored}, indent=1, sort_keys=True))
+    os.replace(tmp, path)
+    return path
+
+
+def plan(tests: Iterable[str], workers: int, durations: Dict[str, float]) -> List[Shard]:
+    """Splits tests into at most `workers` shards of balanced expected duration."""
+    tests = list(dict.fromkeys(tests))
+    known = [durations[t] for t in tests if t in durations]
+    fallback = statistics.median(known) if known else DEFAULT_DURATION
+    shards = [Shard(index) for index in range(max(1, min(workers, len(tests))))]
+    heap = [(0.0, shard.index) for shard in shards]
+    # Longest first; ties keep collection order so plans are stable between runs
+    for test in sorted(tests, key=lambda t: -durations.get(t, fallback)):
+        load, index = heapq.heappop(heap)
+        shard = shards[index]
+        shard.tests.append(test)
+        shard.expected = load + durations.get(test, fallback)
+        heapq.heappush(heap, (shard.expected, index))
+    order = {test: position for position, test in enumerate(tests)}
+    for shard in shards:
+        shard.tests.sort(key=order.__getitem__)  # run in collection order, keeping module fixtures together
+    return shards
@@ -0,0 +1,287 @@
+"""
+Screenshot service: the test thread only grabs the raw PNG from the driver;
+re-encoding (SCREENSHOT_FORMAT png/jpeg/webp), deduplication and the disk
+write run on background threads behind a bounded queue. A full queue blocks
+the next capture, so memory stays bounded under load.
+
+Pending writes must be flushed before the run ends (the generated conftest
+calls ScreenshotService.shared().flush() in pytest_sessionfinish); wait(path)
+waits for the write of one file. Allure attachments are encoded in the
+background too and handed to allure.attach on the test thread by
+attach_pending(), which the framework's pytest plugin calls after each
+test's teardown. Without the plugin, attach() waits and attaches at once.
+"""
+import atexit
+import hashlib
+import io
+import os
+import queue
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from qa_framework.core.config import settings
+from qa_framework.core.logger import get_logger
+
+logger = get_logger("screenshots")
+
+FORMATS = {"png": ".png", "jpeg": ".jpg", "webp": ".webp"}
+SUFFIX_FORMATS = {".png": "png", ".jpg": "jpeg", ".jpeg": "jpeg", ".webp": "webp"}
+
+# Encoded images kept for deduplication (identical captures are not re-encoded)
+_DEDUP_ENTRIES = 32
+
+
+def _pillow_available() -> bool:
+    try:
+        import PIL  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def encode(raw_png: bytes, fmt: str, quality: int) -> bytes:
+    """Re-encodes a PNG screenshot; PNG is returned untouched."""
+    if fmt == "png":
+        return raw_png
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(raw_png))
+    out = io.BytesIO()
+    if fmt == "jpeg":
+        image.convert("RGB").save(out, "JPEG", quality=quality, optimize=True)
+    else:
+        image.save(out, "WEBP", quality=quality, method=4)
+    return out.getvalue()
+
+
+def _allure_type(fmt: str) -> Dict[str, Any]:
+    """attachment_type / extension arguments of allure.attach for an encoded format."""
+    import allure
+
+    if fmt == "webp":
+        return {"attachment_type": None, "extension": "webp"}
+    return {"attachment_type": allure.attachment_type.PNG if fmt == "png" else allure.attachment_type.JPG}
+
+
+class ScreenshotService:
+    """Bounded background pipeline for screenshot encoding and writing."""
+
+    _shared: Optional["ScreenshotService"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self,
+                 fmt: Optional[str] = None,
+                 quality: Optional[int] = None,
+                 workers: Optional[int] = None,
+                 queue_size: Optional[int] = None,
+                 asynchronous: Optional[bool] = None):
+        fmt = (fmt or settings.SCREENSHOT_FORMAT).lower()
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown SCREENSHOT_FORMAT '{fmt}'. Choose from: {', '.join(FORMATS)}")
+        if fmt != "png" and not _pillow_available():
+            logger.warning(f"Pillow is not installed; screenshots are kept as PNG instead of {fmt}")
+            fmt = "png"
+        self.format = fmt
+        self.quality = quality if quality is not None else settings.SCREENSHOT_QUALITY
+        self.workers = workers if workers is not None else settings.SCREENSHOT_WORKERS
+        self.asynchronous = asynchronous if asynchronous is not None else settings.SCREENSHOT_ASYNC
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size if queue_size is not None else settings.SCREENSHOT_QUEUE_SIZE)
+        self._threads = []
+        self._lock = threading.Lock()
+        self._encoded: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        # Files with a write still queued or running, and encoded attachments per test thread
+        self._pending: Dict[Path, Future] = {}
+        self._attachments: Dict[int, List[Tuple[str, Future]]] = {}
+        # Set by the pytest plugin, which drains attachments after each test
+        self.defer_attachments = False
+        self.stats: Dict[str, int] = {"captured": 0, "written": 0, "deduplicated": 0, "errors": 0,
+                                      "bytes_in": 0, "bytes_out": 0}
+
+    @classmethod
+    def shared(cls) -> "ScreenshotService":
+        """Returns the process-wide service; pending writes are flushed at interpreter exit."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+                atexit.register(cls._shared.close)
+            return cls._shared
+
+    def _start_workers(self) -> None:
+        with self._lock:
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._work, name=f"qa-screenshots-{len(self._threads)}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _submit(self, raw: bytes, fmt: str, write) -> Future:
+        with self._lock:
+            self.stats["captured"] += 1
+            self.stats["bytes_in"] += len(raw)
+        future: Future = Future()
+        job = (raw, fmt, write, future)
+        if not self.asynchronous:
+            self._run(job)
+            return future
+        self._start_workers()
+        self._queue.put(job)  # blocks while the queue is full
+        return future
+
+    def _work(self) -> None:
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                self._run(job)
+            finally:
+                self._queue.task_done()
+
+    def _run(self, job) -> None:
+        raw, fmt, write, future = job
+        try:
+            body = self._encode(raw, fmt)
+            write(body)
+            with self._lock:
+                self.stats["written"] += 1
+                self.stats["bytes_out"] += len(body)
+            future.set_result(body)
+        except Exception as e:
+            with self._lock:
+                self.stats["errors"] += 1
+            logger.warning("Failed to write screenshot", error=str(e))
+            future.set_exception(e)
+
+    def _encode(self, raw: bytes, fmt: str) -> bytes:
+        key = (hashlib.sha1(raw).hexdigest(), fmt)
+        with self._lock:
+            body = self._encoded.get(key)
+            if body is not None:
+                self._encoded.move_to_end(key)
+                self.stats["deduplicated"] += 1
+                return body
+        body = encode(raw, fmt, self.quality)
+        with self._lock:
+            self._encoded[key] = body
+            if len(self._encoded) > _DEDUP_ENTRIES:
+                self._encoded.popitem(last=False)
+        return body
+
+    @staticmethod
+    def capture(driver: Any) -> bytes:
+        """Raw PNG bytes from the driver (runs on the calling thread)."""
+        return driver.screenshot_bytes()
+
+    def save(self, driver: Any, path: str) -> Future:
+        """
+        Captures now and writes the file in the background, encoded after its
+        suffix (.png, .jpg/.jpeg, .webp). The future resolves once it is on disk.
+        """
+        return self.write(path, self.capture(driver))
+
+    def write(self, path: str, raw_png: bytes) -> Future:
+        """Writes PNG bytes already captured, like save()."""
+        path = Path(path)
+        key = path.resolve()
+        fmt = SUFFIX_FORMATS.get(path.suffix.lower(), "png")
+        if fmt != "png" and not _pillow_available():
+            fmt = "png"
+        with self._lock:
+            previous = self._pending.get(key)
+
+        def write(body: bytes) -> None:
+            # An earlier write of the same file may still run on another worker
+            if previous is not None:
+                self._wait(previous)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f".{path.name}.tmp")
+            tmp.write_bytes(body)
+            os.replace(tmp, path)
+
+        future = self._submit(raw_png, fmt, write)
+        with self._lock:
+            self._pending[key] = future
+        future.add_done_callback(lambda done: self._forget(key, done))
+        return future
+
+    def _forget(self, key: Path, future: Future) -> None:
+        with self._lock:
+            if self._pending.get(key) is future:
+                del self._pending[key]
+
+    @staticmethod
+    def _wait(future: Future, timeout: Optional[float] = None) -> bool:
+        try:
+            future.result(timeout)
+        except FutureTimeout:
+            return False
+        except Exception:
+            pass  # already counted and logged by _run
+        return True
+
+    def pending(self, path: str) -> bool:
+        """Whether a write of this file is still queued or running."""
+        with self._lock:
+            return Path(path).resolve() in self._pending
+
+    def wait(self, path: str, timeout: Optional[float] = None) -> bool:
+        """Waits for the pending write of one file, if any. Returns False on timeout."""
+        with self._lock:
+            future = self._pending.get(Path(path).resolve())
+        return future is None or self._wait(future, timeout)
+
+    def attach(self, driver: Any, name: str = "Screenshot") -> Future:
+        """
+        Captures now and attaches to the current Allure test. With
+        defer_attachments the image is encoded in the background and attached
+        by attach_pending(), called later on this thread; otherwise it is
+        attached before returning.
+        """
+        future = self._submit(self.capture(driver), self.format, lambda body: None)
+        with self._lock:
+            self._attachments.setdefault(threading.get_ident(), []).append((name, future))
+        if not self.defer_attachments:
+            self.attach_pending()
+        return future
+
+    def attach_pending(self, timeout: Optional[float] = None) -> int:
+        """
+        Waits for the screenshots attach() queued on this thread and adds them
+        to the running Allure test with allure.attach. Returns how many were attached.
+        """
+        import allure
+
+        with self._lock:
+            attachments = self._attachments.pop(threading.get_ident(), [])
+        attached = 0
+        for name, future in attachments:
+            try:
+                body = future.result(timeout)
+            except FutureTimeout:
+                logger.warning("Screenshot was not encoded in time", name=name)
+                continue
+            except Exception:
+                continue  # already counted and logged by _run
+            allure.attach(body, name=name, **_allure_type(self.format))
+            attached += 1
+        return attached
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Waits for every queued screenshot to be written. Returns False on timeout."""
+        if timeout is None:
+            self._queue.join()
+            return True
+        done = threading.Event()
+        threading.Thread(target=lambda: (self._queue.join(), done.set()), daemon=True).start()
+        return done.wait(timeout)
+
+    def close(self) -> None:
+        """Flushes and stops the worker threads."""
+        self.flush()
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self._queue.put(None)
+        for thread in threads:
+            thread.join()
@@ -1,6 +1,5 @@
 import time
 from typing import List, Dict, Any
-from zapv2 import ZAPv2
 from qa_framework.core.config import settings
 from qa_framework.core.logger import get_logger
 
@@ -16,6 +15,8 @@ class ZapManager:
         if not settings.USE_ZAP_PROXY:
             logger.warning("USE_ZAP_PROXY is False. ZapManager might not work if traffic isn't routed.")
         
+        from zapv2 import ZAPv2
+
         self.zap = ZAPv2(proxies={'http': settings.ZAP_BASE_URL, 'https': settings.ZAP_BASE_URL}, 
                          apikey=settings.ZAP_API_KEY)
         self.base_url = settings.ZAP_BASE_URL
@@ -1,10 +1,13 @@
+import io
 import os
 from pathlib import Path
-from typing import Tuple
-from PIL import Image, ImageChops
+from typing import TYPE_CHECKING, Tuple
 from qa_framework.core.drivers.abstract_driver import AbstractDriver
 from qa_framework.core.logger import get_logger
 
+if TYPE_CHECKING:
+    from PIL import Image
+
 logger = get_logger("visual_manager")
 
 class VisualManager:
@@ -22,33 +25,51 @@ class VisualManager:
         self.failure_dir.mkdir(parents=True, exist_ok=True)
 
     def capture_screenshot(self, name: str) -> Path:
-        """Captures a screenshot and returns the path."""
+        """
+        Captures a screenshot and returns the path. The file is written in the
+        background; ScreenshotService.shared().wait(path) waits for it.
+        """
         path = self.failure_dir / f"{name}_current.png"
-        self.driver.screenshot(str(path))
+        self._write(path, self.driver.screenshot_bytes())
         return path
 
+    @staticmethod
+    def _service():
+        from qa_framework.core.screenshots import ScreenshotService
+        return ScreenshotService.shared()
+
+    @classmethod
+    def _write(cls, path: Path, data: bytes) -> None:
+        """Writes in the background through the screenshot service."""
+        cls._service().write(path, data)
+
     def compare(self, name: str, threshold: float = 0.0) -> bool:
         """
         Compares the current view against the baseline.
         Returns True if match (within threshold), False otherwise.
         """
         baseline_path = self.baseline_dir / f"{name}.png"
-        current_path = self.capture_screenshot(name)
-        
+        current_path = self.failure_dir / f"{name}_current.png"
+        # Compared in memory; files are only written (in the background) when needed
+        current = self.driver.screenshot_bytes()
+
+        # A baseline created by an earlier compare may still be queued for writing
+        self._service().wait(baseline_path)
         if not baseline_path.exists():
             logger.warning(f"Baseline not found for '{name}'. Creating new baseline.")
-            # Move current to baseline
-            current_path.rename(baseline_path)
+            self._write(baseline_path, current)
             return True
 
         # Compare
+        from PIL import Image, ImageChops
         try:
             baseline_img = Image.open(baseline_path).convert('RGB')
-            current_img = Image.open(current_path).convert('RGB')
+            current_img = Image.open(io.BytesIO(current)).convert('RGB')
 
             # Handle size mismatch
             if baseline_img.size != current_img.size:
                 logger.error(f"Visual Mismatch: Size difference. Baseline: {baseline_img.size}, Current: {current_img.size}")
+                self._write(current_path, current)
                 self._save_diff(current_img, baseline_img, name)
                 return False
 
@@ -57,21 +78,27 @@ class VisualManager:
             if diff.getbbox():
                 # Differences found
                 logger.error(f"Visual Mismatch for '{name}'")
+                self._write(current_path, current)
                 self._save_diff(current_img, baseline_img, name)
                 return False
             
             logger.info(f"Visual Match for '{name}'")
-            # Cleanup current if match
-            current_path.unlink()
+            # Cleanup a current image left by an earlier mismatch, once its write has landed
+            self._service().wait(current_path)
+            if current_path.exists():
+                current_path.unlink()
             return True
 
         except Exception as e:
             logger.error(f"Error during visual comparison: {e}")
             return False
 
-    def _save_diff(self, current: Image.Image, baseline: Image.Image, name: str):
+    def _save_diff(self, current: "Image.Image", baseline: "Image.Image", name: str):
         """Saves the diff image for analysis."""
+        from PIL import ImageChops
         diff_path = self.failure_dir / f"{name}_diff.png"
         diff = ImageChops.difference(baseline, current)
-        diff.save(diff_path)
-        logger.info(f"Saved diff image to {diff_path}")
+        buffer = io.BytesIO()
+        diff.save(buffer, "PNG")
+        self._write(diff_path, buffer.getvalue())
+        logger.info(f"Saving diff image to {diff_path}")
@@ -0,0 +1,180 @@
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from qa_framework.core.config import settings
+from qa_framework.core.drivers.batch import compile_selector
+from qa_framework.core.exceptions import WaitTimeoutError
+
+# Evaluated inside the page; calls done(result) as soon as the condition holds.
+# Re-checks are driven by DOM mutations and transition/animation ends, with a
+# slow safety re-check for changes that produce neither (e.g. scrolling).
+WAIT_FUNCTION = r"""
+(cond, timeoutMs, done) => {
+    const started = performance.now();
+    const find = (by, value) => {
+        if (by === 'id') return Array.from(document.querySelectorAll('[id]')).filter((el) => el.id === value);
+        if (by === 'name') return Array.from(document.getElementsByName(value));
+        if (by === 'xpath') {
+            const out = [];
+            const res = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            for (let i = 0; i < res.snapshotLength; i++) out.push(res.snapshotItem(i));
+            return out;
+        }
+        return Array.from(document.querySelectorAll(value));
+    };
+    const visible = (el) => {
+        if (!el || !el.getClientRects().length) return false;
+        const style = getComputedStyle(el);
+        return style.visibility !== 'hidden' && style.display !== 'none' && style.opacity !== '0';
+    };
+    const clickable = (el) => visible(el) && !el.disabled && getComputedStyle(el).pointerEvents !== 'none';
+    const text = (el) => (el.innerText !== undefined ? el.innerText : el.textContent || '').trim();
+
+    if (cond.kind === 'network_idle' && !window.__qaNetwork) {
+        // Counts fetch/XHR started from now on; finished resources come from the PerformanceObserver
+        const net = window.__qaNetwork = {inflight: 0, last: performance.now()};
+        const bump = () => { net.last = performance.now(); };
+        const origFetch = window.fetch;
+        if (origFetch) {
+            window.fetch = function () {
+                net.inflight++; bump();
+                return origFetch.apply(this, arguments).finally(() => { net.inflight--; bump(); });
+            };
+        }
+        const origSend = XMLHttpRequest.prototype.send;
+        XMLHttpRequest.prototype.send = function () {
+            net.inflight++; bump();
+            this.addEventListener('loadend', () => { net.inflight--; bump(); });
+            return origSend.apply(this, arguments);
+        };
+        try {
+            new PerformanceObserver(bump).observe({type: 'resource', buffered: false});
+        } catch (e) {}
+    }
+
+    let lastCount = -1, countSince = performance.now();
+    const check = () => {
+        if (cond.kind === 'network_idle') {
+            const net = window.__qaNetwork;
+            const quietFor = performance.now() - net.last;
+            return document.readyState === 'complete' && net.inflight === 0 && quietFor >= cond.stable_ms
+                ? {ok: true, value: null} : null;
+        }
+        const els = find(cond.by, cond.value);
+        if (cond.kind === 'count_stable') {
+            if (els.length !== lastCount) { lastCount = els.length; countSince = performance.now(); }
+            return performance.now() - countSince >= cond.stable_ms ? {ok: true, value: els.length} : null;
+        }
+        for (const el of els) {
+            if (cond.kind === 'visible' && visible(el)) return {ok: true, value: el};
+            if (cond.kind === 'clickable' && clickable(el)) return {ok: true, value: el};
+            if (cond.kind === 'text_equals' && text(el) === cond.expected) return {ok: true, value: el};
+        }
+        return null;
+    };
+
+    let finished = false, observer = null;
+    const timers = [];
+    const events = ['transitionend', 'animationend', 'load'];
+    const finish = (result) => {
+        if (finished) return;
+        finished = true;
+        if (observer) observer.disconnect();
+        timers.forEach(clearTimeout);
+        timers.forEach(clearInterval);
+        events.forEach((e) => window.removeEventListener(e, recheck, true));
+        result.elapsed_ms = performance.now() - started;
+        done(result);
+    };
+    const recheck = () => {
+        if (finished) return;
+        try {
+            const result = check();
+            if (result) finish(result);
+        } catch (e) {
+            finish({ok: false, error: String(e && e.message || e)});
+        }
+    };
+
+    recheck();
+    if (finished) return;
+    observer = new MutationObserver(recheck);
+    observer.observe(document.documentElement, {subtree: true, childList: true, attributes: true, characterData: true});
+    events.forEach((e) => window.addEventListener(e, recheck, true));
+    if (cond.stable_ms) {
+        // Stability conditions complete on a quiet period, when no mutation fires
+        timers.push(setInterval(recheck, Math.max(Math.min(cond.stable_ms / 4, 100), 10)));
+    } else {
+        timers.push(setInterval(recheck, 250));
+    }
+    timers.push(setTimeout(() => finish({ok: false, error: 'timeout'}), timeoutMs));
+}
+"""
+
+
+@dataclass(frozen=True)
+class Condition:
+    """An explicit wait condition. Build with visible(), clickable(), text_equals(), count_stable() or network_idle()."""
+    kind: str
+    selector: Optional[str] = None
+    expected: Optional[str] = None
+    stable_ms: int = 0
+
+    def payload(self) -> Dict[str, Any]:
+        """The condition as passed to WAIT_FUNCTION."""
+        by, value = compile_selector(self.selector) if self.selector else (None, None)
+        return {"kind": self.kind, "by": by, "value": value, "expected": self.expected, "stable_ms": self.stable_ms}
+
+    def __str__(self) -> str:
+        target = f" {self.selector}" if self.selector else ""
+        expected = f" == {self.expected!r}" if self.expected is not None else ""
+        return f"{self.kind}{target}{expected}"
+
+
+def visible(selector: str) -> Condition:
+    return Condition("visible", selector)
+
+
+def clickable(selector: str) -> Condition:
+    """Visible, enabled and accepting pointer events."""
+    return Condition("clickable", selector)
+
+
+def text_equals(selector: str, text: str) -> Condition:
+    """Trimmed visible text of a matching element equals the text."""
+    return Condition("text_equals", selector, expected=text)
+
+
+def count_stable(selector: str, stable_ms: int = 500) -> Condition:
+    """Number of matching elements unchanged for stable_ms (lists, search results)."""
+    return Condition("count_stable", selector, stable_ms=stable_ms)
+
+
+def network_idle(idle_ms: int = 500) -> Condition:
+    """Page loaded and no fetch/XHR/resource activity for idle_ms."""
+    return Condition("network_idle", stable_ms=idle_ms)
+
+
+def poll_until(driver, condition: Condition, timeout: Optional[float] = None, interval: float = 0.1) -> Any:
+    """
+    Fallback for drivers without in-page scripting (e.g. Appium native views):
+    polls the element through find_element.
+    """
+    if condition.kind in ("count_stable", "network_idle"):
+        raise NotImplementedError(f"{type(driver).__name__} cannot wait for {condition.kind}")
+    timeout = settings.EXPLICIT_WAIT if timeout is None else timeout
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            element = driver.find_element(condition.selector)
+            if element.is_displayed() and (
+                condition.kind == "visible"
+                or (condition.kind == "clickable" and element.is_enabled())
+                or (condition.kind == "text_equals" and element.text.strip() == condition.expected)
+            ):
+                return element
+        except Exception:
+            pass
+        if time.monotonic() >= deadline:
+            raise WaitTimeoutError(f"Timed out after {timeout}s waiting for {condition}")
+        time.sleep(interval)
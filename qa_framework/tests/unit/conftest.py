@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_healing_cache(tmp_path, mocker):
+    """Keeps the persistent healing cache of each test in its own temp directory."""
+    mocker.patch('qa_framework.core.config.settings.HEALING_CACHE_PATH', str(tmp_path / "healing.db"))
@@ -0,0 +1,55 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+from qa_framework.core.drivers.async_playwright_driver import AsyncPlaywrightDriver, AsyncPlaywrightFacade
+
+
+def _browser():
+    browser = MagicMock(close=AsyncMock())
+    browser.new_context = AsyncMock(side_effect=lambda **kwargs: MagicMock(new_page=AsyncMock(), close=AsyncMock()))
+    return browser
+
+
+def test_run_many_limits_concurrency_and_keeps_order():
+    """Test that run_many uses a fresh page per item, caps open pages and reports per-item errors."""
+    driver = AsyncPlaywrightDriver(browser=_browser(), concurrency=3)
+    in_flight, peak = 0, 0
+
+    async def visit(page, item):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if item == 4:
+            raise ValueError("boom")
+        return item * 2
+
+    results = asyncio.run(driver.run_many(range(10), visit))
+
+    assert peak == 3
+    assert results[:4] == [0, 2, 4, 6]
+    assert isinstance(results[4], ValueError)
+    assert driver._browser.new_context.await_count == 10
+
+
+def test_sync_facade_runs_on_background_loop(mocker):
+    """Test that the facade exposes the async driver through the blocking AbstractDriver API."""
+    playwright = MagicMock()
+    playwright.chromium.launch = AsyncMock(return_value=_browser())
+    playwright.stop = AsyncMock()
+    manager = mocker.patch('qa_framework.core.drivers.async_playwright_driver.async_playwright')
+    manager.return_value.start = AsyncMock(return_value=playwright)
+    mocker.patch('qa_framework.core.config.settings.BROWSER', 'chrome')
+
+    driver = AsyncPlaywrightFacade()
+    driver.start()
+    page = driver.get_driver()
+    page.title = AsyncMock(return_value="Swag Labs")
+    page.goto = AsyncMock()
+
+    driver.goto("https://example.com")
+    assert driver.get_title() == "Swag Labs"
+    page.goto.assert_awaited_once_with("https://example.com")
+
+    driver.quit()
+    playwright.stop.assert_awaited_once()
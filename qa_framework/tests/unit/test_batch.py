@@ -0,0 +1,51 @@
+from unittest.mock import MagicMock
+import pytest
+from qa_framework.core.drivers.batch import compile_ops
+from qa_framework.core.drivers.playwright_driver import PlaywrightDriver
+from qa_framework.core.drivers.selenium_driver import SeleniumDriver
+from qa_framework.core.exceptions import BatchOperationError
+
+
+def test_compile_ops_maps_framework_selectors():
+    """Test that framework selector prefixes become batch lookup strategies."""
+    payload = compile_ops([("get_text", "css=.title"), ("click", "id=login"), ("type", "//input", "abc")])
+    assert [(p["by"], p["value"], p["arg"]) for p in payload] == [
+        ("css", ".title", None), ("id", "login", None), ("xpath", "//input", "abc"),
+    ]
+    with pytest.raises(ValueError):
+        compile_ops([("hover", ".title")])
+
+
+def test_selenium_get_texts_uses_one_round_trip(mocker):
+    """Test that reading many cells costs a single execute_script call."""
+    wd = MagicMock()
+    wd.execute_script.return_value = [{"value": f"cell {i}"} for i in range(50)]
+    driver = SeleniumDriver()
+    driver.driver = wd
+
+    texts = driver.get_texts([f"css=td:nth-child({i})" for i in range(50)])
+
+    assert texts[49] == "cell 49"
+    wd.execute_script.assert_called_once()
+    wd.find_element.assert_not_called()
+
+
+def test_batch_reports_errors_per_item(mocker):
+    """Test that a missing read falls back to the regular lookup and other failures are kept per item."""
+    mocker.patch('qa_framework.core.config.settings.ENABLE_SELF_HEALING', False)
+    page = MagicMock()
+    page.evaluate.return_value = [{"value": "Products"}, {"error": "not found", "missing": True}, {"error": "not found", "missing": True}]
+    page.locator.return_value.inner_text.return_value = "late text"
+    driver = PlaywrightDriver()
+    driver._page = page
+
+    results = driver.batch([("get_text", "css=.title"), ("get_text", "css=.late"), ("click", "id=gone")])
+
+    assert [r.ok for r in results] == [True, True, False]
+    assert results[1].value == "late text"
+    assert results[2].error == "not found"
+
+    page.evaluate.return_value = [{"value": "ok"}, {"error": "boom"}]
+    with pytest.raises(BatchOperationError) as error:
+        driver.get_texts(["css=.title", "css=.broken"])
+    assert [r.ok for r in error.value.results] == [True, False]
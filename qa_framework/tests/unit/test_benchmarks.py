@@ -0,0 +1,24 @@
+from qa_framework.benchmarks.healing import generate_dom, run_benchmark
+from qa_framework.core.healing.index import DOMIndex
+
+
+def test_generate_dom_is_deterministic():
+    """Test that the corpus and mutation cases are reproducible from the seed."""
+    html, cases = generate_dom(500, targets=9, seed=3)
+
+    assert (html, cases) == generate_dom(500, targets=9, seed=3)
+    assert {case["kind"] for case in cases} == {"id", "name", "text"}
+    assert len(DOMIndex(html).soup.select("[data-bench-target]")) == 9
+
+
+def test_run_benchmark_reports_metrics(tmp_path):
+    """Test that a small run reports latency, memory, scoring and accuracy metrics."""
+    output = tmp_path / "bench.json"
+    [result] = run_benchmark([500], heals=9, output=str(output))
+
+    assert output.exists()
+    assert result["heals"] == 9
+    assert result["heal_p50_ms"] <= result["heal_p99_ms"]
+    assert result["peak_memory_mb"] > 0
+    assert 0 < result["nonzero_scores_mean"] <= result["nonzero_scores_max"] <= result["elements_scored"] == result["nodes"]
+    assert result["accuracy"] >= 0.8
@@ -0,0 +1,146 @@
+import json
+import shutil
+import subprocess
+from unittest.mock import MagicMock
+import pytest
+from bs4 import NavigableString
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from selenium.common.exceptions import NoSuchElementException
+from qa_framework.core.drivers.playwright_driver import PlaywrightDriver
+from qa_framework.core.drivers.selenium_driver import SeleniumDriver
+from qa_framework.core.healing.browser import HEAL_FUNCTION, BrowserHealer
+from qa_framework.core.healing.healer import Healer
+from qa_framework.core.healing.index import DOMIndex
+
+PARITY_PAGE = """
+<html><head><title>Shop</title><script>var userName = 'x';</script></head>
+<body>
+  <form id="login_form" class="form">
+    <input id="user-name" name="user-name" class="input_error form_input" type="text">
+    <input id="password" name="pwd" class="input_error form_input" type="password">
+    <input type="submit" class="submit-button btn_action" id="login-button" value="Login">
+  </form>
+  <div class="inventory_list">
+    <div class="inventory_item"><a id="item_4_title_link"><div class="inventory_item_name">Sauce Labs Backpack</div></a>
+      <button class="btn btn_primary btn_inventory" name="add-to-cart-backpack">Add to cart</button></div>
+    <div class="inventory_item"><a id="item_6_title_link"><div class="inventory_item_name">Sauce Labs Onesie</div></a>
+      <button class="btn btn_primary btn_inventory" name="add-to-cart-onesie">Add to cart</button></div>
+  </div>
+  <span class="title"><!-- Products --> Products </span>
+  <p>Checkout: <span>Your   Information</span></p>
+</body></html>
+"""
+
+# Minimal DOM over the BeautifulSoup tree, so the page script sees exactly the elements DOMIndex does
+DOM_SHIM = """
+const page = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+const nodes = page.elements.map((e) => ({
+    tagName: e.tag.toUpperCase(),
+    getAttribute: (name) => (name in e.attrs ? e.attrs[name] : null),
+    childNodes: e.children,
+}));
+page.elements.forEach((e, i) => { nodes[i].parentElement = e.parent < 0 ? null : nodes[e.parent]; });
+global.document = {getElementsByTagName: () => nodes};
+console.log(JSON.stringify((HEAL)(page.meta, page.k)));
+"""
+
+
+def _node_runner(index):
+    """Runs HEAL_FUNCTION in node against a DOM built from the same parsed page."""
+    positions = {id(el): pos for pos, el in enumerate(index.elements)}
+    elements = []
+    for el in index.elements:
+        attrs = {name: " ".join(value) if isinstance(value, list) else value for name, value in el.attrs.items()}
+        children = [{"nodeType": 3, "nodeValue": str(child)} if type(child) is NavigableString else {"nodeType": 8}
+                    for child in el.contents if isinstance(child, NavigableString)]
+        elements.append({"tag": el.name, "attrs": attrs, "children": children,
+                         "parent": positions.get(id(el.parent), -1)})
+    script = DOM_SHIM.replace("(HEAL)", f"({HEAL_FUNCTION})")
+
+    def run(meta, k):
+        result = subprocess.run(["node", "-e", script], input=json.dumps({"elements": elements, "meta": meta, "k": k}),
+                                capture_output=True, text=True, check=True)
+        return json.loads(result.stdout)
+    return run
+
+
+def test_browser_healer_uses_top_candidate():
+    """Test that only parsed metadata goes to the page and the best candidate wins."""
+    run_script = MagicMock(return_value=[
+        {"selector": "#user-name-v2", "score": 0.9},
+        {"selector": "input.form_input", "score": 0.5},
+    ])
+    healer = BrowserHealer(run_script, top_k=2)
+
+    assert healer.heal("id=user-name") == "#user-name-v2"
+    run_script.assert_called_once_with({"id": "user-name"}, 2)
+    assert healer.last_score == 0.9
+
+
+def test_browser_healer_rejects_low_scores():
+    """Test that low-confidence in-page candidates are not used."""
+    healer = BrowserHealer(MagicMock(return_value=[{"selector": "div", "score": 0.5}]))
+    assert healer.heal("#missing") is None
+
+
+def test_selenium_browser_mode_skips_page_source(mocker):
+    """Test that browser mode heals via execute_script without reading page_source."""
+    mocker.patch('qa_framework.core.config.settings.HEALING_MODE', 'browser')
+    mock_element = MagicMock()
+    mock_driver = MagicMock()
+    mock_driver.current_url = "https://app/login"
+    mock_driver.execute_script.return_value = [{"selector": "#healed_id", "score": 1.0}]
+
+    def side_effect(by, value):
+        if value == "#healed_id":
+            return mock_element
+        raise NoSuchElementException(value)
+
+    mock_driver.find_element.side_effect = side_effect
+    type(mock_driver).page_source = mocker.PropertyMock(side_effect=AssertionError("page_source fetched"))
+
+    driver_wrapper = SeleniumDriver()
+    driver_wrapper.driver = mock_driver
+
+    assert driver_wrapper.find_element("id=username_legacy") == mock_element
+    assert mock_driver.execute_script.call_args[0][1:] == ({"id": "username_legacy"}, 3)
+
+
+def test_playwright_driver_heals_on_timeout(mocker):
+    """Test that PlaywrightDriver retries an action with the healed selector."""
+    mocker.patch('qa_framework.core.config.settings.HEALING_MODE', 'browser')
+    page = MagicMock()
+    page.url = "https://app/login"
+    page.evaluate.return_value = [{"selector": "#login-v2", "score": 1.0}]
+    page.locator.return_value.count.return_value = 1
+    page.click.side_effect = [PlaywrightTimeoutError("timeout"), None]
+
+    driver = PlaywrightDriver()
+    driver._page = page
+    driver.click("id=login")
+
+    assert page.click.call_args_list[-1].args == ("#login-v2",)
+    page.content.assert_not_called()
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is required to evaluate the page script")
+@pytest.mark.parametrize("selector", [
+    "#userName",
+    "id=password_field",
+    "[name='add-to-cart-onesie']",
+    "#item_8_title_link",
+    "//button[text()='Add to Cart']",
+    "//span[text()='products']",
+    "//span[text()='Your Information']",
+    "input.btn_action.submit-button",
+    "div.inventory_item_label",
+])
+def test_browser_mode_matches_dom_mode(selector):
+    """Test that the in-page script ranks and scores a page exactly like the DOM-mode scorer."""
+    index = DOMIndex(PARITY_PAGE)
+    dom = Healer(index=index, top_k=5)
+    browser = BrowserHealer(_node_runner(index), top_k=5)
+
+    assert browser.heal(selector) == dom.heal(selector)
+    assert [c["selector"] for c in browser.last_candidates] == [c["selector"] for c in dom.last_candidates]
+    assert [c["score"] for c in browser.last_candidates] == pytest.approx([c["score"] for c in dom.last_candidates])
@@ -0,0 +1,163 @@
+import json
+import os
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+import pytest
+from qa_framework.core.drivers.device_pool import DevicePool, _port_capabilities, configured_devices
+from qa_framework.core.drivers.mobile_driver import MobileDriver
+from qa_framework.core.exceptions import DriverInitializationError
+
+
+class _FakeAppium(BaseHTTPRequestHandler):
+    """Just enough of the Appium W3C protocol for session setup, scripts and health checks."""
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, value, status=200):
+        body = json.dumps({"value": value}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self):
+        return json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+
+    def do_POST(self):
+        body, server = self._body(), self.server
+        if self.path == "/session":
+            session_id = uuid.uuid4().hex
+            caps = body["capabilities"]["alwaysMatch"]
+            server.sessions[session_id] = caps
+            return self._reply({"sessionId": session_id, "capabilities": {"platformName": "Android", **caps}})
+        session_id = self.path.split("/")[2]
+        if self.path.endswith("/execute/sync"):
+            server.scripts.append((session_id, body["script"], body["args"][0]))
+            return self._reply(True)
+        self._reply(None)
+
+    def do_GET(self):
+        session_id = self.path.split("/")[2]
+        if session_id in self.server.dead:
+            return self._reply({"error": "invalid session id", "message": "session is gone"}, status=404)
+        self._reply({"x": 0, "y": 0, "width": 1080, "height": 2340})
+
+    def do_DELETE(self):
+        self.server.deleted.append(self.path.split("/")[2])
+        self._reply(None)
+
+
+@pytest.fixture
+def appium(mocker):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeAppium)
+    server.sessions, server.scripts, server.deleted, server.dead = {}, [], [], set()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    mocker.patch('qa_framework.core.config.settings.MOBILE_PLATFORM_NAME', 'Android')
+    mocker.patch('qa_framework.core.config.settings.APPIUM_SERVER_URL', f"http://127.0.0.1:{server.server_address[1]}")
+    mocker.patch('qa_framework.core.config.settings.MOBILE_APP_ID', 'com.example.shop')
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_sessions_spread_over_devices_and_reset_fast(appium):
+    """Test that devices get their own session and ports, and are reused after an in-session app reset."""
+    pool = DevicePool(["emulator-5554", "emulator-5556"])
+    first, second = pool.acquire(timeout=5), pool.acquire(timeout=5)
+
+    caps = sorted((c["appium:udid"], c["appium:systemPort"], c["appium:noReset"]) for c in appium.sessions.values())
+    assert caps == [("emulator-5554", 8200, True), ("emulator-5556", 8201, True)]
+
+    pool.release(first)
+    session_id = first.driver.session_id
+    assert [s for sid, s, _ in appium.scripts if sid == session_id] == [
+        "mobile: terminateApp", "mobile: clearApp", "mobile: activateApp"]
+    assert all(args["appId"] == "com.example.shop" for _, _, args in appium.scripts)
+    assert [args for _, script, args in appium.scripts if script == "mobile: clearApp"] == [{"appId": "com.example.shop"}]
+
+    assert pool.acquire(timeout=5) is first
+    assert len(appium.sessions) == 2 and appium.deleted == []
+    pool.release(second)
+
+
+def test_unhealthy_device_is_reprovisioned(appium):
+    """Test that a device whose session died gets a new session on the next acquire."""
+    pool = DevicePool(["emulator-5554"])
+    driver = pool.acquire(timeout=5)
+    pool.release(driver)
+    appium.dead.add(driver.driver.session_id)
+
+    replacement = pool.acquire(timeout=5)
+    assert replacement is not driver
+    assert len(appium.sessions) == 2
+    assert pool.status()[0]["failures"] == 1
+
+
+def test_failing_devices_are_retired():
+    """Test that a device failing provisioning repeatedly is retired and the others keep serving."""
+    def create(udid, index):
+        if udid == "offline":
+            raise DriverInitializationError("Appium Init Failed: device not found")
+        return MagicMock()
+    pool = DevicePool(["offline", "emulator-5554"], create=create, max_failures=2)
+
+    driver = pool.acquire(timeout=1)
+    assert [(d["udid"], d["retired"], d["session"]) for d in pool.status()] == [
+        ("offline", True, False), ("emulator-5554", False, True)]
+
+    driver.reset.side_effect = Exception("adb: device offline")
+    pool.release(driver)
+    assert pool.status()[1]["session"] is False
+    pool.create = lambda udid, index: create("offline", index)
+    with pytest.raises(DriverInitializationError, match="Every device in the pool has been retired"):
+        pool.acquire(timeout=1)
+
+
+def test_devices_are_split_across_workers(mocker):
+    """Test that qa run shards and xdist workers each get their own slice of MOBILE_UDIDS and device ports."""
+    mocker.patch('qa_framework.core.config.settings.MOBILE_UDIDS', "a,b,c,d,e")
+    env = mocker.patch.dict(os.environ, {}, clear=True)
+    assert [udid for _, udid in configured_devices()] == ["a", "b", "c", "d", "e"]
+
+    env.update(QA_WORKER_INDEX="1", QA_WORKER_COUNT="2")
+    assert configured_devices() == [(1, "b"), (3, "d")]
+
+    env.update(PYTEST_XDIST_WORKER="gw2", PYTEST_XDIST_WORKER_COUNT="3")
+    assert configured_devices() == [(2, "c")]
+
+    # Workers sharing an Appium server never ask for the same systemPort
+    ports = []
+    for worker in range(3):
+        env.update(PYTEST_XDIST_WORKER=f"gw{worker}")
+        ports.append({_port_capabilities(d.index)["appium:systemPort"] for d in DevicePool(create=MagicMock()).devices})
+    assert ports == [{8200, 8203}, {8201, 8204}, {8202}]
+
+    env.update(PYTEST_XDIST_WORKER="gw5", PYTEST_XDIST_WORKER_COUNT="6")
+    with pytest.raises(DriverInitializationError, match="gw5"):
+        configured_devices()
+
+
+def test_ios_reset_clears_by_bundle_id_and_logs_fallback(mocker):
+    """Test that XCUITest gets bundleId, and a failed fast reset is logged before a new session starts."""
+    mocker.patch('qa_framework.core.config.settings.MOBILE_APP_ID', 'com.example.shop')
+    warning = mocker.patch('qa_framework.core.drivers.mobile_driver.logger.warning')
+    driver = MobileDriver()
+    driver.driver = MagicMock(capabilities={"platformName": "iOS"})
+
+    driver.reset()
+    driver.driver.execute_script.assert_called_once_with("mobile: clearApp", {"bundleId": "com.example.shop"})
+
+    session = driver.driver
+    session.activate_app.side_effect = Exception("app crashed")
+    session.quit.side_effect = Exception("session gone")
+    start = mocker.patch.object(MobileDriver, 'start')
+    driver.reset()
+
+    start.assert_called_once()
+    messages = [call.args[0] for call in warning.call_args_list]
+    assert "app crashed" in messages[0] and "session gone" in messages[1]
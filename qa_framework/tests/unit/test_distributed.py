@@ -0,0 +1,87 @@
+import json
+import os
+import socket
+import threading
+import pytest
+from qa_framework.core.runner.distributed import Coordinator, Worker, serve_workers
+from qa_framework.core.runner.parallel import collect
+
+
+@pytest.fixture
+def suite(tmp_path):
+    path = tmp_path / "suite"
+    path.mkdir()
+    (path / "test_sample.py").write_text(
+        "import pytest\n"
+        "@pytest.mark.parametrize('n', range(8))\n"
+        "def test_pass(n):\n"
+        "    from qa_framework.core.runner.identity import run_id, worker_index, worker_name\n"
+        "    assert worker_index() is not None and worker_name().startswith('qa') and run_id()\n"
+        "def test_fails():\n"
+        "    assert False\n"
+    )
+    return path
+
+
+def _coordinator(suite, tmp_path, **kwargs):
+    args = [str(suite), "-p", "no:cacheprovider"]
+    return Coordinator(collect(args), args, host="127.0.0.1", port=0, alluredir=str(tmp_path / "allure"),
+                       durations_file=str(tmp_path / "durations.json"), **kwargs).start()
+
+
+def test_workers_pull_batches_and_stream_results(suite, tmp_path):
+    """Test that two local workers share the tests and the coordinator merges results and Allure files."""
+    coordinator = _coordinator(suite, tmp_path, batch_size=3)
+    assert serve_workers(coordinator.address, processes=2) == 9
+    assert coordinator.wait(timeout=10)
+    coordinator.close()
+
+    result = coordinator.summary()
+    outcomes = sorted(r["outcome"] for r in result["results"].values())
+    assert outcomes == ["failed"] + ["passed"] * 8
+    assert result["exit_code"] == 1
+    assert sum(w["tests"] for w in result["workers"].values()) == 9
+    assert all(w["batches"] >= 1 for w in result["workers"].values())
+    assert len(list((tmp_path / "allure").glob("*-result.json"))) == 9
+
+
+def test_tests_of_a_dead_worker_are_rescheduled(suite, tmp_path):
+    """Test that a worker dropping mid-batch gets its tests run by another node."""
+    coordinator = _coordinator(suite, tmp_path, batch_size=4)
+
+    dead = socket.create_connection(coordinator.address)
+    reader = dead.makefile("rb")
+    dead.sendall(b'{"type": "hello", "name": "flaky"}\n{"type": "request"}\n')
+    reader.readline()
+    lost = json.loads(reader.readline())["tests"]
+    reader.close()
+    dead.close()
+
+    threading.Thread(target=Worker(coordinator.address, name="steady").run, daemon=True).start()
+    assert coordinator.wait(timeout=20)
+    coordinator.close()
+
+    result = coordinator.summary()
+    assert result["requeued"] == len(lost) > 0
+    assert {result["results"][t]["worker"] for t in lost} == {"steady-1"}
+    assert len(result["results"]) == 9
+
+
+def test_local_processes_split_the_hosts_devices(tmp_path, mocker):
+    """Test that the pytest processes of one `qa worker --processes 2` get disjoint MOBILE_UDIDS."""
+    suite = tmp_path / "devices"
+    suite.mkdir()
+    (suite / "test_devices.py").write_text(
+        "import pytest\n"
+        "from qa_framework.core.drivers.device_pool import configured_devices\n"
+        "@pytest.mark.parametrize('n', range(4))\n"
+        "def test_device(n):\n"
+        "    assert len(configured_devices()) == 1\n"
+    )
+    mocker.patch.dict(os.environ, {"MOBILE_UDIDS": "emulator-5554,emulator-5556"})
+    coordinator = _coordinator(suite, tmp_path, batch_size=1)
+    assert serve_workers(coordinator.address, processes=2) == 4
+    assert coordinator.wait(timeout=10)
+    coordinator.close()
+
+    assert sorted(r["outcome"] for r in coordinator.summary()["results"].values()) == ["passed"] * 4
@@ -0,0 +1,78 @@
+from unittest.mock import MagicMock
+from qa_framework.core.drivers.factory import DriverFactory
+from qa_framework.core.drivers.playwright_driver import PlaywrightDriver
+from qa_framework.core.drivers.pool import DriverPool
+from qa_framework.core.drivers.selenium_driver import SeleniumDriver
+
+
+def _pool(size=1, max_uses=0):
+    return DriverPool(create=MagicMock(side_effect=lambda: MagicMock()), size=size, max_uses=max_uses)
+
+
+def test_pool_reuses_reset_driver():
+    """Test that a released driver is reset and handed out again instead of relaunching."""
+    pool = _pool()
+    first = pool.acquire()
+    pool.release(first)
+
+    assert pool.acquire() is first
+    first.reset.assert_called_once()
+    first.quit.assert_not_called()
+    assert pool.create.call_count == 1
+
+
+def test_pool_recycles_worn_out_and_unhealthy_drivers():
+    """Test that drivers are quit after max_uses and replaced when their health check fails."""
+    pool = _pool(max_uses=2)
+    driver = pool.acquire()
+    pool.release(driver)
+    pool.release(pool.acquire())
+    driver.quit.assert_called_once()
+    assert len(pool) == 0
+
+    sick = pool.acquire()
+    pool.release(sick)
+    sick.is_healthy.return_value = False
+    assert pool.acquire() is not sick
+    assert sick.quit.called
+
+
+def test_factory_uses_pool_only_when_enabled(mocker):
+    """Test that acquire/release fall back to start/quit when pooling is disabled."""
+    driver = MagicMock()
+    mocker.patch.object(DriverFactory, 'get_driver', return_value=driver)
+    mocker.patch('qa_framework.core.config.settings.DRIVER_POOL_ENABLED', False)
+
+    DriverFactory.release_driver(DriverFactory.acquire_driver())
+    driver.quit.assert_called_once()
+
+
+def test_selenium_reset_clears_session_state():
+    """Test that a Selenium reset closes extra windows and clears cookies and storage."""
+    wd = MagicMock()
+    wd.window_handles = ["main", "popup"]
+    driver = SeleniumDriver()
+    driver.driver = wd
+
+    driver.reset()
+
+    wd.close.assert_called_once()
+    wd.switch_to.window.assert_called_with("main")
+    wd.delete_all_cookies.assert_called_once()
+    assert "localStorage.clear()" in wd.execute_script.call_args[0][0]
+    wd.get.assert_called_with("about:blank")
+
+
+def test_playwright_reset_opens_fresh_context():
+    """Test that a Playwright reset swaps the BrowserContext but keeps the browser."""
+    driver = PlaywrightDriver()
+    driver._browser = MagicMock()
+    old_context = MagicMock()
+    driver._context = old_context
+
+    driver.reset()
+
+    old_context.close.assert_called_once()
+    assert driver._context is driver._browser.new_context.return_value
+    assert driver.page is driver._context.new_page.return_value
+    driver._browser.close.assert_not_called()
@@ -0,0 +1,89 @@
+from unittest.mock import MagicMock, PropertyMock
+import pytest
+from selenium.common.exceptions import StaleElementReferenceException
+from qa_framework.core.drivers.selenium_driver import SeleniumDriver
+
+
+@pytest.fixture(autouse=True)
+def element_cache(mocker):
+    mocker.patch('qa_framework.core.config.settings.ELEMENT_CACHE_ENABLED', True)
+
+
+def _driver():
+    wd = MagicMock()
+    wd.find_element.side_effect = lambda by, value: MagicMock(text=value)
+    driver = SeleniumDriver()
+    driver.driver = wd
+    return driver, wd
+
+
+def test_repeated_lookups_hit_the_cache_until_goto():
+    """Test that a selector is looked up once per page generation."""
+    driver, wd = _driver()
+
+    assert driver.get_text("css=.title") == ".title"  # the css= prefix is stripped before WebDriver sees it
+    driver.get_text("css=.title")
+    driver.get_text("css=.title")
+    assert wd.find_element.call_count == 1
+
+    driver.goto("https://app/next")
+    driver.get_text("css=.title")
+    assert wd.find_element.call_count == 2
+
+
+def test_stale_handle_is_looked_up_again():
+    """Test that a stale cached handle bumps the generation and is retried transparently."""
+    driver, wd = _driver()
+    stale = MagicMock()
+    type(stale).text = PropertyMock(side_effect=StaleElementReferenceException("gone"))
+    fresh = MagicMock(text="fresh")
+    wd.find_element.side_effect = [stale, fresh]
+    generation = driver._generation
+
+    driver.find_element("css=.row")
+    assert driver.get_text("css=.row") == "fresh"
+    assert driver._generation == generation + 1
+
+
+def test_click_that_navigates_invalidates_cache():
+    """Test that a URL change after a click drops the cached handles."""
+    driver, wd = _driver()
+    url = PropertyMock(side_effect=["https://app/login", "https://app/inventory"])
+    type(wd).current_url = url
+
+    driver.click("id=login-button")
+    driver.get_text("id=login-button")
+
+    assert wd.find_element.call_count == 2
+    assert url.call_count == 2
+
+
+def test_typing_that_navigates_invalidates_cache():
+    """Test that a URL change after typing (e.g. Enter submitting a form) drops the cached handles."""
+    driver, wd = _driver()
+    type(wd).current_url = PropertyMock(side_effect=["https://app/search", "https://app/results"])
+
+    driver.type("id=query", "shoes\n")
+    driver.get_text("id=query")
+
+    assert wd.find_element.call_count == 2
+
+
+def test_raw_driver_access_invalidates_cache():
+    """Test that handing out the raw WebDriver (which may navigate) drops the cached handles."""
+    driver, wd = _driver()
+    driver.get_text("css=.title")
+    driver.get_driver().back()
+    driver.get_text("css=.title")
+
+    assert wd.find_element.call_count == 2
+
+
+def test_cache_is_opt_in(mocker):
+    """Test that without ELEMENT_CACHE_ENABLED every action looks the element up."""
+    mocker.patch('qa_framework.core.config.settings.ELEMENT_CACHE_ENABLED', False)
+    driver, wd = _driver()
+    driver.get_text("css=.title")
+    driver.get_text("css=.title")
+
+    assert wd.find_element.call_count == 2
@@ -45,3 +45,41 @@ def test_self_healing_success(mocker):
         mock_heal.assert_called_once()
         # Ensure we called find_element twice
         assert mock_driver.find_element.call_count == 2
+
+def test_healer_heals_from_index():
+    """
+    Test that the Healer finds a renamed element through the DOM index.
+    """
+    html = '''
+    <html><body>
+        <form>
+            <input id="user-name-v2" name="username" class="form_input" />
+            <button id="submit">Log in</button>
+        </form>
+        <script>var text = "Log in";</script>
+    </body></html>
+    '''
+    healer = Healer(html)
+
+    assert healer.heal("//button[text()='Log in']") == "#submit"
+    assert healer.heal("input[id='user-name'][name='username']") == "#user-name-v2"
+
+
+def test_dom_index_reused_across_healers():
+    """
+    Test that a single DOMIndex can back several Healer instances.
+    """
+    from qa_framework.core.healing.index import DOMIndex
+
+    index = DOMIndex('<div><span class="title primary">Products</span><p>Other</p></div>')
+
+    span = index.soup.find("span")
+    div = index.soup.find("div")
+
+    assert index.by_class["title"] == [index.elements.index(span)]
+    assert index.by_text["products"] == [index.elements.index(span)]
+    assert index.depths[index.elements.index(span)] == index.depths[index.elements.index(div)] + 1
+
+    healer = Healer(index=index)
+    assert healer.soup is index.soup
+    assert healer.heal("css=.title") == "span.title"
@@ -0,0 +1,155 @@
+import threading
+import time
+from unittest.mock import MagicMock
+from selenium.common.exceptions import NoSuchElementException
+from qa_framework.core.drivers.selenium_driver import SeleniumDriver
+from qa_framework.core.healing.cache import BrokenSelectorRegistry, HealingCache, url_pattern
+
+
+def test_url_pattern_collapses_record_ids():
+    """Test that URLs of the same page share a cache key."""
+    assert url_pattern("https://shop.example.com/items/42?ref=a#top") == "https://shop.example.com/items/*"
+    assert url_pattern("https://shop.example.com/items/7") == url_pattern("https://shop.example.com/items/42")
+    assert url_pattern("https://shop.example.com/cart") == "https://shop.example.com/cart"
+
+
+def test_cache_roundtrip_and_hits(tmp_path):
+    """Test that stored heals are returned and hit counts are tracked."""
+    cache = HealingCache(str(tmp_path / "cache.db"))
+    cache.put("https://app/login", "id=user", "#user-v2", 0.9)
+    cache.record_hit("https://app/login?next=/", "id=user")
+
+    entry = cache.get("https://app/login", "id=user")
+    assert entry.healed_selector == "#user-v2"
+    assert entry.confidence == 0.9
+    assert entry.hits == 1
+    assert cache.get("https://app/other", "id=user") is None
+
+
+def test_cache_ttl_and_lru_eviction(tmp_path):
+    """Test that expired entries are dropped and the store is capped by LRU."""
+    cache = HealingCache(str(tmp_path / "cache.db"), ttl=60, max_entries=2)
+    cache.put("https://app/a", "s1", "#a", 0.9)
+    cache.put("https://app/a", "s2", "#b", 0.9)
+    cache.record_hit("https://app/a", "s1")
+    cache.put("https://app/a", "s3", "#c", 0.9)
+
+    assert len(cache) == 2
+    assert cache.get("https://app/a", "s2") is None  # least recently used
+
+    cache._conn.execute("UPDATE healed_selectors SET last_verified = ?", (time.time() - 120,))
+    assert cache.get("https://app/a", "s1") is None
+
+
+def test_selenium_driver_prefers_cached_heal(mocker):
+    """Test that a cached heal is tried before fetching the page source."""
+    mocker.patch('qa_framework.core.config.settings.ENABLE_SELF_HEALING', True)
+    HealingCache.shared().put("https://app/login", "id=username_legacy", "#healed_id", 0.95)
+
+    mock_element = MagicMock()
+    mock_driver = MagicMock()
+    mock_driver.current_url = "https://app/login"
+
+    def side_effect(by, value):
+        if value == "#healed_id":
+            return mock_element
+        raise NoSuchElementException(value)
+
+    mock_driver.find_element.side_effect = side_effect
+    driver_wrapper = SeleniumDriver()
+    driver_wrapper.driver = mock_driver
+
+    heal = mocker.patch('qa_framework.core.healing.healer.Healer.heal')
+    assert driver_wrapper.find_element("id=username_legacy") == mock_element
+
+    heal.assert_not_called()
+    assert HealingCache.shared().get("https://app/login", "id=username_legacy").hits == 1
+
+
+def _driver_with_missing(selector_value, mock_element):
+    mock_driver = MagicMock()
+    mock_driver.current_url = "https://app/login"
+
+    def side_effect(by, value):
+        if value == selector_value:
+            raise NoSuchElementException(value)
+        return mock_element
+
+    mock_driver.find_element.side_effect = side_effect
+    driver_wrapper = SeleniumDriver()
+    driver_wrapper.driver = mock_driver
+    driver_wrapper._implicit_wait = 10
+    return driver_wrapper, mock_driver
+
+
+def test_known_broken_selector_skips_implicit_wait(mocker):
+    """Test that a selector healed before is probed with BROKEN_SELECTOR_WAIT, not IMPLICIT_WAIT."""
+    mocker.patch('qa_framework.core.config.settings.IMPLICIT_WAIT', 10)
+    mocker.patch('qa_framework.core.config.settings.BROKEN_SELECTOR_WAIT', 0)
+    HealingCache.shared().put("https://app/login", "id=username_legacy", "#healed_id", 0.95)
+
+    mock_element = MagicMock()
+    driver_wrapper, mock_driver = _driver_with_missing("username_legacy", mock_element)
+
+    assert driver_wrapper.find_element("id=username_legacy") == mock_element
+    waits = [c.args[0] for c in mock_driver.implicitly_wait.call_args_list]
+    assert waits == [0, 10]  # zero-wait probe, then regular wait for the healed selector
+
+
+def test_healthy_selectors_do_not_touch_wait_or_url(mocker):
+    """Test that the common path costs no extra round trips."""
+    mocker.patch('qa_framework.core.config.settings.IMPLICIT_WAIT', 10)
+    driver_wrapper, mock_driver = _driver_with_missing("nothing-missing", MagicMock())
+    url = mocker.PropertyMock(return_value="https://app/login")
+    type(mock_driver).current_url = url
+
+    driver_wrapper.find_element("id=user")
+
+    mock_driver.implicitly_wait.assert_not_called()
+    url.assert_not_called()
+
+
+def test_wait_budget_caps_failed_lookups(mocker):
+    """Test that failed lookups consume the per-page wait budget."""
+    mocker.patch('qa_framework.core.config.settings.ENABLE_SELF_HEALING', False)
+    mocker.patch('qa_framework.core.config.settings.IMPLICIT_WAIT', 10)
+    mocker.patch('qa_framework.core.config.settings.SELECTOR_WAIT_BUDGET', 15)
+    driver_wrapper, mock_driver = _driver_with_missing("missing", MagicMock())
+    mocker.patch('qa_framework.core.drivers.selenium_driver.time.monotonic', side_effect=[0, 10, 20, 25])
+
+    for _ in range(2):
+        try:
+            driver_wrapper.find_element("id=missing")
+        except NoSuchElementException:
+            pass
+
+    assert driver_wrapper._lookup_wait() == 0
+    assert [c.args[0] for c in mock_driver.implicitly_wait.call_args_list] == [5]
+
+    driver_wrapper.goto("https://app/other")
+    assert driver_wrapper._lookup_wait() == 10
+
+
+def test_broken_registry_is_thread_safe():
+    """Test that driver threads marking and clearing the same selectors leave a consistent registry."""
+    registry = BrokenSelectorRegistry()
+    errors = []
+
+    def hammer(n):
+        try:
+            for i in range(2000):
+                url = f"https://app/page{i % 4}"
+                registry.mark(url, "#login")
+                registry.is_known("#login") and registry.is_broken(url, "#login")
+                registry.clear(url, "#login")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=hammer, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert not registry.is_known("#login")
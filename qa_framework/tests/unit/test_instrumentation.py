@@ -0,0 +1,83 @@
+import json
+from unittest.mock import MagicMock
+import pytest
+from selenium.common.exceptions import NoSuchElementException
+from qa_framework.core.drivers.factory import DriverFactory
+from qa_framework.core.drivers.selenium_driver import SeleniumDriver
+from qa_framework.core.instrumentation import Metrics, instrument, metrics
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    metrics.clear()
+    yield
+    metrics.clear()
+
+
+def test_factory_instruments_only_when_enabled(mocker):
+    """Test that drivers are wrapped when enabled and left untouched otherwise."""
+    mocker.patch('qa_framework.core.config.settings.USE_PLAYWRIGHT', False)
+    mocker.patch('qa_framework.core.drivers.selenium_driver.webdriver.Chrome')
+
+    mocker.patch('qa_framework.core.config.settings.INSTRUMENTATION_ENABLED', False)
+    plain = DriverFactory.get_driver()
+    assert "click" not in vars(plain)
+
+    mocker.patch('qa_framework.core.config.settings.INSTRUMENTATION_ENABLED', True)
+    metrics.start_test("tests/test_login.py::test_ok")
+    driver = DriverFactory.get_driver()
+    driver.get_text("css=.title")
+
+    commands = {(row["driver"], row["command"]): row for row in metrics.to_dict()["commands"]}
+    assert commands[("SeleniumDriver", "start")]["count"] == 1
+    # Nested calls are measured too
+    assert commands[("SeleniumDriver", "find_element")]["count"] == 1
+    assert set(metrics.test_summary("tests/test_login.py::test_ok")) == {"start", "get_text", "find_element"}
+
+
+def test_healing_outcomes_are_recorded(mocker):
+    """Test that healing attempts and failing commands are counted."""
+    mocker.patch('qa_framework.core.config.settings.INSTRUMENTATION_ENABLED', True)
+    mocker.patch('qa_framework.core.config.settings.ENABLE_SELF_HEALING', True)
+    wd = MagicMock()
+    wd.find_element.side_effect = NoSuchElementException("missing")
+    wd.page_source = "<html><body><p>nothing</p></body></html>"
+    driver = instrument(SeleniumDriver())
+    driver.driver = wd
+
+    with pytest.raises(NoSuchElementException):
+        driver.click("id=submit")
+
+    data = metrics.to_dict()
+    assert data["healing"]["failed"] == 1
+    click = next(row for row in data["commands"] if row["command"] == "click")
+    assert click["errors"] == 1
+
+
+def test_export_writes_json_and_prometheus(tmp_path):
+    """Test that metrics are exported as JSON and in the Prometheus text format."""
+    local = Metrics()
+    for seconds in (0.004, 0.02, 0.3):
+        local.observe("PlaywrightDriver", "goto", seconds)
+    local.record_healing("cache_hit", 0.001)
+
+    json_path, prom_path = local.export(str(tmp_path))
+
+    goto = next(row for row in json.loads(json_path.read_text())["commands"] if row["command"] == "goto")
+    assert goto["count"] == 3 and goto["p50_s"] == 0.025
+    prom = prom_path.read_text()
+    assert 'qa_driver_command_seconds_bucket{driver="PlaywrightDriver",command="goto",le="0.025"} 2' in prom
+    assert 'qa_driver_command_seconds_count{driver="PlaywrightDriver",command="goto"} 3' in prom
+    assert 'qa_healing_attempts_total{outcome="cache_hit"} 1' in prom
+
+
+def test_mobile_driver_is_instrumented(mocker):
+    """Test that MobileDriver commands are measured like the web drivers."""
+    mocker.patch('qa_framework.core.config.settings.MOBILE_PLATFORM_NAME', 'Android')
+    from qa_framework.core.drivers.mobile_driver import MobileDriver
+    driver = instrument(MobileDriver())
+    driver.driver = MagicMock()
+
+    driver.click("login")
+
+    assert {row["command"] for row in metrics.to_dict()["commands"]} == {"click", "find_element"}
@@ -0,0 +1,69 @@
+import pickle
+from unittest.mock import MagicMock
+import pytest
+from qa_framework.core.drivers.base_page import BasePage
+from qa_framework.core.drivers.batch import compile_selector
+from qa_framework.core.drivers.locator import Locator
+from qa_framework.core.drivers.mobile_driver import MobileDriver
+from qa_framework.core.drivers.playwright_driver import PlaywrightDriver
+from qa_framework.core.drivers.selenium_driver import SeleniumDriver
+
+
+class _CheckoutPage(BasePage):
+    FIRST_NAME = "id=first-name"
+    TITLE = "css=.title"
+    ROWS = "(//div[@class='cart_item'])[1]"
+    HEADING = "Checkout: Your Information"  # plain text, not a selector
+
+
+@pytest.mark.parametrize("selector, selenium, playwright, mobile", [
+    ("id=login", ("id", "login"), "id=login", ("id", "login")),
+    ("name=user's", ("name", "user's"), '[name="user\'s"]', ("name", "user's")),
+    ("css=.title", ("css selector", ".title"), ".title", ("css selector", ".title")),
+    (".title", ("css selector", ".title"), ".title", ("accessibility id", ".title")),
+    ("xpath=//a", ("xpath", "//a"), "xpath=//a", ("xpath", "//a")),
+    ("(//a)[2]", ("xpath", "(//a)[2]"), "xpath=(//a)[2]", ("xpath", "(//a)[2]")),
+    ("Login", ("css selector", "Login"), "Login", ("accessibility id", "Login")),
+])
+def test_native_forms_per_backend(selector, selenium, playwright, mobile):
+    """Test that one parse yields each backend's strategy."""
+    locator = Locator(selector)
+    assert (locator.selenium, locator.playwright, locator.mobile) == (selenium, playwright, mobile)
+    assert locator == selector and hash(locator) == hash(selector)
+
+
+def test_page_object_constants_are_parsed_at_class_definition():
+    """Test that BasePage subclasses get Locators for selector constants only, interned with call-time strings."""
+    assert isinstance(_CheckoutPage.FIRST_NAME, Locator) and isinstance(_CheckoutPage.ROWS, Locator)
+    assert not isinstance(_CheckoutPage.HEADING, Locator)
+    assert Locator("id=first-name") is _CheckoutPage.FIRST_NAME
+    assert Locator(_CheckoutPage.TITLE) is _CheckoutPage.TITLE
+    assert pickle.loads(pickle.dumps(_CheckoutPage.TITLE)).playwright == ".title"
+
+
+def test_drivers_use_the_parsed_locator():
+    """Test that every driver resolves the same selector through its native form."""
+    wd = MagicMock()
+    selenium = SeleniumDriver()
+    selenium.driver = wd
+    selenium.find_element(_CheckoutPage.TITLE)
+    wd.find_element.assert_called_once_with("css selector", ".title")
+    assert compile_selector(_CheckoutPage.TITLE) == ("css", ".title")
+
+    mobile = MobileDriver()
+    mobile.driver = MagicMock()
+    mobile.find_element("Checkout")
+    mobile.driver.find_element.assert_called_once_with("accessibility id", "Checkout")
+
+
+def test_playwright_locator_is_built_once_per_page():
+    """Test that the native Playwright locator is cached per page and rebuilt for a new page."""
+    driver = PlaywrightDriver()
+    driver._page = MagicMock()
+
+    first = driver.find_element(_CheckoutPage.FIRST_NAME)
+    assert driver.find_element("id=first-name") is first
+    driver._page.locator.assert_called_once_with("id=first-name")
+
+    driver._page = MagicMock()
+    assert driver.find_element(_CheckoutPage.FIRST_NAME) is not first
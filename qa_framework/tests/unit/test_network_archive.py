@@ -0,0 +1,90 @@
+import http.client
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+from qa_framework.core.drivers.archive import ArchiveProxy, archive_path, effective_mode
+from qa_framework.core.drivers.playwright_driver import PlaywrightDriver
+
+
+class _Backend(BaseHTTPRequestHandler):
+    hits = 0
+
+    def do_GET(self):
+        _Backend.hits += 1
+        body = f"hello {self.path}".encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _get(proxy, url):
+    conn = http.client.HTTPConnection(*proxy.server_address[:2], timeout=5)
+    conn.request("GET", url)
+    response = conn.getresponse()
+    result = response.status, response.read()
+    conn.close()
+    return result
+
+
+def test_proxy_records_then_replays_offline(tmp_path):
+    """Test that the Selenium archive proxy serves recorded responses without the backend."""
+    backend = ThreadingHTTPServer(("127.0.0.1", 0), _Backend)
+    threading.Thread(target=backend.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{backend.server_address[1]}/items?id=1"
+    path = tmp_path / "checkout.har"
+    assert effective_mode(path, "auto") == "record"
+
+    recorder = ArchiveProxy(path, "record").start()
+    assert _get(recorder, url) == (200, b"hello /items?id=1")
+    recorder.stop()
+    backend.shutdown()
+    backend.server_close()
+    assert effective_mode(path, "auto") == "replay"
+
+    replayer = ArchiveProxy(path, "replay", fallthrough=False).start()
+    try:
+        assert _get(replayer, url) == (200, b"hello /items?id=1")
+        assert _get(replayer, url.replace("id=1", "id=2"))[0] == 404
+        assert replayer.stats == {"recorded": 0, "replayed": 1, "missing": 1, "tunnelled": 0}
+    finally:
+        replayer.stop()
+    assert _Backend.hits == 1
+
+
+def test_playwright_routes_context_from_har(tmp_path, mocker):
+    """Test that Playwright contexts are routed from the per-test HAR archive."""
+    mocker.patch('qa_framework.core.config.settings.NETWORK_ARCHIVE_MODE', 'auto')
+    mocker.patch('qa_framework.core.config.settings.NETWORK_ARCHIVE_DIR', str(tmp_path))
+    mocker.patch('qa_framework.core.config.settings.NETWORK_ARCHIVE_FALLTHROUGH', False)
+    driver = PlaywrightDriver()
+    driver._browser = MagicMock()
+    driver._new_context()  # as start() does, before the conftest names the archive
+
+    driver.use_archive("tests/test_checkout.py::test_e2e")
+
+    # Only the named archive is routed: the context opened by start() records no default session.har
+    context = driver._browser.new_context.return_value
+    context.route_from_har.assert_called_once_with(
+        str(archive_path("tests/test_checkout.py::test_e2e", str(tmp_path))),
+        update=True, update_content="embed", not_found="abort",
+    )
+
+
+def test_playwright_quit_closes_context_before_browser(tmp_path, mocker):
+    """Test that quit() closes the context, so the last test's recorded HAR is written."""
+    mocker.patch('qa_framework.core.config.settings.NETWORK_ARCHIVE_MODE', 'record')
+    mocker.patch('qa_framework.core.config.settings.NETWORK_ARCHIVE_DIR', str(tmp_path))
+    driver = PlaywrightDriver()
+    calls = MagicMock()
+    driver._browser, driver._playwright = calls.browser, calls.playwright
+    driver.use_archive("tests/test_checkout.py::test_e2e")
+    context = driver._context
+
+    driver.quit()
+
+    assert calls.mock_calls.index(mocker.call.browser.new_context().close()) < calls.mock_calls.index(mocker.call.browser.close())
+    context.close.assert_called_once_with()
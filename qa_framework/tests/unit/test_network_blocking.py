@@ -0,0 +1,61 @@
+import json
+from unittest.mock import MagicMock
+import pytest
+from qa_framework.core.drivers.network import NetworkBlocker, playwright_route_handler, resolve_profile
+from qa_framework.core.drivers.selenium_driver import SeleniumDriver
+
+
+def _route(url, resource_type):
+    route = MagicMock()
+    route.request.url = url
+    route.request.resource_type = resource_type
+    return route
+
+
+def test_profile_blocks_media_and_custom_patterns():
+    """Test that named profiles combine with custom patterns and unknown profiles are rejected."""
+    profile = resolve_profile("no-media", patterns="*ads.example.com/*")
+    blocker = NetworkBlocker(profile)
+
+    assert blocker.should_block("https://app/logo.png", "image")
+    assert blocker.should_block("https://ads.example.com/banner.js", "script")
+    assert not blocker.should_block("https://app/main.js", "script")
+    assert "*.woff2*" in profile.url_blocklist()
+    with pytest.raises(ValueError):
+        resolve_profile("everything")
+
+
+def test_playwright_route_aborts_and_reports():
+    """Test that blocked requests are aborted, others fall through, and the report resets."""
+    blocker = NetworkBlocker(resolve_profile("minimal", patterns=""))
+    handle = playwright_route_handler(blocker)
+
+    image, analytics, page = (_route("https://app/a.png", "image"),
+                              _route("https://www.google-analytics.com/g/collect", "xhr"),
+                              _route("https://app/", "document"))
+    for route in (image, analytics, page):
+        handle(route)
+
+    image.abort.assert_called_once_with("blockedbyclient")
+    page.fallback.assert_called_once()
+    report = blocker.report()
+    assert report["blocked_requests"] == 2
+    assert report["estimated_bytes_saved"] == 45_000
+    assert blocker.report()["blocked_requests"] == 0
+
+
+def test_selenium_chrome_uses_cdp_blocklist(mocker):
+    """Test that Selenium Chrome blocks via CDP and counts blocked requests from the performance log."""
+    mocker.patch('qa_framework.core.config.settings.BROWSER', 'chrome')
+    mocker.patch('qa_framework.core.config.settings.REMOTE_GRID_URL', None)
+    mocker.patch('qa_framework.core.config.settings.NETWORK_BLOCK_PROFILE', 'no-media')
+    chrome = mocker.patch('qa_framework.core.drivers.selenium_driver.webdriver.Chrome')
+    wd = chrome.return_value
+    failed = {"message": {"method": "Network.loadingFailed", "params": {"type": "Image", "blockedReason": "inspector"}}}
+    wd.get_log.return_value = [{"message": json.dumps(failed)}]
+
+    driver = SeleniumDriver()
+    driver.start()
+
+    wd.execute_cdp_cmd.assert_any_call("Network.setBlockedURLs", {"urls": mocker.ANY})
+    assert driver.network_report()["by_type"] == {"image": 1}
@@ -0,0 +1,71 @@
+from unittest.mock import MagicMock
+from typer.testing import CliRunner
+from qa_framework.cli import app
+from qa_framework.core.drivers.playwright_driver import PlaywrightDriver
+from qa_framework.core.drivers.selenium_driver import SeleniumDriver
+from qa_framework.core.performance import page_timing
+
+
+def _timing(url, lcp, fcp=300.0):
+    return {"url": url, "ttfb": 80.0, "fcp": fcp, "lcp": lcp, "load": 900.0, "cls": 0.01, "transfer_size": 5120}
+
+
+def _enable(mocker, tmp_path, run):
+    mocker.patch('qa_framework.core.config.settings.PAGE_TIMING_ENABLED', True)
+    mocker.patch('qa_framework.core.config.settings.PAGE_TIMING_DIR', str(tmp_path))
+    mocker.patch.object(page_timing, '_run_id', run)
+
+
+def test_goto_records_timing_per_url(mocker, tmp_path):
+    """Test that both drivers store the page's metrics after goto, keyed by URL without query."""
+    _enable(mocker, tmp_path, "run-1")
+    selenium = SeleniumDriver()
+    selenium.driver = MagicMock()
+    selenium.driver.timeouts.script = 30
+    selenium.driver.execute_async_script.return_value = _timing("https://shop/inventory.html?sort=az#top", 1200.0)
+    playwright = PlaywrightDriver()
+    playwright._page = MagicMock()
+    playwright._page.evaluate.return_value = _timing("https://shop/cart.html", 700.0)
+
+    selenium.goto("https://shop/inventory.html?sort=az")
+    playwright.goto("https://shop/cart.html")
+    selenium.driver.execute_async_script.side_effect = Exception("script timeout")
+    selenium.goto("https://shop/inventory.html")  # capture failures never fail the navigation
+    assert [c.args for c in selenium.driver.set_script_timeout.call_args_list] == [(10,), (30,)] * 2
+
+    entries = page_timing.load_run(directory=str(tmp_path))
+    assert [(e["url"], e["driver"], e["metrics"]["lcp"]) for e in entries] == [
+        ("https://shop/inventory.html", "SeleniumDriver", 1200.0),
+        ("https://shop/cart.html", "PlaywrightDriver", 700.0),
+    ]
+    assert "PerformanceObserver" in playwright._page.evaluate.call_args[0][0]
+
+
+def test_compare_flags_p75_regressions_above_noise():
+    """Test that only p75 growth beyond both the threshold and the metric's noise floor is reported."""
+    def run(lcps, fcp=300.0):
+        return page_timing.summarize(
+            {"url": "https://shop/", "metrics": {k: v for k, v in _timing("", lcp, fcp).items() if k != "url"}}
+            for lcp in lcps
+        )
+    baseline = run([1000, 1100, 1200, 5000])
+    assert baseline["https://shop/"]["lcp"] == 1200 and baseline["https://shop/"]["samples"] == 4
+
+    assert page_timing.compare(run([1000, 1150, 1230, 1240]), baseline, threshold=0.2) == []
+    assert page_timing.compare(run([300, 320, 330], fcp=330.0), run([300, 300, 300]), threshold=0.05) == []
+    regressions = page_timing.compare(run([1500, 1600, 1700, 1800]), baseline, threshold=0.2)
+    assert [(r["metric"], r["current_p75"]) for r in regressions] == [("lcp", 1700)]
+
+
+def test_cli_gates_against_the_baseline(mocker, tmp_path):
+    """Test that the page-timing command accepts a run as baseline and fails a regressed one."""
+    _enable(mocker, tmp_path, "run-1")
+    page_timing.record(_timing("https://shop/", 1000.0), driver="SeleniumDriver")
+    runner = CliRunner()
+    assert runner.invoke(app, ["page-timing", "--update-baseline"]).exit_code == 0
+
+    mocker.patch.object(page_timing, '_run_id', "run-2")
+    page_timing.record(_timing("https://shop/", 2000.0), driver="SeleniumDriver")
+    result = runner.invoke(app, ["page-timing", "--run", "run-2"])
+    assert result.exit_code == 1
+    assert "lcp" in result.output
@@ -0,0 +1,50 @@
+import json
+from qa_framework.core.runner import parallel
+from qa_framework.core.runner.shards import load_durations, plan, update_durations
+
+
+def test_plan_balances_by_duration():
+    """Test that shards are balanced by duration rather than count, and keep collection order."""
+    durations = {"t::slow": 60.0, "t::a": 20.0, "t::b": 20.0, "t::c": 20.0}
+    tests = ["t::a", "t::b", "t::slow", "t::c", "t::new1", "t::new2"]
+    shards = plan(tests, 2, durations)
+
+    assert [s.tests for s in shards] == [["t::slow", "t::new1"], ["t::a", "t::b", "t::c", "t::new2"]]
+    # Unmeasured tests count as the median (20s)
+    assert [s.expected for s in shards] == [80.0, 80.0]
+    assert len(plan(["t::a"], 8, durations)) == 1
+
+
+def test_durations_are_smoothed(tmp_path):
+    """Test that a new measurement is averaged with the stored one."""
+    path = str(tmp_path / "durations.json")
+    update_durations({"t::a": 10.0}, path)
+    update_durations({"t::a": 20.0, "t::b": 1.0}, path)
+    assert load_durations(path) == {"t::a": 15.0, "t::b": 1.0}
+
+
+def test_run_shards_and_merges_allure(tmp_path):
+    """Test an end-to-end run: every test runs once, results are merged and durations stored."""
+    suite = tmp_path / "suite"
+    suite.mkdir()
+    (suite / "test_sample.py").write_text(
+        "import os, pytest\n"
+        "@pytest.mark.parametrize('n', range(6))\n"
+        "def test_worker(n):\n"
+        "    from qa_framework.core.runner.identity import run_id, worker_count, worker_index\n"
+        "    assert 'PYTEST_XDIST_WORKER' not in os.environ\n"
+        "    assert worker_index() in range(3) and worker_count() == 3 and run_id()\n"
+        "def test_fails():\n"
+        "    assert False\n"
+    )
+    durations = tmp_path / "durations.json"
+    allure = tmp_path / "allure"
+
+    result = parallel.run([str(suite), "-p", "no:cacheprovider"], workers=3, alluredir=str(allure),
+                          durations_file=str(durations), workdir=str(tmp_path / "work"))
+
+    assert [s.tests for s in result["shards"]] == [3, 2, 2]
+    assert result["exit_code"] == 1
+    assert len(load_durations(str(durations))) == 7
+    statuses = sorted(json.loads(p.read_text())["status"] for p in allure.glob("*-result.json"))
+    assert statuses == ["failed"] + ["passed"] * 6
@@ -0,0 +1,66 @@
+import pytest
+import qa_framework.core.healing.scoring as scoring
+from qa_framework.core.healing.healer import Healer
+from qa_framework.core.healing.index import DOMIndex
+from qa_framework.core.healing.scoring import CandidateScorer, fuzzy_key
+
+HTML = '''
+<html><body>
+    <div id="cart">
+        <span class="badge count">3</span>
+        <button id="submitOrderButton" class="primary">Place order</button>
+        <button id="cancel-order">Cancel</button>
+        <input name="user_email" />
+    </div>
+</body></html>
+'''
+
+
+@pytest.fixture(params=["numpy", "python"])
+def scorer_backend(request, mocker):
+    """Runs each test against the NumPy and the pure Python implementation."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        mocker.patch.object(scoring, "np", None)
+    return request.param
+
+
+def test_fuzzy_key_normalizes_naming_styles():
+    assert fuzzy_key("submitOrderButton") == fuzzy_key("submit-order_button") == "submit order button"
+
+
+def test_fuzzy_id_heal(scorer_backend):
+    """Test that a misspelled id heals through trigram similarity."""
+    healer = Healer(HTML)
+    assert healer.heal("id=submitOrderButon") == "#submitOrderButton"
+    assert healer.last_candidates[0]["selector"] == "#submitOrderButton"
+
+
+def test_tag_feature_and_name_heal(scorer_backend):
+    """Test that tag equality contributes as a structural feature."""
+    healer = Healer(HTML)
+    assert healer.heal("input[name='user-email']") == "[name='user_email']"
+    assert healer.heal("button") is None  # tag alone is never enough
+
+
+def test_backends_agree(mocker):
+    """Test that the NumPy and pure Python paths produce the same scores."""
+    pytest.importorskip("numpy")
+    meta = {"id": "cancel_order", "text": "cancel", "tag": "button", "class": "primary"}
+    index = DOMIndex(HTML)
+    vectorized = list(CandidateScorer(index).scores(meta))
+
+    mocker.patch.object(scoring, "np", None)
+    plain = CandidateScorer(index).scores(meta)
+
+    assert vectorized == pytest.approx(plain)
+
+
+def test_top_k_orders_by_score_then_depth(scorer_backend):
+    index = DOMIndex('<div><p>Order</p><section><p>Order</p></section></div>')
+    ranked = index.scorer.top_k({"text": "Order"}, k=2)
+    deep = index.soup.find("section").find("p")
+
+    assert [score for score, _ in ranked] == [1.0, 1.0]
+    assert index.elements[ranked[0][1]] is deep
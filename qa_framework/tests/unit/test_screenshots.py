@@ -0,0 +1,155 @@
+import io
+import json
+import subprocess
+import sys
+import threading
+import time
+from unittest.mock import MagicMock
+import pytest
+from PIL import Image
+from qa_framework.core.screenshots import ScreenshotService
+from qa_framework.core.visual.manager import VisualManager
+
+
+def _png(color=(255, 0, 0), size=(40, 30)):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def driver():
+    driver = MagicMock()
+    driver.screenshot_bytes.return_value = _png()
+    return driver
+
+
+def test_save_is_written_in_the_background(driver, tmp_path):
+    """Test that save() returns after the capture and the write completes on flush."""
+    service = ScreenshotService(workers=1, queue_size=2, asynchronous=True)
+    release = threading.Event()
+    encode = service._encode
+    service._encode = lambda raw, fmt: (release.wait(5), encode(raw, fmt))[1]
+
+    future = service.save(driver, str(tmp_path / "shots" / "home.jpg"))
+    assert driver.screenshot_bytes.call_count == 1
+    assert not future.done() and not (tmp_path / "shots" / "home.jpg").exists()
+
+    release.set()
+    assert service.flush(timeout=5)
+    assert Image.open(tmp_path / "shots" / "home.jpg").format == "JPEG"
+    service.close()
+
+
+def test_identical_captures_are_encoded_once(driver, tmp_path, mocker):
+    """Test that a repeated screenshot reuses the encoded bytes."""
+    encode = mocker.patch('qa_framework.core.screenshots.encode', side_effect=lambda raw, fmt, quality: raw)
+    service = ScreenshotService(asynchronous=False)
+    service.save(driver, str(tmp_path / "a.png"))
+    service.save(driver, str(tmp_path / "b.png"))
+
+    assert encode.call_count == 1
+    assert service.stats["deduplicated"] == 1 and service.stats["written"] == 2
+    assert (tmp_path / "a.png").read_bytes() == (tmp_path / "b.png").read_bytes()
+
+
+def test_attach_encodes_in_background_and_attaches_on_test_thread(driver, mocker):
+    """Test that attach() only captures and attach_pending() hands the encoded image to allure.attach."""
+    attach = mocker.patch('allure.attach')
+    service = ScreenshotService(fmt="webp", workers=1, asynchronous=True)
+    service.defer_attachments = True
+    service.attach(driver, name="Failure_test_login")
+    attach.assert_not_called()
+
+    assert service.attach_pending(timeout=5) == 1
+    body = attach.call_args.args[0]
+    assert attach.call_args.kwargs == {"name": "Failure_test_login", "attachment_type": None, "extension": "webp"}
+    assert Image.open(io.BytesIO(body)).format == "WEBP"
+    assert service.attach_pending() == 0
+    service.close()
+
+
+def test_write_errors_are_counted(driver, tmp_path):
+    """Test that a failed write is logged and surfaced on the future, not raised in the test."""
+    (tmp_path / "blocked").write_text("")
+    service = ScreenshotService(asynchronous=False)
+    future = service.save(driver, str(tmp_path / "blocked" / "shot.png"))
+    assert service.stats["errors"] == 1
+    assert future.exception() is not None
+
+
+def test_visual_compare_in_memory(driver, tmp_path, mocker):
+    """Test that a matching compare writes nothing and a mismatch writes the current and diff images."""
+    service = ScreenshotService(asynchronous=False)
+    mocker.patch.object(ScreenshotService, 'shared', return_value=service)
+    manager = VisualManager(driver, baseline_dir=str(tmp_path / "baselines"), failure_dir=str(tmp_path / "failures"))
+
+    assert manager.compare("home")
+    assert (tmp_path / "baselines" / "home.png").exists()
+    assert manager.compare("home")
+    assert list((tmp_path / "failures").iterdir()) == []
+
+    driver.screenshot_bytes.return_value = _png(color=(0, 0, 255))
+    assert not manager.compare("home")
+    assert sorted(p.name for p in (tmp_path / "failures").iterdir()) == ["home_current.png", "home_diff.png"]
+
+
+def test_visual_compare_waits_for_queued_writes(driver, tmp_path, mocker):
+    """Test that compare() sees a baseline and a current image that are still being written."""
+    service = ScreenshotService(workers=2, asynchronous=True)
+    encode = service._encode
+    service._encode = lambda raw, fmt: (time.sleep(0.2), encode(raw, fmt))[1]
+    mocker.patch.object(ScreenshotService, 'shared', return_value=service)
+    manager = VisualManager(driver, baseline_dir=str(tmp_path / "baselines"), failure_dir=str(tmp_path / "failures"))
+
+    assert manager.compare("home")
+    assert service.pending(tmp_path / "baselines" / "home.png")
+    driver.screenshot_bytes.return_value = _png(color=(0, 0, 255))
+    assert not manager.compare("home")
+
+    driver.screenshot_bytes.return_value = _png()
+    assert manager.compare("home")
+    service.flush()
+    assert sorted(p.name for p in (tmp_path / "failures").iterdir()) == ["home_diff.png"]
+    assert Image.open(tmp_path / "baselines" / "home.png").getpixel((0, 0)) == (255, 0, 0)
+
+    path = manager.capture_screenshot("home")
+    assert service.wait(path, timeout=5) and path.read_bytes() == _png()
+    service.close()
+
+
+CONFTEST_ATTACHING_ONLY = """
+import pytest
+from unittest.mock import MagicMock
+from qa_framework.core.listeners.allure_listener import AllureListener
+
+@pytest.fixture
+def driver():
+    driver = MagicMock()
+    driver.screenshot_bytes.return_value = open("shot.png", "rb").read()
+    return driver
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    rep = outcome.get_result()
+    if rep.when == "call" and rep.failed:
+        AllureListener.attach_screenshot(item.funcargs["driver"], name=f"Failure_{item.name}")
+"""
+
+
+@pytest.mark.parametrize("plugin", [["-p", "no:qa_framework"], ["-p", "qa_framework.core.listeners.pytest_plugin"]],
+                         ids=["no-plugin", "plugin"])
+def test_conftest_calling_only_attach_screenshot_gets_the_attachment(tmp_path, plugin):
+    """Test that failure screenshots reach Allure whether or not the framework plugin drains them."""
+    (tmp_path / "shot.png").write_bytes(_png())
+    (tmp_path / "conftest.py").write_text(CONFTEST_ATTACHING_ONLY)
+    (tmp_path / "test_login.py").write_text("def test_login(driver):\n    assert False\n")
+
+    subprocess.run([sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", *plugin,
+                    "--alluredir=allure", "test_login.py"], cwd=tmp_path, capture_output=True)
+
+    [result] = [json.loads(p.read_text()) for p in (tmp_path / "allure").glob("*-result.json")]
+    [attachment] = result["attachments"]
+    assert attachment["name"] == "Failure_test_login"
+    assert (tmp_path / "allure" / attachment["source"]).read_bytes() == _png()
@@ -0,0 +1,83 @@
+import subprocess
+import pytest
+from qa_framework.core.runner.selection import DependencyMap, changed_files, select
+
+PROJECT = {
+    "pages/__init__.py": "",
+    "pages/base_page.py": "class BasePage:\n    pass\n",
+    "pages/login_page.py": "from .base_page import BasePage\n\nclass LoginPage(BasePage):\n    pass\n",
+    "pages/inventory_page.py": (
+        "from pages.base_page import BasePage\n\nclass InventoryPage(BasePage):\n"
+        "    def items(self):\n        from helpers.prices import parse\n        return parse\n"
+    ),
+    "helpers/prices.py": "def parse(value):\n    return value\n",
+    "data/users.json": "{}\n",
+    "tests/conftest.py": (
+        "import pytest\nfrom pages.login_page import LoginPage\n\n"
+        "@pytest.fixture\ndef logged_in():\n    return LoginPage(None)\n\n"
+        "@pytest.fixture\ndef driver():\n    return None\n"
+    ),
+    "tests/test_login.py": (
+        "import json\nfrom pages.login_page import LoginPage\n\n"
+        "def test_login(driver):\n    assert LoginPage(driver)\n\n"
+        "def test_users():\n    assert json.load(open('data/users.json')) == {}\n"
+    ),
+    "tests/test_inventory.py": (
+        "import pytest\nfrom pages.inventory_page import InventoryPage\n\n"
+        "class TestInventory:\n"
+        "    @pytest.fixture(autouse=True)\n    def setup(self, logged_in):\n        self.page = InventoryPage(None)\n\n"
+        "    def test_items(self):\n        assert self.page.items()\n"
+    ),
+}
+
+
+def _git(root, *args):
+    subprocess.run(["git", *args], cwd=root, check=True, capture_output=True)
+
+
+@pytest.fixture
+def project(tmp_path):
+    for path, content in PROJECT.items():
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text(content)
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "-c", "user.name=qa", "-c", "user.email=qa@example.com", "commit", "-qm", "base")
+    return tmp_path
+
+
+def test_affected_tests_follow_imports_fixtures_and_data(project):
+    """Test that page objects (incl. lazy imports), fixtures and data files map to the tests using them."""
+    deps = DependencyMap(str(project)).refresh()
+
+    assert deps.affected(["pages/inventory_page.py"]) == ["tests/test_inventory.py::TestInventory::test_items"]
+    assert deps.affected(["helpers/prices.py"]) == ["tests/test_inventory.py::TestInventory::test_items"]
+    assert deps.affected(["data/users.json"]) == ["tests/test_login.py::test_users"]
+    # Through LoginPage, InventoryPage and the logged_in fixture; test_users uses no page object
+    assert deps.affected(["pages/base_page.py"]) == [
+        "tests/test_inventory.py::TestInventory::test_items", "tests/test_login.py::test_login"]
+    assert len(deps.affected(["tests/conftest.py"])) == 3
+    assert deps.affected(["README.md"]) == []
+    assert deps.affected(["pyproject.toml"]) is None
+
+
+def test_map_is_updated_incrementally(project):
+    """Test that a second scan reuses the cache and only reparses changed files."""
+    assert DependencyMap(str(project)).refresh().parsed == len([p for p in PROJECT if p.endswith(".py")])
+    assert DependencyMap(str(project)).refresh().parsed == 0
+
+    (project / "tests/test_login.py").write_text(PROJECT["tests/test_login.py"] + "\ndef test_more():\n    pass\n")
+    deps = DependencyMap(str(project)).refresh()
+    assert deps.parsed == 1
+    assert "tests/test_login.py::test_more" in deps.tests()
+
+
+def test_select_from_git_diff(project):
+    """Test that uncommitted and untracked changes select the affected tests."""
+    (project / "pages/inventory_page.py").write_text(PROJECT["pages/inventory_page.py"] + "\n# tweak\n")
+    (project / "tests/test_new.py").write_text("def test_new():\n    pass\n")
+
+    assert sorted(changed_files("HEAD", str(project))) == ["pages/inventory_page.py", "tests/test_new.py"]
+    result = select("HEAD", str(project))
+    assert result["tests"] == ["tests/test_inventory.py::TestInventory::test_items", "tests/test_new.py::test_new"]
+    assert result["total"] == 4
@@ -0,0 +1,85 @@
+import json
+from unittest.mock import MagicMock
+from selenium.common.exceptions import NoSuchElementException
+from qa_framework.core.drivers.selenium_driver import SeleniumDriver
+from qa_framework.core.healing import validator
+
+PAGE_MODULE = '''
+class LoginPage:
+    URL = "https://app.example.com/"
+    USERNAME_INPUT = "id=user-name"
+    LOGIN_BUTTON = "id=login_button"
+    ERROR_MESSAGE = "css=h3[data-test='error']"
+    MISSING = "id=completely-unrelated"
+    helper = "id=not-a-constant"
+'''
+
+LOGIN_SNAPSHOT = """
+<html><body>
+  <input id="user-name" />
+  <button id="login-button" class="btn">Login</button>
+  <h3 data-test="error">Oops</h3>
+</body></html>
+"""
+
+
+def _write_project(tmp_path):
+    pages = tmp_path / "pages"
+    pages.mkdir()
+    (pages / "login_page.py").write_text(PAGE_MODULE)
+    snapshots = tmp_path / "snapshots"
+    snapshots.mkdir()
+    (snapshots / "login_page.html").write_text(LOGIN_SNAPSHOT)
+    (snapshots / "other_page.html").write_text("<html><body><p id='unrelated'>x</p></body></html>")
+    return pages, snapshots
+
+
+def test_collect_selectors_reads_class_constants(tmp_path):
+    """Test that only UPPER_CASE selector-like class constants are collected."""
+    pages, _ = _write_project(tmp_path)
+    refs = validator.collect_selectors([str(pages)])
+
+    assert [ref.attribute for ref in refs] == ["USERNAME_INPUT", "LOGIN_BUTTON", "ERROR_MESSAGE", "MISSING"]
+    assert refs[0].page_class == "LoginPage"
+
+
+def test_validate_reports_and_pre_heals(tmp_path):
+    """Test that broken selectors are healed against the page's snapshot in worker processes."""
+    pages, snapshots = _write_project(tmp_path)
+    report = validator.validate([str(pages)], str(snapshots), workers=2)
+    status = {entry["attribute"]: entry for entry in report["selectors"]}
+
+    assert status["USERNAME_INPUT"]["status"] == "ok"
+    assert status["ERROR_MESSAGE"]["status"] == "ok"
+    assert status["LOGIN_BUTTON"]["status"] == "healed"
+    assert status["LOGIN_BUTTON"]["healed"] == "#login-button"
+    assert status["LOGIN_BUTTON"]["snapshot"] == "login_page.html"
+    assert status["MISSING"]["status"] == "broken"
+    assert validator.healed_map(report)["selectors"].keys() == {"id=login_button"}
+
+
+def test_driver_uses_healed_map_without_healing(tmp_path, mocker):
+    """Test that the drivers try the offline healed map before fetching the page source."""
+    healed_file = tmp_path / "healed.json"
+    healed_file.write_text(json.dumps({"version": 1, "selectors": {
+        "id=login_button": {"healed": "#login-button", "confidence": 0.9}
+    }}))
+    mocker.patch('qa_framework.core.config.settings.ENABLE_SELF_HEALING', True)
+    mocker.patch('qa_framework.core.config.settings.HEALED_SELECTORS_FILE', str(healed_file))
+    healer = mocker.patch('qa_framework.core.healing.resolver.Healer')
+
+    mock_element = MagicMock()
+    mock_driver = MagicMock()
+    mock_driver.current_url = "https://app.example.com/"
+
+    def side_effect(by, value):
+        if value == "#login-button":
+            return mock_element
+        raise NoSuchElementException(value)
+
+    mock_driver.find_element.side_effect = side_effect
+    driver_wrapper = SeleniumDriver()
+    driver_wrapper.driver = mock_driver
+
+    assert driver_wrapper.find_element("id=login_button") == mock_element
+    healer.assert_not_called()
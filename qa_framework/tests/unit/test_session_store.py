@@ -0,0 +1,67 @@
+import time
+from unittest.mock import MagicMock
+import pytest
+from qa_framework.core.drivers.selenium_driver import SeleniumDriver
+from qa_framework.core.drivers.session import SessionStore
+
+STATE = {"url": "https://app/inventory", "cookies": [{"name": "session", "value": "abc", "expires": -1}], "origins": []}
+
+
+@pytest.fixture
+def store(tmp_path, mocker):
+    mocker.patch.object(SessionStore, '_logins', {})
+    mocker.patch.object(SessionStore, '_checks', {})
+    return SessionStore(str(tmp_path), ttl=60)
+
+
+def _driver():
+    driver = MagicMock()
+    driver.save_session.return_value = STATE
+    return driver
+
+
+def test_login_once_then_restore(store):
+    """Test that the UI login runs once and later drivers restore the snapshot."""
+    login = MagicMock()
+    SessionStore.register("standard_user", login)
+
+    first, second = _driver(), _driver()
+    store.authenticate(first, "standard_user")
+    store.authenticate(second, "standard_user")
+
+    login.assert_called_once_with(first)
+    second.load_session.assert_called_once_with(STATE)
+
+
+def test_expired_or_rejected_snapshot_is_refreshed(store):
+    """Test that stale snapshots (TTL, cookie expiry, failed check) trigger a new login."""
+    login = MagicMock()
+    check = MagicMock(return_value=False)
+    SessionStore.register("admin", login, check=check)
+
+    driver = _driver()
+    store.save("admin", driver, {**STATE, "cookies": [{"name": "s", "value": "x", "expires": time.time() - 1}]})
+    assert store.load("admin", driver) is None
+
+    store.save("admin", driver, STATE)
+    store.authenticate(driver, "admin")
+    check.assert_called_once_with(driver)
+    login.assert_called_once_with(driver)
+
+
+def test_selenium_session_roundtrip():
+    """Test that Selenium snapshots carry cookies and localStorage and restore them on the origin."""
+    wd = MagicMock()
+    wd.current_url = "https://app.example.com/inventory"
+    wd.get_cookies.return_value = [{"name": "session", "value": "abc", "domain": "app.example.com"}]
+    wd.execute_script.return_value = [{"name": "cart", "value": "[1]"}]
+    driver = SeleniumDriver()
+    driver.driver = wd
+
+    state = driver.save_session()
+    assert state["origins"][0]["origin"] == "https://app.example.com"
+
+    driver.load_session(state)
+    wd.add_cookie.assert_called_once_with(state["cookies"][0])
+    wd.execute_script.assert_called_with("localStorage.setItem(arguments[0], arguments[1]);", "cart", "[1]")
+    wd.get.assert_called_with("https://app.example.com/inventory")
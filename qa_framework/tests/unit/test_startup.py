@@ -0,0 +1,26 @@
+import json
+import subprocess
+import sys
+from qa_framework.benchmarks.startup import HEAVY_MODULES, measure
+
+
+def _loaded_after(module: str):
+    code = f"import json, sys; import {module}; print(json.dumps([m for m in {list(HEAVY_MODULES)!r} if m in sys.modules]))"
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout)
+
+
+def test_framework_imports_do_not_load_backends():
+    """Test that importing the factory and non-UI modules loads no backend or heavy optional dependency."""
+    for module in ("qa_framework.core.drivers.factory", "qa_framework.core.api.client",
+                   "qa_framework.core.a11y.manager", "qa_framework.core.visual.manager",
+                   "qa_framework.core.data.readers", "qa_framework.core.security.zap_manager"):
+        assert _loaded_after(module) == [], module
+
+
+def test_measure_reports_time_memory_and_heavy_modules():
+    """Test that the startup benchmark measures a fresh interpreter import."""
+    result = measure("qa_framework.core.drivers.selenium_driver", repeat=1)
+    assert result["import_ms"] > 0 and result["peak_rss_mb"] > 0
+    assert result["importtime_ms"] > 0
+    assert result["heavy"] == ["selenium"]
@@ -0,0 +1,70 @@
+from unittest.mock import MagicMock
+import pytest
+from selenium.common.exceptions import JavascriptException
+from qa_framework.core.drivers.base_page import BasePage
+from qa_framework.core.drivers.playwright_driver import PlaywrightDriver
+from qa_framework.core.drivers.selenium_driver import SeleniumDriver
+from qa_framework.core.exceptions import WaitTimeoutError
+from qa_framework.core.waits import conditions
+from qa_framework.core.waits.conditions import count_stable, network_idle, poll_until, text_equals, visible
+
+
+def test_selenium_waits_in_page_and_rearms_after_navigation():
+    """Test that Selenium waits via one async script and re-arms it when a navigation unloads it."""
+    element = MagicMock()
+    wd = MagicMock()
+    wd.execute_async_script.side_effect = [JavascriptException("document unloaded"), {"ok": True, "value": element}]
+    wd.timeouts.script = 30
+    driver = SeleniumDriver()
+    driver.driver = wd
+
+    assert BasePage(driver).wait_for_text("css=.title", "Products", timeout=5) is element
+
+    script, payload, timeout_ms = wd.execute_async_script.call_args[0]
+    assert "MutationObserver" in script
+    assert payload == {"kind": "text_equals", "by": "css", "value": ".title", "expected": "Products", "stable_ms": 0}
+    assert 0 < timeout_ms <= 5000
+    assert wd.set_script_timeout.call_args_list[-1].args == (30,)  # the session's timeout is restored
+
+
+def test_selenium_wait_timeout_raises():
+    """Test that an in-page timeout surfaces as WaitTimeoutError."""
+    wd = MagicMock()
+    wd.execute_async_script.return_value = {"ok": False, "error": "timeout"}
+    driver = SeleniumDriver()
+    driver.driver = wd
+
+    wd.timeouts.script = 30
+
+    with pytest.raises(WaitTimeoutError, match="visible id=cart"):
+        driver.wait_for(visible("id=cart"), timeout=1)
+    assert wd.set_script_timeout.call_args_list[-1].args == (30,)
+
+
+def test_playwright_uses_native_waits():
+    """Test that Playwright maps conditions onto its own waiting primitives."""
+    page = MagicMock()
+    page.evaluate.return_value = {"ok": True, "value": 12}
+    driver = PlaywrightDriver()
+    driver._page = page
+
+    locator = driver.wait_for(visible("css=.inventory_item"), timeout=2)
+    assert locator is page.locator.return_value.first
+    locator.wait_for.assert_called_once_with(state="visible", timeout=2000)
+
+    driver.wait_for(network_idle(), timeout=2)
+    page.wait_for_load_state.assert_called_once_with("networkidle", timeout=2000)
+    assert driver.wait_for(count_stable("css=.inventory_item"), timeout=2) == 12
+
+
+def test_poll_fallback_for_native_drivers(mocker):
+    """Test that drivers without page scripting poll find_element until the condition holds."""
+    mocker.patch.object(conditions.time, 'sleep')
+    hidden, shown = MagicMock(), MagicMock(text=" Done ")
+    hidden.is_displayed.return_value = False
+    driver = MagicMock()
+    driver.find_element.side_effect = [Exception("missing"), hidden, shown]
+
+    assert poll_until(driver, text_equals("id=status", "Done"), timeout=5) is shown
+    with pytest.raises(NotImplementedError):
+        poll_until(driver, network_idle())